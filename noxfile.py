@@ -11,6 +11,13 @@ def tests(session: Session) -> None:
     session.run("pytest", *args)
 
 
+@session()
+def benchmarks(session: Session) -> None:
+    args = session.posargs or ["--output", "benchmarks.json"]
+    session.install(".[all]")
+    session.run("python", "-m", "strawman.benchmarks", *args)
+
+
 locations = ["src", "tests", "noxfile.py"]
 
 
@@ -1,7 +1,63 @@
+from importlib import import_module
 from importlib.metadata import version  # pragma: no cover
+from typing import TYPE_CHECKING
 
-from .dummy_pandas import dummy_df, dummy_triples
+if TYPE_CHECKING:  # pragma: no cover
+    from .alignment import (
+        AlignedTriples,
+        dummy_aligned_triples,
+        iter_dummy_aligned_triples,
+    )
+    from .dummy_pandas import (
+        LazyDummyDf,
+        corrupt_triples,
+        dummy_df,
+        dummy_df_slice,
+        dummy_triples,
+        extend_triples,
+        iter_corrupted_triples,
+        iter_dummy_df,
+        iter_dummy_triples,
+    )
+    from .duplicates import dummy_duplicates
+    from .sampling import TripleIds
+    from .utils import seed
+    from .writers import write_dummy_df, write_dummy_triples
+
+# submodules are imported on first access, so importing strawman stays cheap
+_EXPORTS = {
+    "AlignedTriples": "alignment",
+    "LazyDummyDf": "dummy_pandas",
+    "TripleIds": "sampling",
+    "corrupt_triples": "dummy_pandas",
+    "dummy_aligned_triples": "alignment",
+    "dummy_df": "dummy_pandas",
+    "dummy_df_slice": "dummy_pandas",
+    "dummy_duplicates": "duplicates",
+    "dummy_triples": "dummy_pandas",
+    "extend_triples": "dummy_pandas",
+    "iter_corrupted_triples": "dummy_pandas",
+    "iter_dummy_aligned_triples": "alignment",
+    "iter_dummy_df": "dummy_pandas",
+    "iter_dummy_triples": "dummy_pandas",
+    "seed": "utils",
+    "write_dummy_df": "writers",
+    "write_dummy_triples": "writers",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
-__all__ = ["dummy_df", "dummy_triples"]
 
 __version__ = version(__package__)
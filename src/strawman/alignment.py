@@ -0,0 +1,515 @@
+"""Pairs of overlapping knowledge graphs with entity alignment links.
+
+Entity alignment methods match the entities of two knowledge graphs that
+refer to the same real-world object. `dummy_aligned_triples` creates such a
+benchmark: a left graph, a right graph sharing part of its structure and the
+ground truth links between their entities.
+
+```pycon
+>>> from strawman.alignment import dummy_aligned_triples
+>>> pair = dummy_aligned_triples(10**6, num_entities=10**5, overlap=0.3, seed=1)
+>>> pair.links.shape
+(30000, 2)
+```
+"""
+
+from functools import partial
+from itertools import zip_longest
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from .arrow import _import_pyarrow, dictionary_array
+from .backends import Frame, _uses_arrow, _uses_numpy, arrow_output, numpy_output
+from .dummy_pandas import (
+    DEFAULT_CHUNK_SIZE,
+    TRIPLE_OUTPUTS,
+    TriplesBuilder,
+    _prepare_triples,
+    _TripleLabels,
+    _triples_builder,
+)
+from .sampling import TripleIdArrays, TripleIds, id_dtype, iter_triple_ids
+from .utils import _block_rng, _init_seed, _rechunk
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+    import pyarrow as pa
+
+LINK_COL = ["left", "right"]
+# streams 0-3 of the seed are used for sampling the triple ids
+ALIGNMENT_STREAM = 4
+
+LinksBuilder = Callable[[np.ndarray, np.ndarray, int], Union[Frame, np.ndarray]]
+
+
+class AlignedTriples(NamedTuple):
+    """Two knowledge graphs and the links between their entities.
+
+    The graphs are triple DataFrames, Tables or `TripleIds` like the output of
+    [dummy_triples][strawman.dummy_triples]. Every row of `links` pairs a left
+    entity with the right entity it is aligned to, for `output="ids"` it is an
+    integer array of shape `(num_links, 2)`.
+    """
+
+    left: Union[Frame, TripleIds]
+    right: Union[Frame, TripleIds]
+    links: Union[Frame, np.ndarray]
+
+
+def dummy_aligned_triples(
+    length: int,
+    num_entities: int = None,
+    num_rel: int = None,
+    overlap: float = 0.5,
+    relation_heterogeneity: float = 0.0,
+    noise: float = 0.0,
+    entity_prefixes: Tuple[str, str] = ("left_e", "right_e"),
+    relation_prefixes: Tuple[str, str] = ("left_rel", "right_rel"),
+    columns: List[str] = None,
+    link_columns: List[str] = None,
+    seed: int = None,
+    strategy: str = "auto",
+    workers: int = 1,
+    output: str = "strings",
+    dtype_backend: Optional[str] = None,
+    backend: str = "pandas",
+) -> AlignedTriples:
+    """Create two overlapping knowledge graphs and the links between their entities.
+
+    Both graphs have `length` triples, `num_entities` entities and `num_rel`
+    relations and follow the rules of [dummy_triples][strawman.dummy_triples]:
+    triples are unique, self-links are avoided and all entities and relations
+    show up. The left graph has the same ids as `dummy_triples` with the same
+    seed.
+
+    A share of `overlap` of the entities is aligned to a random entity of the
+    right graph. Left triples with an aligned head or tail are transferred to
+    the right graph, an unaligned head or tail is replaced by a random entity
+    only the right graph has. `noise` is the share of these triples that is
+    dropped instead. Relations are mapped to a random right relation, except
+    a share of `relation_heterogeneity` of them, whose triples get a random
+    right relation each. Random triples fill up the right graph.
+
+    Everything is generated on integer ids, labels are only created for the
+    final output.
+
+    Args:
+        length: Number of triples of each graph
+        num_entities: Number of entities of each graph
+        num_rel: Number of relations of each graph
+        overlap: Share of the entities aligned to an entity of the other graph
+        relation_heterogeneity: Share of the left relations without counterpart in the right graph
+        noise: Share of the triples of aligned entities that are not transferred to the right graph
+        entity_prefixes: Prefixes of the left and right entities
+        relation_prefixes: Prefixes of the left and right relations
+        columns: Triple column names ["head","relation","tail"] by default
+        link_columns: Link column names ["left","right"] by default
+        seed: Seed for reproducibility.
+        strategy: Sampling strategy, one of "auto", "rejection" or "exact"
+        workers: Number of processes drawing candidate triples
+        output: One of "strings", "categorical" or "ids", see `dummy_triples`
+        dtype_backend: None for numpy backed columns or "pyarrow" for Arrow backed columns
+        backend: "pandas", "numpy", "structured", "pyarrow" or "polars", see `strawman.backends`
+
+    Returns:
+        left and right graph and the links between them, sorted by left entity
+
+    Raises:
+        ValueError: If the graphs cannot be generated with the given specifications
+
+    Example:
+    ```pycon
+    >>> from strawman.alignment import dummy_aligned_triples
+    >>> left, right, links = dummy_aligned_triples(20, overlap=0.5, seed=1)
+    >>> links.head(3)
+          left      right
+    0  left_e2   right_e8
+    1  left_e4   right_e4
+    2  left_e5  right_e11
+    ```
+    """
+    builders, (left, right, links) = _prepare_aligned(
+        length=length,
+        num_entities=num_entities,
+        num_rel=num_rel,
+        overlap=overlap,
+        relation_heterogeneity=relation_heterogeneity,
+        noise=noise,
+        entity_prefixes=entity_prefixes,
+        relation_prefixes=relation_prefixes,
+        columns=columns,
+        link_columns=link_columns,
+        seed=seed,
+        strategy=strategy,
+        workers=workers,
+        output=output,
+        dtype_backend=dtype_backend,
+        backend=backend,
+    )
+    build_left, build_right, build_links = builders
+    right_heads, right_rels, right_tails = (np.concatenate(ids) for ids in zip(*right))
+    return AlignedTriples(
+        build_left(left[0], left[1], left[2], 0),
+        build_right(right_heads, right_rels, right_tails, 0),
+        build_links(links[0], links[1], 0),
+    )
+
+
+def iter_dummy_aligned_triples(
+    length: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    num_entities: int = None,
+    num_rel: int = None,
+    overlap: float = 0.5,
+    relation_heterogeneity: float = 0.0,
+    noise: float = 0.0,
+    entity_prefixes: Tuple[str, str] = ("left_e", "right_e"),
+    relation_prefixes: Tuple[str, str] = ("left_rel", "right_rel"),
+    columns: List[str] = None,
+    link_columns: List[str] = None,
+    seed: int = None,
+    strategy: str = "auto",
+    workers: int = 1,
+    output: str = "strings",
+    dtype_backend: Optional[str] = None,
+    backend: str = "pandas",
+) -> Iterator[AlignedTriples]:
+    """Create two overlapping knowledge graphs and their links chunk by chunk.
+
+    Every chunk contains the next `chunk_size` triples of both graphs and the
+    next `chunk_size` links, which run out earlier than the triples. For a
+    given seed the concatenated chunks are equal to `dummy_aligned_triples`.
+    The integer ids of the left graph are kept in memory, labels are only
+    created chunk by chunk.
+
+    Args:
+        length: Number of triples of each graph
+        chunk_size: Number of rows per chunk
+        num_entities: Number of entities of each graph
+        num_rel: Number of relations of each graph
+        overlap: Share of the entities aligned to an entity of the other graph
+        relation_heterogeneity: Share of the left relations without counterpart in the right graph
+        noise: Share of the triples of aligned entities that are not transferred to the right graph
+        entity_prefixes: Prefixes of the left and right entities
+        relation_prefixes: Prefixes of the left and right relations
+        columns: Triple column names ["head","relation","tail"] by default
+        link_columns: Link column names ["left","right"] by default
+        seed: Seed for reproducibility.
+        strategy: Sampling strategy, one of "auto", "rejection" or "exact"
+        workers: Number of processes drawing candidate triples
+        output: One of "strings", "categorical" or "ids", see `dummy_triples`
+        dtype_backend: None for numpy backed columns or "pyarrow" for Arrow backed columns
+        backend: "pandas", "numpy", "structured", "pyarrow" or "polars", see `strawman.backends`
+
+    Yields:
+        consecutive chunks of the graphs and links
+    """
+    builders, (left, right, links) = _prepare_aligned(
+        length=length,
+        num_entities=num_entities,
+        num_rel=num_rel,
+        overlap=overlap,
+        relation_heterogeneity=relation_heterogeneity,
+        noise=noise,
+        entity_prefixes=entity_prefixes,
+        relation_prefixes=relation_prefixes,
+        columns=columns,
+        link_columns=link_columns,
+        seed=seed,
+        strategy=strategy,
+        workers=workers,
+        output=output,
+        dtype_backend=dtype_backend,
+        backend=backend,
+    )
+    build_left, build_right, build_links = builders
+    num_links = len(links[0])
+    empty = tuple(ids[:0] for ids in links)
+    for number, (left_chunk, right_chunk, links_chunk) in enumerate(
+        zip_longest(
+            _rechunk([left], chunk_size),
+            _rechunk(right, chunk_size),
+            _rechunk([links], chunk_size),
+        )
+    ):
+        start = number * chunk_size
+        left_heads, left_rels, left_tails = left_chunk
+        right_heads, right_rels, right_tails = right_chunk
+        left_ids, right_ids = links_chunk or empty
+        yield AlignedTriples(
+            build_left(left_heads, left_rels, left_tails, start),
+            build_right(right_heads, right_rels, right_tails, start),
+            build_links(left_ids, right_ids, min(start, num_links)),
+        )
+
+
+def _prepare_aligned(
+    length: int,
+    num_entities: Optional[int],
+    num_rel: Optional[int],
+    overlap: float,
+    relation_heterogeneity: float,
+    noise: float,
+    entity_prefixes: Tuple[str, str],
+    relation_prefixes: Tuple[str, str],
+    columns: Optional[List[str]],
+    link_columns: Optional[List[str]],
+    seed: Optional[int],
+    strategy: str,
+    workers: int,
+    output: str,
+    dtype_backend: Optional[str],
+    backend: str,
+) -> Tuple[
+    Tuple[TriplesBuilder, TriplesBuilder, LinksBuilder],
+    Tuple[TripleIdArrays, Iterator[TripleIdArrays], Tuple[np.ndarray, np.ndarray]],
+]:
+    _check_share("overlap", overlap)
+    _check_share("relation_heterogeneity", relation_heterogeneity)
+    _check_share("noise", noise)
+    if link_columns is None:
+        link_columns = LINK_COL
+    if len(link_columns) != 2:
+        raise ValueError(f"Link columns can only be length of 2 but got {link_columns}")
+    seed = _init_seed(seed)
+    left_labels, right_labels = (
+        _prepare_triples(
+            length=length,
+            num_entities=num_entities,
+            num_rel=num_rel,
+            entity_prefix=entity_prefix,
+            relation_prefix=relation_prefix,
+            columns=columns,
+            seed=seed,
+        )[0]
+        for entity_prefix, relation_prefix in zip(entity_prefixes, relation_prefixes)
+    )
+    builders = (
+        _triples_builder(left_labels, output, dtype_backend, backend),
+        _triples_builder(right_labels, output, dtype_backend, backend),
+        _links_builder(
+            left_labels, right_labels, link_columns, output, dtype_backend, backend
+        ),
+    )
+    ids = _aligned_ids(
+        length=length,
+        num_entities=len(left_labels.heads),
+        num_rel=len(left_labels.rels),
+        overlap=overlap,
+        relation_heterogeneity=relation_heterogeneity,
+        noise=noise,
+        seed=seed,
+        strategy=strategy,
+        workers=workers,
+    )
+    return builders, ids
+
+
+def _check_share(name: str, value: float):
+    if not 0 <= value <= 1:
+        raise ValueError(f"{name} must be between 0 and 1 but was {value}")
+
+
+def _aligned_ids(
+    length: int,
+    num_entities: int,
+    num_rel: int,
+    overlap: float,
+    relation_heterogeneity: float,
+    noise: float,
+    seed: int,
+    strategy: str,
+    workers: int,
+) -> Tuple[TripleIdArrays, Iterator[TripleIdArrays], Tuple[np.ndarray, np.ndarray]]:
+    left_heads, left_rels, left_tails = (
+        np.concatenate(ids)
+        for ids in zip(
+            *iter_triple_ids(
+                length,
+                num_entities,
+                num_rel,
+                seed=seed,
+                strategy=strategy,
+                workers=workers,
+            )
+        )
+    )
+    rng = _block_rng(seed, ALIGNMENT_STREAM, 0)
+    num_links = round(overlap * num_entities)
+    left_order = rng.permutation(num_entities)
+    right_order = rng.permutation(num_entities)
+    entity_map = np.full(num_entities, -1, dtype=np.int64)
+    entity_map[left_order[:num_links]] = right_order[:num_links]
+    exclusive = right_order[num_links:]
+
+    # transfer triples with at least one aligned entity, the other entity
+    # becomes a random entity only the right graph knows
+    right_heads, right_tails = entity_map[left_heads], entity_map[left_tails]
+    keep = (right_heads >= 0) | (right_tails >= 0)
+    keep &= rng.random(len(left_heads)) >= noise
+    right_heads, rels, right_tails = (
+        right_heads[keep],
+        left_rels[keep],
+        right_tails[keep],
+    )
+    if len(exclusive):
+        for ids in (right_heads, right_tails):
+            unaligned = ids < 0
+            ids[unaligned] = exclusive[
+                rng.integers(0, len(exclusive), size=unaligned.sum())
+            ]
+
+    # heterogeneous relations have no counterpart, their triples get random relations
+    rel_map = rng.permutation(num_rel)
+    heterogeneous = (rng.random(num_rel) < relation_heterogeneity)[rels]
+    right_rels = rel_map[rels]
+    right_rels[heterogeneous] = rng.integers(0, num_rel, size=heterogeneous.sum())
+
+    right = iter_triple_ids(
+        length,
+        num_entities,
+        num_rel,
+        seed=int(rng.integers(0, 2**63)),
+        strategy=strategy,
+        workers=workers,
+        include=(right_heads, right_rels, right_tails),
+    )
+    linked = np.sort(left_order[:num_links])
+    return (left_heads, left_rels, left_tails), right, (linked, entity_map[linked])
+
+
+def _links_builder(
+    left: _TripleLabels,
+    right: _TripleLabels,
+    columns: List[str],
+    output: str,
+    dtype_backend: Optional[str] = None,
+    backend: str = "pandas",
+) -> LinksBuilder:
+    if output not in TRIPLE_OUTPUTS:
+        raise ValueError(f"Unknown output {output}, choose one of {TRIPLE_OUTPUTS}")
+    dtype = id_dtype(len(left.heads), len(right.heads))
+    if _uses_arrow(backend, dtype_backend):
+        if output == "ids":
+            raise ValueError('output="ids" cannot be combined with Arrow backends')
+        pa = _import_pyarrow("Arrow output")
+        return partial(
+            _arrow_links,
+            columns,
+            (
+                pa.array(left.heads, type=pa.string()),
+                pa.array(right.heads, type=pa.string()),
+            ),
+            dtype,
+            output == "categorical",
+            backend,
+        )
+    if output == "ids":
+        return partial(_link_ids, dtype)
+    if _uses_numpy(backend):
+        if output == "categorical":
+            raise ValueError(
+                f'output="categorical" cannot be combined with backend "{backend}"'
+            )
+        return partial(_link_arrays, columns, left.heads, right.heads, backend)
+    if output == "strings":
+        return partial(_links_frame, columns, left.heads, right.heads)
+    import pandas as pd
+
+    return partial(
+        _categorical_links,
+        columns,
+        pd.CategoricalDtype(left.heads),
+        pd.CategoricalDtype(right.heads),
+    )
+
+
+def _links_frame(
+    columns: List[str],
+    left_labels: np.ndarray,
+    right_labels: np.ndarray,
+    left_ids: np.ndarray,
+    right_ids: np.ndarray,
+    start: int = 0,
+) -> "pd.DataFrame":
+    import pandas as pd
+
+    return pd.DataFrame(
+        dict(zip(columns, (left_labels[left_ids], right_labels[right_ids]))),
+        index=pd.RangeIndex(start, start + len(left_ids)),
+    )
+
+
+def _categorical_links(
+    columns: List[str],
+    left_dtype: "pd.CategoricalDtype",
+    right_dtype: "pd.CategoricalDtype",
+    left_ids: np.ndarray,
+    right_ids: np.ndarray,
+    start: int = 0,
+) -> "pd.DataFrame":
+    import pandas as pd
+
+    return pd.DataFrame(
+        {
+            column: pd.Categorical.from_codes(codes, dtype=dtype)
+            for column, codes, dtype in zip(
+                columns, (left_ids, right_ids), (left_dtype, right_dtype)
+            )
+        },
+        index=pd.RangeIndex(start, start + len(left_ids)),
+    )
+
+
+def _link_arrays(
+    columns: List[str],
+    left_labels: np.ndarray,
+    right_labels: np.ndarray,
+    backend: str,
+    left_ids: np.ndarray,
+    right_ids: np.ndarray,
+    start: int = 0,
+) -> Frame:
+    return numpy_output(
+        dict(zip(columns, (left_labels[left_ids], right_labels[right_ids]))), backend
+    )
+
+
+def _link_ids(
+    dtype: np.dtype, left_ids: np.ndarray, right_ids: np.ndarray, start: int = 0
+) -> np.ndarray:
+    links = np.empty((len(left_ids), 2), dtype=dtype)
+    links[:, 0] = left_ids
+    links[:, 1] = right_ids
+    return links
+
+
+def _arrow_links(
+    columns: List[str],
+    dictionaries: Tuple["pa.Array", "pa.Array"],
+    dtype: np.dtype,
+    categorical: bool,
+    backend: str,
+    left_ids: np.ndarray,
+    right_ids: np.ndarray,
+    start: int = 0,
+) -> Frame:
+    arrays = [
+        (
+            dictionary_array(codes.astype(dtype, copy=False), dictionary)
+            if categorical
+            else dictionary.take(codes)
+        )
+        for codes, dictionary in zip((left_ids, right_ids), dictionaries)
+    ]
+    return arrow_output(columns, arrays, backend, start)
@@ -0,0 +1,133 @@
+"""Build Arrow arrays directly from the generated buffers.
+
+pyarrow is optional, it is only imported once Arrow output is requested.
+"""
+
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+    import pyarrow as pa
+
+_INT32_MAX = np.iinfo(np.int32).max
+
+
+def _import_pyarrow(feature: str):
+    try:
+        import pyarrow
+    except ImportError as err:
+        raise ImportError(
+            f"{feature} requires pyarrow, please install strawman[arrow]"
+        ) from err
+    return pyarrow
+
+
+def string_arrays(cells: np.ndarray) -> List["pa.Array"]:
+    """Convert the columns of a fixed-width unicode array to Arrow string arrays.
+
+    If all characters are ASCII, the code points are narrowed to bytes and used
+    as the data buffer of the Arrow arrays, together with evenly spaced
+    offsets. Otherwise pyarrow encodes the strings itself.
+
+    Args:
+        cells: 2-dimensional array of dtype `U<n>`
+
+    Returns:
+        one string array per column
+    """
+    pa = _import_pyarrow("Arrow output")
+    rows, cols = cells.shape
+    width = cells.dtype.itemsize // 4
+    codes = np.ascontiguousarray(cells).view(np.uint32).reshape(rows, cols, width)
+    # NUL characters would be stripped by numpy, let pyarrow handle them
+    if codes.size and (codes.max() > 127 or not codes.all()):
+        return [pa.array(cells[:, col], type=pa.string()) for col in range(cols)]
+    # column major bytes, so every column is one contiguous buffer
+    data = np.ascontiguousarray(codes.transpose(1, 0, 2), dtype=np.uint8)
+    large = rows * width > _INT32_MAX
+    offsets = np.arange(rows + 1, dtype=np.int64 if large else np.int32) * width
+    offsets_buffer = pa.py_buffer(offsets)
+    return [
+        pa.Array.from_buffers(
+            pa.large_string() if large else pa.string(),
+            rows,
+            [None, offsets_buffer, pa.py_buffer(data[col])],
+        )
+        for col in range(cols)
+    ]
+
+
+def chunked_arrays(blocks: Sequence[List["pa.Array"]], num_cols: int):
+    """Combine per-block column arrays into one chunked array per column.
+
+    Args:
+        blocks: column arrays of every block
+        num_cols: number of columns
+
+    Returns:
+        one chunked array per column
+    """
+    pa = _import_pyarrow("Arrow output")
+    columns = []
+    for col in range(num_cols):
+        chunks = [arrays[col] for arrays in blocks]
+        if len({chunk.type for chunk in chunks}) > 1:
+            chunks = [chunk.cast(pa.large_string()) for chunk in chunks]
+        columns.append(
+            pa.chunked_array(chunks, type=chunks[0].type if chunks else pa.string())
+        )
+    return columns
+
+
+def dictionary_array(indices: np.ndarray, dictionary: "pa.Array") -> "pa.Array":
+    """Wrap integer codes and their labels in an Arrow dictionary array.
+
+    Args:
+        indices: integer codes
+        dictionary: labels the codes refer to
+
+    Returns:
+        dictionary encoded array
+    """
+    pa = _import_pyarrow("Arrow output")
+    return pa.DictionaryArray.from_arrays(pa.array(indices), dictionary)
+
+
+def arrow_frame(
+    columns: Sequence, arrays: Sequence, index: Optional["pd.Index"] = None
+) -> "pd.DataFrame":
+    """Wrap Arrow arrays in a DataFrame with `ArrowDtype` columns without copying.
+
+    Args:
+        columns: column names
+        arrays: Arrow arrays or chunked arrays
+        index: index of the DataFrame
+
+    Returns:
+        DataFrame backed by the arrays
+    """
+    import pandas as pd
+
+    return pd.DataFrame(
+        {
+            column: pd.Series(pd.arrays.ArrowExtensionArray(array), index=index)
+            for column, array in zip(columns, arrays)
+        },
+        index=index,
+    )
+
+
+def arrow_table(columns: Sequence, arrays: Sequence) -> "pa.Table":
+    """Create a table, column names are converted to strings.
+
+    Args:
+        columns: column names
+        arrays: Arrow arrays or chunked arrays
+
+    Returns:
+        the table
+    """
+    pa = _import_pyarrow("Arrow output")
+    return pa.table(list(arrays), names=[str(column) for column in columns])
@@ -0,0 +1,133 @@
+"""Output backends of the generators.
+
+Every generator builds its output from NumPy arrays, `backend` decides what
+they are returned as:
+
+- "pandas": a DataFrame, the default
+- "numpy": a dict of column name to array, masked arrays where there are nulls
+- "structured": a NumPy structured array, masked if there are nulls
+- "pyarrow": an Arrow Table
+- "polars": a polars DataFrame, wrapping the Arrow Table
+
+pandas, pyarrow and polars are only imported once their output is requested,
+"numpy" and "structured" never import pandas. Note that pyarrow imports
+pandas itself if it is installed.
+
+```pycon
+>>> from strawman import dummy_df
+>>> columns = dummy_df((5, 2), columns=["a", "b"], seed=1, backend="numpy")
+>>> columns["a"].dtype
+dtype('<U3')
+```
+"""
+
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from .arrow import arrow_frame, arrow_table
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+    import polars as pl
+    import pyarrow as pa
+
+BACKENDS = ("pandas", "numpy", "structured", "pyarrow", "polars")
+DTYPE_BACKENDS = (None, "pyarrow")
+NUMPY_BACKENDS = ("numpy", "structured")
+
+Frame = Union["pd.DataFrame", "pa.Table", "pl.DataFrame", Dict, np.ndarray]
+
+
+def _import_polars(feature: str):
+    try:
+        import polars
+    except ImportError as err:
+        raise ImportError(
+            f"{feature} requires polars, please install strawman[polars]"
+        ) from err
+    return polars
+
+
+def _check_backends(backend: str, dtype_backend: Optional[str]):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend}, choose one of {BACKENDS}")
+    if dtype_backend not in DTYPE_BACKENDS:
+        raise ValueError(
+            f"Unknown dtype_backend {dtype_backend}, choose one of {DTYPE_BACKENDS}"
+        )
+
+
+def _uses_arrow(backend: str, dtype_backend: Optional[str]) -> bool:
+    # dtype_backend only applies to pandas
+    _check_backends(backend, dtype_backend)
+    if backend in NUMPY_BACKENDS:
+        return False
+    return backend != "pandas" or dtype_backend == "pyarrow"
+
+
+def _uses_numpy(backend: str) -> bool:
+    return backend in NUMPY_BACKENDS
+
+
+def structured_array(columns: Dict) -> np.ndarray:
+    """Combine columns into a structured array, field names are converted to strings.
+
+    Args:
+        columns: column name to array, masked arrays for columns with nulls
+
+    Returns:
+        the records, as masked array if any column is masked
+    """
+    names = [str(name) for name in columns]
+    arrays = list(columns.values())
+    rows = len(arrays[0]) if arrays else 0
+    records = np.empty(
+        rows, dtype=[(name, array.dtype) for name, array in zip(names, arrays)]
+    )
+    for name, array in zip(names, arrays):
+        records[name] = np.ma.getdata(array)
+    if not any(np.ma.isMaskedArray(array) for array in arrays):
+        return records
+    mask = np.empty(rows, dtype=[(name, bool) for name in names])
+    for name, array in zip(names, arrays):
+        mask[name] = np.ma.getmaskarray(array)
+    return np.ma.MaskedArray(records, mask=mask)
+
+
+def numpy_output(columns: Dict, backend: str) -> Union[Dict, np.ndarray]:
+    """Return NumPy columns as dict or structured array.
+
+    Args:
+        columns: column name to array
+        backend: "numpy" or "structured"
+
+    Returns:
+        the columns in the format of `backend`
+    """
+    return columns if backend == "numpy" else structured_array(columns)
+
+
+def arrow_output(
+    columns: Sequence, arrays: Sequence, backend: str, start: int = 0
+) -> Frame:
+    """Wrap Arrow arrays in the frame of `backend` without copying.
+
+    Args:
+        columns: column names
+        arrays: Arrow arrays or chunked arrays
+        backend: "pandas" for a DataFrame with `ArrowDtype` columns, "pyarrow" or "polars"
+        start: first row of the index of a pandas DataFrame
+
+    Returns:
+        DataFrame or Table backed by the arrays
+    """
+    if backend == "pandas":
+        import pandas as pd
+
+        rows = len(arrays[0]) if len(arrays) else 0
+        return arrow_frame(columns, arrays, index=pd.RangeIndex(start, start + rows))
+    table = arrow_table(columns, arrays)
+    if backend == "polars":
+        return _import_polars("polars output").from_arrow(table, rechunk=False)
+    return table
@@ -0,0 +1,271 @@
+"""Benchmarks for the strawman generators.
+
+Run them from the command line and compare against a stored baseline:
+
+```bash
+python -m strawman.benchmarks --output bench.json --baseline baseline.json
+```
+
+The command exits with status 1 if any benchmark got slower or needs more
+memory than the baseline by more than the threshold.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from importlib.metadata import version
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .dummy_pandas import dummy_df, dummy_triples
+from .schema import Booleans, Categoricals, Datetimes, Floats, Integers, Schema
+from .utils import (
+    random_string_generator,
+    random_strings,
+    sequence_choice,
+    sequence_choices,
+    shuffled_overlong,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_THRESHOLD = 0.25
+
+
+class BenchmarkResult(NamedTuple):
+    """Measurement of a single benchmark at a single size."""
+
+    name: str
+    size: int
+    seconds: float
+    peak_memory: int
+    rows_per_sec: float
+
+
+# mixed-type table of 10 columns
+TYPED_SCHEMA: Schema = {
+    **{f"int{i}": Integers(0, 10**6) for i in range(3)},
+    **{f"float{i}": Floats(null_fraction=0.1) for i in range(3)},
+    "created": Datetimes(),
+    "flag": Booleans(),
+    **{f"category{i}": Categoricals() for i in range(2)},
+}
+
+
+def _utils_loop(func: Callable[[np.random.Generator], Any], size: int):
+    rng = np.random.default_rng(0)
+    for _ in range(size):
+        func(rng)
+
+
+# name -> function generating `size` rows
+BENCHMARKS: Dict[str, Callable[[int], Any]] = {
+    "dummy_df": lambda size: dummy_df((size, 10), seed=0),
+    "dummy_df_typed": lambda size: dummy_df((size, 10), schema=TYPED_SCHEMA, seed=0),
+    "dummy_triples": lambda size: dummy_triples(size, seed=0),
+    "dummy_triples_attributes": lambda size: dummy_triples(
+        size, relation_triples=False, seed=0
+    ),
+    "random_string_generator": lambda size: _utils_loop(
+        lambda rng: random_string_generator(10, rng=rng), size
+    ),
+    "sequence_choice": lambda size: _utils_loop(
+        lambda rng: sequence_choice("abcdefghij", rng=rng), size
+    ),
+    "random_strings": lambda size: random_strings(
+        size, 10, rng=np.random.default_rng(0)
+    ),
+    "sequence_choices": lambda size: sequence_choices(
+        "abcdefghij", size, rng=np.random.default_rng(0)
+    ),
+    "shuffled_overlong": lambda size: shuffled_overlong(
+        list(range(100)), size, np.random.default_rng(0)
+    ),
+}
+
+
+def measure(
+    func: Callable[[int], Any], name: str, size: int, repeat: int = 3
+) -> BenchmarkResult:
+    """Measure wall time and peak memory of a benchmark.
+
+    The wall time is the best of `repeat` runs, peak memory is traced in a
+    separate run so tracing does not distort the timing.
+
+    Args:
+        func: benchmark function taking the size
+        name: name of the benchmark
+        size: number of rows to generate
+        repeat: number of timed runs
+
+    Returns:
+        the measurement
+    """
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(size)
+        seconds = min(seconds, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func(size)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return BenchmarkResult(
+        name=name,
+        size=size,
+        seconds=seconds,
+        peak_memory=peak,
+        rows_per_sec=size / seconds if seconds > 0 else float("inf"),
+    )
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    names: Optional[Sequence[str]] = None,
+    repeat: int = 3,
+) -> List[BenchmarkResult]:
+    """Run benchmarks across a grid of sizes.
+
+    Args:
+        sizes: numbers of rows to generate
+        names: benchmarks to run, all in `BENCHMARKS` by default
+        repeat: number of timed runs per benchmark and size
+
+    Returns:
+        one result per benchmark and size
+
+    Raises:
+        ValueError: if an unknown benchmark is requested
+    """
+    names = list(BENCHMARKS) if names is None else names
+    unknown = set(names).difference(BENCHMARKS)
+    if unknown:
+        raise ValueError(
+            f"Unknown benchmarks {unknown}, choose from {list(BENCHMARKS)}"
+        )
+    results = []
+    for name in names:
+        for size in sizes:
+            result = measure(BENCHMARKS[name], name, size, repeat=repeat)
+            logger.info(
+                f"{name} size={size}: {result.seconds:.4f}s,"
+                f" {result.peak_memory} bytes, {result.rows_per_sec:.0f} rows/s"
+            )
+            results.append(result)
+    return results
+
+
+def _environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "strawman": version("strawman"),
+        "numpy": version("numpy"),
+        "pandas": version("pandas"),
+    }
+
+
+def save_results(results: Sequence[BenchmarkResult], path: str):
+    """Write results together with the versions of the environment as JSON.
+
+    Args:
+        results: benchmark results
+        path: output file
+    """
+    with open(path, "w") as out:
+        json.dump(
+            {
+                "environment": _environment(),
+                "results": [result._asdict() for result in results],
+            },
+            out,
+            indent=2,
+        )
+
+
+def load_results(path: str) -> List[BenchmarkResult]:
+    """Read results written by `save_results`.
+
+    Args:
+        path: JSON file
+
+    Returns:
+        benchmark results
+    """
+    with open(path) as infile:
+        return [BenchmarkResult(**result) for result in json.load(infile)["results"]]
+
+
+def compare(
+    results: Sequence[BenchmarkResult],
+    baseline: Sequence[BenchmarkResult],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[str]:
+    """Find regressions compared to a baseline.
+
+    Only benchmarks and sizes present in both are compared.
+
+    Args:
+        results: current results
+        baseline: stored results
+        threshold: allowed relative increase of time and peak memory
+
+    Returns:
+        description of every regression, empty if there is none
+    """
+    base = {(result.name, result.size): result for result in baseline}
+    regressions = []
+    for result in results:
+        old = base.get((result.name, result.size))
+        if old is None:
+            continue
+        for metric in ("seconds", "peak_memory"):
+            new_value, old_value = getattr(result, metric), getattr(old, metric)
+            if new_value > old_value * (1 + threshold):
+                regressions.append(
+                    f"{result.name} size={result.size}: {metric} increased"
+                    f" from {old_value} to {new_value}"
+                )
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run benchmarks from the command line.
+
+    Args:
+        argv: command line arguments
+
+    Returns:
+        exit code, 1 if regressions were found
+    """
+    parser = argparse.ArgumentParser(description="Benchmark strawman generators")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    results = run_benchmarks(args.sizes, args.benchmarks, args.repeat)
+    if args.output:
+        save_results(results, args.output)
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.threshold)
+        for regression in regressions:
+            logger.error(regression)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
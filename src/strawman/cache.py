@@ -0,0 +1,362 @@
+"""Content-addressed on-disk cache for generated datasets.
+
+Results are stored as uncompressed Arrow IPC (Feather) files named by a hash
+of the generator, all its arguments and the strawman version, and memory
+mapped when they are loaded again. The least recently used entries are
+evicted once the cache grows beyond its size limit. Requires pyarrow.
+
+```pycon
+>>> from strawman import dummy_triples
+>>> from strawman.cache import DatasetCache
+>>> cache = DatasetCache("/tmp/strawman-cache", max_bytes=2**30)
+>>> df = cache(dummy_triples, 10**6, seed=1)  # generated and stored
+>>> df = cache(dummy_triples, 10**6, seed=1)  # loaded from disk
+```
+"""
+
+import contextlib
+import dataclasses
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sys
+import uuid
+from importlib.metadata import version
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .arrow import _import_pyarrow
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 2**32
+CACHE_DIR_ENV = "STRAWMAN_CACHE_DIR"
+SUFFIX = ".arrow"
+# arguments that do not change the generated data
+IGNORED_ARGUMENTS = ("workers", "stats")
+
+_KIND = b"strawman.kind"
+_LOCK_FILE = ".lock"
+
+
+def default_cache_dir() -> str:
+    """Directory used if none is given.
+
+    Returns:
+        `$STRAWMAN_CACHE_DIR` if set, else `strawman` in the user cache directory
+    """
+    if CACHE_DIR_ENV in os.environ:
+        return os.environ[CACHE_DIR_ENV]
+    base = os.environ.get("XDG_CACHE_HOME", os.path.join("~", ".cache"))
+    return os.path.join(os.path.expanduser(base), "strawman")
+
+
+def _typed(value: Any) -> Any:
+    # json writes tuples as lists before asking `_jsonable`, so NamedTuples and
+    # dataclasses are tagged with their type first, e.g. Zipf(1.5) vs (1.5,)
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        fields = dict(zip(value._fields, value))
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        fields = {
+            field.name: getattr(value, field.name)
+            for field in dataclasses.fields(value)
+        }
+    elif isinstance(value, (list, tuple)):
+        return [_typed(item) for item in value]
+    elif isinstance(value, dict):
+        return {key: _typed(item) for key, item in value.items()}
+    else:
+        return value
+    return {
+        "__type__": type(value).__qualname__,
+        "fields": {name: _typed(field) for name, field in fields.items()},
+    }
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    # a pandas Index can only be passed if pandas is already imported
+    pd = sys.modules.get("pandas")
+    if isinstance(value, (set, frozenset, tuple, range)) or (
+        pd is not None and isinstance(value, pd.Index)
+    ):
+        return list(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot derive a cache key from {type(value)}")
+
+
+@contextlib.contextmanager
+def _locked(path: str) -> Iterator[None]:
+    # exclusive lock shared by all processes using the cache directory
+    with open(path, "a+b") as lock_file:
+        if sys.platform == "win32":  # pragma: no cover
+            import msvcrt
+
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            return
+        import fcntl
+
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class DatasetCache:
+    """Cache of generated DataFrames and Arrow tables on disk.
+
+    Only calls with an explicit seed are cached, unseeded calls and calls
+    collecting `stats` (a cache hit would not fill them) are passed through. Results that are neither DataFrame nor `pyarrow.Table` (e.g.
+    `TripleIds`) are not cached either.
+
+    Entries are written to a temporary file and atomically renamed, so
+    concurrent processes never read partial entries. Processes missing the
+    same entry wait for the one generating it, eviction is guarded by a lock
+    file. Entries removed while another process reads them stay
+    readable until that process is done on POSIX systems.
+
+    Args:
+        directory: where entries are stored, see `default_cache_dir`
+        max_bytes: size limit, least recently used entries are evicted beyond it
+    """
+
+    def __init__(
+        self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must be >= 0 but was {max_bytes}")
+        self.directory = os.path.expanduser(
+            default_cache_dir() if directory is None else directory
+        )
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __call__(self, func: Callable, *args, **kwargs) -> Any:
+        """Return the cached result of `func(*args, **kwargs)`, generating it if needed.
+
+        Args:
+            func: generator function, e.g. `dummy_triples`
+            args: positional arguments of `func`
+            kwargs: keyword arguments of `func`
+
+        Returns:
+            result of the call
+        """
+        arguments = self._arguments(func, args, kwargs)
+        if arguments.get("seed") is None:
+            logger.debug(f"Not caching unseeded call of {func.__name__}")
+            return func(*args, **kwargs)
+        if arguments.get("stats") is not None:
+            logger.debug(f"Not caching call of {func.__name__} collecting stats")
+            return func(*args, **kwargs)
+        key = self.key(func, arguments)
+        result = self.load(key)
+        if result is None:
+            # processes asking for the same entry wait for the first one
+            with _locked(self._lock_path(key)):
+                result = self.load(key)
+                if result is None:
+                    result = func(*args, **kwargs)
+                    self.store(key, result)
+                    return result
+        logger.debug(f"Cache hit {key} for {func.__name__}")
+        return result
+
+    @staticmethod
+    def _arguments(func: Callable, args: tuple, kwargs: dict) -> dict:
+        bound = inspect.signature(func).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        # **kwargs of wrappers like write functions are flattened
+        for name, parameter in inspect.signature(func).parameters.items():
+            if parameter.kind == inspect.Parameter.VAR_KEYWORD:
+                arguments.update(arguments.pop(name))
+        return arguments
+
+    @staticmethod
+    def key(func: Callable, arguments: dict) -> str:
+        """Hash a call.
+
+        Args:
+            func: generator function
+            arguments: all arguments of the call, including defaults
+
+        Returns:
+            hex digest identifying the call
+
+        Raises:
+            TypeError: if an argument cannot be serialized
+        """
+        description = json.dumps(
+            {
+                "function": f"{func.__module__}.{func.__qualname__}",
+                "arguments": {
+                    name: _typed(value)
+                    for name, value in arguments.items()
+                    if name not in IGNORED_ARGUMENTS
+                },
+                "version": version("strawman"),
+            },
+            sort_keys=True,
+            default=_jsonable,
+        )
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def _lock_path(self, key: str) -> str:
+        return os.path.join(self.directory, f".{key}.lock")
+
+    def load(self, key: str) -> Any:
+        """Load an entry and mark it as recently used.
+
+        Args:
+            key: hash of the call
+
+        Returns:
+            the stored DataFrame or Table, None if there is no such entry
+        """
+        pa = _import_pyarrow("Caching")
+        path = self._path(key)
+        try:
+            table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        except FileNotFoundError:
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        kind = (table.schema.metadata or {}).get(_KIND)
+        if kind == b"table":
+            return table.replace_schema_metadata(None)
+        if kind == b"pandas-arrow":
+            import pandas as pd
+
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+        return table.to_pandas()
+
+    def store(self, key: str, result: Any) -> bool:
+        """Store a result and evict least recently used entries beyond the size limit.
+
+        Args:
+            key: hash of the call
+            result: DataFrame or Table
+
+        Returns:
+            True if the result was stored
+        """
+        import pandas as pd
+
+        pa = _import_pyarrow("Caching")
+        if isinstance(result, pa.Table):
+            table, kind = result, b"table"
+        elif isinstance(result, pd.DataFrame):
+            arrow = len(result.columns) > 0 and all(
+                isinstance(dtype, pd.ArrowDtype) for dtype in result.dtypes
+            )
+            table = pa.Table.from_pandas(result)
+            kind = b"pandas-arrow" if arrow else b"pandas"
+        else:
+            logger.debug(f"Not caching result of type {type(result)}")
+            return False
+        table = table.replace_schema_metadata(
+            {**(table.schema.metadata or {}), _KIND: kind}
+        )
+        tmp_path = os.path.join(self.directory, f".{key}.{uuid.uuid4().hex}.tmp")
+        try:
+            with pa.OSFile(tmp_path, "wb") as out:
+                with pa.ipc.new_file(out, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, self._path(key))
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+        self.evict()
+        return True
+
+    def entries(self) -> List[Tuple[str, int, float]]:
+        """List the entries, least recently used first.
+
+        Returns:
+            key, size in bytes and last access time of every entry
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(SUFFIX):
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((name[: -len(SUFFIX)], stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def size(self) -> int:
+        """Total size of all entries in bytes."""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes: Optional[int] = None):
+        """Remove least recently used entries until the cache fits the limit.
+
+        Args:
+            max_bytes: limit to enforce, `self.max_bytes` by default
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        with _locked(os.path.join(self.directory, _LOCK_FILE)):
+            entries = self.entries()
+            total = sum(size for _, size, _ in entries)
+            for key, size, _ in entries:
+                if total <= limit:
+                    break
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(self._path(key))
+                    logger.debug(f"Evicted {key} ({size} bytes)")
+                # at worst a process still waiting on it generates the entry again
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(self._lock_path(key))
+                total -= size
+
+    def clear(self):
+        """Remove all entries."""
+        self.evict(0)
+
+
+def cached(func: Callable, cache: Optional[DatasetCache] = None) -> Callable:
+    """Wrap a generator so seeded calls are served from a cache.
+
+    Args:
+        func: generator function, e.g. `dummy_df`
+        cache: cache to use, one in `default_cache_dir()` by default
+
+    Returns:
+        function with the same signature as `func`
+
+    Example:
+
+    ```pycon
+    >>> from strawman import dummy_df
+    >>> from strawman.cache import cached
+    >>> cached_dummy_df = cached(dummy_df)
+    >>> cached_dummy_df((10**6, 10), seed=1).shape
+    (1000000, 10)
+    ```
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal cache
+        if cache is None:
+            cache = DatasetCache()
+        return cache(func, *args, **kwargs)
+
+    return wrapper
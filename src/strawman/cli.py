@@ -0,0 +1,194 @@
+"""Command line interface for generating dummy data files.
+
+Examples:
+
+```bash
+strawman df 1000000 20 -o dummy.parquet
+strawman triples 100000000 --num-entities 1000000 --format ntriples > kg.nt
+```
+"""
+
+import argparse
+import logging
+import string
+import sys
+import time
+from typing import List, Optional, Sequence, TextIO
+
+from .dummy_pandas import DEFAULT_CHUNK_SIZE
+from .sampling import STRATEGIES
+from .writers import (
+    DEFAULT_BASE_IRI,
+    FORMATS,
+    STDOUT,
+    WriteStats,
+    write_dummy_df,
+    write_dummy_triples,
+)
+
+
+class ProgressReporter:
+    """Print throughput and ETA of a long running write.
+
+    Args:
+        total: number of rows expected
+        stream: where to print, stderr by default
+        interval: minimum seconds between two updates
+    """
+
+    def __init__(
+        self, total: int, stream: Optional[TextIO] = None, interval: float = 0.5
+    ):
+        self.total = total
+        self.stream = sys.stderr if stream is None else stream
+        self.interval = interval
+        self.start = time.perf_counter()
+        self._last = float("-inf")
+
+    def __call__(self, rows: int):
+        now = time.perf_counter()
+        if now - self._last < self.interval and rows < self.total:
+            return
+        self._last = now
+        elapsed = now - self.start
+        rate = rows / elapsed if elapsed > 0 else 0.0
+        eta = (self.total - rows) / rate if rate > 0 else float("inf")
+        self.stream.write(
+            f"\r{rows}/{self.total} rows ({rows / max(self.total, 1):.0%}),"
+            f" {rate:,.0f} rows/s, ETA {eta:.0f}s"
+        )
+        if rows >= self.total:
+            self.stream.write("\n")
+        self.stream.flush()
+
+
+def _add_common(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "-o", "--output", default=STDOUT, help="output file, stdout by default"
+    )
+    parser.add_argument(
+        "-f", "--format", choices=FORMATS, help="inferred from --output by default"
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--content-length", type=int, default=3)
+    parser.add_argument("--allowed-chars", default=string.ascii_letters)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="do not report progress"
+    )
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="strawman", description="Generate dummy data files"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    df = commands.add_parser("df", help="random string table")
+    df.add_argument("rows", type=int)
+    df.add_argument("cols", type=int)
+    df.add_argument("--columns", nargs="+", help="column names")
+    df.add_argument(
+        "--vocabulary-size",
+        type=int,
+        help="number of distinct strings per column, all distinct by default",
+    )
+    df.add_argument("--zipf", action="store_true", help="Zipf distributed vocabulary")
+    _add_common(df)
+
+    triples = commands.add_parser("triples", help="knowledge graph triples")
+    triples.add_argument("length", type=int)
+    triples.add_argument("--num-entities", type=int)
+    triples.add_argument("--num-rel", type=int)
+    triples.add_argument("--entity-prefix", default="e")
+    triples.add_argument("--relation-prefix", default="rel")
+    triples.add_argument(
+        "--attributes",
+        action="store_true",
+        help="tails are random strings instead of entities",
+    )
+    triples.add_argument("--columns", nargs=3, help="column names")
+    triples.add_argument("--strategy", choices=STRATEGIES, default="auto")
+    triples.add_argument(
+        "--zipf", action="store_true", help="Zipf distributed heads and tails"
+    )
+    triples.add_argument("--base-iri", default=DEFAULT_BASE_IRI)
+    _add_common(triples)
+    return parser
+
+
+def _format(args: argparse.Namespace) -> Optional[str]:
+    if args.format is None and args.output == STDOUT:
+        return "csv"
+    return args.format
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the command line interface.
+
+    Args:
+        argv: command line arguments
+
+    Returns:
+        exit code
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    try:
+        stats = _run(args)
+    except (ValueError, ImportError) as err:
+        parser.error(str(err))
+    if not args.quiet:
+        sys.stderr.write(
+            f"Wrote {stats.rows} rows ({stats.bytes} bytes) to {stats.path}"
+            f" in {stats.seconds:.2f}s ({stats.rows_per_sec:,.0f} rows/s)\n"
+        )
+    return 0
+
+
+def _run(args: argparse.Namespace) -> WriteStats:
+    total = args.rows if args.command == "df" else args.length
+    progress = None if args.quiet else ProgressReporter(total)
+    columns: Optional[List[str]] = args.columns
+    if args.command == "df":
+        return write_dummy_df(
+            args.output,
+            (args.rows, args.cols),
+            format=_format(args),
+            chunk_size=args.chunk_size,
+            content_length=args.content_length,
+            allowed_chars=args.allowed_chars,
+            columns=columns,
+            seed=args.seed,
+            workers=args.workers,
+            progress=progress,
+            vocabulary_size=args.vocabulary_size,
+            vocabulary_distribution="zipf" if args.zipf else "uniform",
+        )
+    return write_dummy_triples(
+        args.output,
+        args.length,
+        format=_format(args),
+        chunk_size=args.chunk_size,
+        base_iri=args.base_iri,
+        progress=progress,
+        num_entities=args.num_entities,
+        num_rel=args.num_rel,
+        entity_prefix=args.entity_prefix,
+        relation_prefix=args.relation_prefix,
+        relation_triples=not args.attributes,
+        columns=columns,
+        content_length=args.content_length,
+        allowed_chars=args.allowed_chars,
+        seed=args.seed,
+        strategy=args.strategy,
+        workers=args.workers,
+        head_distribution="zipf" if args.zipf else "uniform",
+        tail_distribution="zipf" if args.zipf else "uniform",
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,45 +1,136 @@
 import logging
 import math
 import string
-from typing import List, Optional, Set, Tuple
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import numpy as np
-import pandas as pd
 
+from .arrow import _import_pyarrow, chunked_arrays, dictionary_array, string_arrays
+from .backends import (
+    Frame,
+    _uses_arrow,
+    _uses_numpy,
+    arrow_output,
+    numpy_output,
+)
+from .sampling import (
+    Distribution,
+    TripleIdArrays,
+    TripleIds,
+    Zipf,
+    distribution_weights,
+    extend_triple_ids,
+    id_dtype,
+    iter_corrupted_triple_ids,
+    iter_triple_ids,
+)
+from .schema import (
+    Categoricals,
+    ColumnSpec,
+    Schema,
+    sample_column,
+    schema_columns,
+    schema_parts,
+)
+from .stats import GenerationStats, _phase, _timed
 from .utils import (
+    _block_rng,
     _coherence_check_non_negative,
-    _init_rng,
-    random_string_generator,
-    sequence_choice,
-    shuffled_overlong,
+    _init_seed,
+    _ordered_map,
+    _rechunk,
+    random_strings,
 )
 
 TRIPLES_COL = ["head", "relation", "tail"]
+DEFAULT_CHUNK_SIZE = 100_000
+TRIPLE_OUTPUTS = ("strings", "categorical", "ids")
+# number of rows of dummy_df drawn from one random stream
+DF_BLOCK_ROWS = 2**16
+# stream of the vocabularies, beyond the stream of any block
+VOCABULARY_STREAM = 2**48
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+    import pyarrow as pa
+
+    from .planning import TriplesPlan
 
 logger = logging.getLogger(__name__)
 
 
+TriplesBuilder = Callable[
+    [np.ndarray, np.ndarray, np.ndarray, int],
+    Union[Frame, TripleIds],
+]
+
+
 def dummy_df(
     shape: Tuple[int, int],
     content_length: int = 3,
     allowed_chars: str = string.ascii_letters,
     columns: List[str] = None,
     seed: int = None,
-) -> pd.DataFrame:
+    workers: int = 1,
+    dtype_backend: Optional[str] = None,
+    backend: str = "pandas",
+    schema: Optional[Schema] = None,
+    vocabulary_size: Optional[Union[int, Sequence[int]]] = None,
+    vocabulary_distribution: Distribution = "uniform",
+    stats: Optional[GenerationStats] = None,
+) -> Frame:
     """Create a dummy DataFrame.
 
+    With `dtype_backend="pyarrow"` the columns are Arrow strings (`ArrowDtype`)
+    built directly from the generated characters, without creating Python
+    string objects. `backend="pyarrow"` returns the same data as a
+    `pyarrow.Table`. Both require pyarrow. `backend="numpy"` returns the
+    columns as views of the generated cells, without creating a DataFrame.
+
+    Instead of random strings, `schema` maps column names to typed column
+    specifications (see `strawman.schema`), e.g. integer ranges, float
+    distributions, datetimes, booleans or categoricals with a share of nulls.
+    Each column is drawn as native NumPy array.
+
+    With `vocabulary_size` every column only contains that many distinct
+    strings, which are generated once. The cells are drawn as codes into
+    this vocabulary, uniformly or skewed by `vocabulary_distribution`, and
+    returned as categorical columns.
+
     Args:
         shape: Dimensions of the DataFrame
         content_length: length of the strings in the cells
         allowed_chars: string containing the allowed chars
         columns: columns names
         seed: seed for reproducibility
+        workers: number of processes generating blocks of rows
+        dtype_backend: None for object columns or "pyarrow" for Arrow backed columns
+        backend: "pandas", "numpy", "structured", "pyarrow" or "polars", see `strawman.backends`
+        schema: column name to column specification, the number of columns has to match shape
+        vocabulary_size: number of distinct strings per column, or one number for every column
+        vocabulary_distribution: "uniform", "zipf", a `strawman.sampling.Zipf` or weights of the vocabulary strings
+        stats: Collects the time of the "sampling" and "frame" phases and the number of rows, see `strawman.stats`
 
     Returns:
-        Randomly generated DataFrame
+        Randomly generated DataFrame, or the output of `backend`
 
     Raises:
-        ValueError: if length of columns does not match shape
+        ValueError: if length of columns or schema does not match shape
 
     Example:
 
@@ -59,22 +150,542 @@ def dummy_df(
         9  lZe  Krw  TRs
     ```
     """
+    _coherence_check_df(shape, columns, schema)
+    _uses_arrow(backend, dtype_backend)
+    seed = _init_seed(seed)
+    with _phase(stats, "sampling"):
+        schema, columns = _vocabulary_schema(
+            shape,
+            columns,
+            schema,
+            content_length,
+            allowed_chars,
+            seed,
+            vocabulary_size,
+            vocabulary_distribution,
+        )
+        blocks = list(
+            _df_blocks(shape, content_length, allowed_chars, seed, workers, schema)
+        )
+    with _phase(stats, "frame"):
+        frame = _df_frame(blocks, shape, columns, schema, dtype_backend, backend)
+    if stats is not None:
+        stats.count(rows=shape[0])
+    return frame
+
+
+def iter_dummy_df(
+    shape: Tuple[int, int],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    content_length: int = 3,
+    allowed_chars: str = string.ascii_letters,
+    columns: List[str] = None,
+    seed: int = None,
+    workers: int = 1,
+    dtype_backend: Optional[str] = None,
+    backend: str = "pandas",
+    schema: Optional[Schema] = None,
+    vocabulary_size: Optional[Union[int, Sequence[int]]] = None,
+    vocabulary_distribution: Distribution = "uniform",
+    stats: Optional[GenerationStats] = None,
+) -> Iterator[Frame]:
+    """Create a dummy DataFrame chunk by chunk.
+
+    Only one chunk is held in memory at a time. For a given seed the
+    concatenated chunks are equal to `dummy_df`, regardless of the chunk size.
+
+    Args:
+        shape: Dimensions of the whole DataFrame
+        chunk_size: Number of rows per chunk
+        content_length: length of the strings in the cells
+        allowed_chars: string containing the allowed chars
+        columns: columns names
+        seed: seed for reproducibility
+        workers: number of processes generating blocks of rows
+        dtype_backend: None for object columns or "pyarrow" for Arrow backed columns
+        backend: "pandas", "numpy", "structured", "pyarrow" or "polars", see `strawman.backends`
+        schema: column name to column specification, see `dummy_df`
+        vocabulary_size: number of distinct strings per column, see `dummy_df`
+        vocabulary_distribution: distribution of the vocabulary strings, see `dummy_df`
+        stats: Collects phase times and the number of rows over all chunks, see `dummy_df`
+
+    Yields:
+        consecutive chunks of the randomly generated DataFrame
+
+    Example:
+
+    ```pycon
+    >>> from strawman import iter_dummy_df
+    >>> for chunk in iter_dummy_df((1000, 3), chunk_size=400, seed=1):
+    ...     print(chunk.shape)
+    (400, 3)
+    (400, 3)
+    (200, 3)
+    ```
+    """
+    _coherence_check_df(shape, columns, schema)
+    _uses_arrow(backend, dtype_backend)
+    seed = _init_seed(seed)
+    with _phase(stats, "sampling"):
+        schema, columns = _vocabulary_schema(
+            shape,
+            columns,
+            schema,
+            content_length,
+            allowed_chars,
+            seed,
+            vocabulary_size,
+            vocabulary_distribution,
+        )
+    blocks = _df_blocks(shape, content_length, allowed_chars, seed, workers, schema)
+    start = 0
+    for chunk in _rechunk(_timed(blocks, stats, "sampling"), chunk_size):
+        with _phase(stats, "frame"):
+            frame = _df_frame(
+                [chunk], shape, columns, schema, dtype_backend, backend, start=start
+            )
+        if stats is not None:
+            stats.count(rows=len(chunk[0]))
+        yield frame
+        start += len(chunk[0])
+
+
+def dummy_df_slice(
+    shape: Tuple[int, int],
+    start: int,
+    stop: int,
+    seed: int,
+    content_length: int = 3,
+    allowed_chars: str = string.ascii_letters,
+    columns: List[str] = None,
+    workers: int = 1,
+    dtype_backend: Optional[str] = None,
+    backend: str = "pandas",
+    schema: Optional[Schema] = None,
+    vocabulary_size: Optional[Union[int, Sequence[int]]] = None,
+    vocabulary_distribution: Distribution = "uniform",
+) -> Frame:
+    """Create rows `start` to `stop` of a dummy DataFrame without the rows before.
+
+    Rows are generated in blocks with their own random streams derived from
+    `seed`, so only the blocks overlapping the slice are generated. The result
+    is equal to `dummy_df(shape, seed=seed).iloc[start:stop]`, which lets
+    independent workers produce partitions of a huge DataFrame without
+    coordination. Triples cannot be sliced this way, since every row depends
+    on all previously accepted triples.
+
+    Args:
+        shape: Dimensions of the whole DataFrame
+        start: First row of the slice
+        stop: Row after the last row of the slice
+        seed: seed of the whole DataFrame
+        content_length: length of the strings in the cells
+        allowed_chars: string containing the allowed chars
+        columns: columns names
+        workers: number of processes generating blocks of rows
+        dtype_backend: None for object columns or "pyarrow" for Arrow backed columns
+        backend: "pandas", "numpy", "structured", "pyarrow" or "polars", see `strawman.backends`
+        schema: column name to column specification, see `dummy_df`
+        vocabulary_size: number of distinct strings per column, see `dummy_df`
+        vocabulary_distribution: distribution of the vocabulary strings, see `dummy_df`
+
+    Returns:
+        the rows of the slice, indexed by their position in the whole DataFrame
+
+    Raises:
+        ValueError: if the slice is not within the shape
+
+    Example:
+
+    ```pycon
+    >>> from strawman import dummy_df_slice
+    >>> dummy_df_slice((10**9, 3), 900_000_000, 900_000_002, seed=1)
+                 0    1    2
+    900000000  XfP  ifc  fRD
+    900000001  NLC  OaG  KmE
+    ```
+    """
+    _coherence_check_df(shape, columns, schema)
+    if not 0 <= start <= stop <= shape[0]:
+        raise ValueError(
+            f"Slice {start}:{stop} is not within the {shape[0]} rows of the DataFrame"
+        )
+    _uses_arrow(backend, dtype_backend)
+    schema, columns = _vocabulary_schema(
+        shape,
+        columns,
+        schema,
+        content_length,
+        allowed_chars,
+        seed,
+        vocabulary_size,
+        vocabulary_distribution,
+    )
+    first = start // DF_BLOCK_ROWS
+    blocks = list(
+        _df_blocks(
+            shape,
+            content_length,
+            allowed_chars,
+            seed,
+            workers,
+            schema,
+            blocks=range(first, -(-stop // DF_BLOCK_ROWS)),
+        )
+    )
+    offset = start - first * DF_BLOCK_ROWS
+    if blocks:
+        blocks = [
+            tuple(
+                np.concatenate(arrays)[offset : offset + stop - start]
+                for arrays in zip(*blocks)
+            )
+        ]
+    return _df_frame(blocks, shape, columns, schema, dtype_backend, backend, start)
+
+
+class LazyDummyDf:
+    """Dummy DataFrame whose rows are only generated when they are accessed.
+
+    Slicing returns the same rows as `dummy_df` with the same arguments would,
+    see [dummy_df_slice][strawman.dummy_df_slice].
+
+    Args:
+        shape: Dimensions of the DataFrame
+        seed: seed for reproducibility
+        content_length: length of the strings in the cells
+        allowed_chars: string containing the allowed chars
+        columns: columns names
+        workers: number of processes generating blocks of rows
+        dtype_backend: None for object columns or "pyarrow" for Arrow backed columns
+        schema: column name to column specification, see `dummy_df`
+        vocabulary_size: number of distinct strings per column, see `dummy_df`
+        vocabulary_distribution: distribution of the vocabulary strings, see `dummy_df`
+
+    Example:
+
+    ```pycon
+    >>> from strawman import LazyDummyDf
+    >>> df = LazyDummyDf((10**12, 3), seed=1)
+    >>> df[-2:]
+                    0    1    2
+    999999999998  UJP  PDj  Bvs
+    999999999999  QHd  YDa  TQy
+    ```
+    """
+
+    def __init__(
+        self,
+        shape: Tuple[int, int],
+        seed: int = None,
+        content_length: int = 3,
+        allowed_chars: str = string.ascii_letters,
+        columns: List[str] = None,
+        workers: int = 1,
+        dtype_backend: Optional[str] = None,
+        schema: Optional[Schema] = None,
+        vocabulary_size: Optional[Union[int, Sequence[int]]] = None,
+        vocabulary_distribution: Distribution = "uniform",
+    ):
+        _coherence_check_df(shape, columns, schema)
+        _uses_arrow("pandas", dtype_backend)
+        self.shape = shape
+        self.seed = _init_seed(seed)
+        self.content_length = content_length
+        self.allowed_chars = allowed_chars
+        self.workers = workers
+        self.dtype_backend = dtype_backend
+        # the vocabulary is only generated once
+        self.schema, self.columns = _vocabulary_schema(
+            shape,
+            columns,
+            schema,
+            content_length,
+            allowed_chars,
+            self.seed,
+            vocabulary_size,
+            vocabulary_distribution,
+        )
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, key: Union[int, slice]) -> Union["pd.DataFrame", "pd.Series"]:
+        """Generate a row or a slice of rows.
+
+        Args:
+            key: row position or slice of row positions
+
+        Returns:
+            the row as Series or the rows as DataFrame
+
+        Raises:
+            IndexError: if the row position is out of bounds
+            TypeError: if key is neither int nor slice
+        """
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step < 0:
+                return self[stop + 1 : start + 1][::-1][::-step]
+            return self._slice(start, max(start, stop))[::step]
+        if isinstance(key, (int, np.integer)):
+            position = key + len(self) if key < 0 else key
+            if not 0 <= position < len(self):
+                raise IndexError(f"Row {key} is out of bounds for {len(self)} rows")
+            return self._slice(position, position + 1).iloc[0]
+        raise TypeError(f"Rows must be selected by int or slice, not {type(key)}")
+
+    def _slice(self, start: int, stop: int) -> "pd.DataFrame":
+        return dummy_df_slice(
+            self.shape,
+            start,
+            stop,
+            seed=self.seed,
+            content_length=self.content_length,
+            allowed_chars=self.allowed_chars,
+            columns=self.columns,
+            workers=self.workers,
+            dtype_backend=self.dtype_backend,
+            schema=self.schema,
+        )
+
+
+def _coherence_check_df(
+    shape: Tuple[int, int],
+    columns: Optional[List[str]],
+    schema: Optional[Schema] = None,
+):
     if columns and len(columns) != shape[1]:
         raise ValueError(
             f"Length of columns ({len(columns)}) does not match shape ({shape})!"
         )
-    rng = _init_rng(seed=seed)
-    df = pd.DataFrame(np.full(shape, np.nan), columns=columns)
-    return df.applymap(
-        lambda x, content_length, allowed_chars, rng: random_string_generator(
-            str_size=content_length, allowed_chars=allowed_chars, rng=rng
+    if schema is not None:
+        if columns is not None:
+            raise ValueError("Column names are taken from the schema, omit columns")
+        if len(schema) != shape[1]:
+            raise ValueError(
+                f"Length of schema ({len(schema)}) does not match shape ({shape})!"
+            )
+        for spec in schema.values():
+            spec.validate()
+
+
+def _vocabulary_schema(
+    shape: Tuple[int, int],
+    columns: Optional[List[str]],
+    schema: Optional[Schema],
+    content_length: int,
+    allowed_chars: str,
+    seed: int,
+    vocabulary_size: Optional[Union[int, Sequence[int]]],
+    vocabulary_distribution: Distribution,
+) -> Tuple[Optional[Schema], Optional[List[str]]]:
+    # categorical columns drawing from a vocabulary of random strings
+    if vocabulary_size is None:
+        return schema, columns
+    if schema is not None:
+        raise ValueError("vocabulary_size cannot be combined with schema")
+    sizes = (
+        [vocabulary_size] * shape[1]
+        if isinstance(vocabulary_size, (int, np.integer))
+        else list(vocabulary_size)
+    )
+    if len(sizes) != shape[1]:
+        raise ValueError(
+            f"Length of vocabulary_size ({len(sizes)}) does not match shape ({shape})!"
+        )
+    # default column names are the column positions
+    names: List[Hashable] = list(range(shape[1]) if columns is None else columns)
+    vocabularies: Dict[Any, ColumnSpec] = {}
+    for column, (name, size) in enumerate(zip(names, sizes)):
+        if size < 1:
+            raise ValueError(f"vocabulary_size must be >= 1 but was {size}")
+        vocabulary = random_strings(
+            size,
+            str_size=content_length,
+            allowed_chars=allowed_chars,
+            rng=_block_rng(seed, VOCABULARY_STREAM, column),
+            unique=True,
+        )
+        vocabularies[name] = Categoricals(
+            vocabulary, weights=distribution_weights(vocabulary_distribution, size)
+        )
+    return vocabularies, None
+
+
+def _df_frame(
+    blocks: List[Tuple[np.ndarray, ...]],
+    shape: Tuple[int, int],
+    columns: Optional[List[str]],
+    schema: Optional[Schema],
+    dtype_backend: Optional[str],
+    backend: str,
+    start: int = 0,
+) -> Frame:
+    arrow = _uses_arrow(backend, dtype_backend)
+    if schema is None and arrow:
+        return _arrow_df(
+            [cells for cells, in blocks], shape[1], columns, backend, start
+        )
+    arrays = [
+        np.concatenate(column) if len(column) > 1 else column[0]
+        for column in zip(*blocks)
+    ]
+    if schema is None:
+        cells = arrays[0] if arrays else np.empty((0, shape[1]), dtype="U1")
+        return _cells_frame(cells, columns, backend, start)
+    if not arrays:
+        # no rows, sample empty columns to get the dtypes
+        rng = np.random.default_rng(0)
+        arrays = [
+            array for spec in schema.values() for array in sample_column(spec, 0, rng)
+        ]
+    if arrow:
+        return arrow_output(
+            list(schema), _schema_arrow_arrays(schema, arrays), backend, start
+        )
+    if _uses_numpy(backend):
+        return numpy_output(schema_columns(schema, arrays, numpy=True), backend)
+    import pandas as pd
+
+    return pd.DataFrame(
+        schema_columns(schema, arrays),
+        index=pd.RangeIndex(start, start + len(arrays[0])),
+    )
+
+
+def _cells_frame(
+    cells: np.ndarray, columns: Optional[List[str]], backend: str, start: int = 0
+) -> Frame:
+    rows, num_cols = cells.shape
+    names = range(num_cols) if columns is None else columns
+    if backend == "numpy":
+        # columns are views of the cells
+        return {name: cells[:, col] for col, name in enumerate(names)}
+    if backend == "structured":
+        # every row of the cells already has the memory layout of a record
+        return np.ascontiguousarray(cells).view(
+            [(str(name), cells.dtype) for name in names]
+        )[:, 0]
+    import pandas as pd
+
+    return pd.DataFrame(
+        cells, columns=columns, index=pd.RangeIndex(start, start + rows)
+    )
+
+
+def _schema_arrow_arrays(
+    schema: Schema, arrays: Sequence[np.ndarray]
+) -> List["pa.Array"]:
+    pa = _import_pyarrow("Arrow output")
+    columns = []
+    for _, spec, values, mask in schema_parts(schema, arrays):
+        if isinstance(spec, Categoricals):
+            codes = pa.array(values.astype(id_dtype(len(spec.categories))), mask=mask)
+            columns.append(
+                pa.DictionaryArray.from_arrays(codes, pa.array(list(spec.categories)))
+            )
+        else:
+            # NaN and NaT are nulls, like in pandas
+            columns.append(pa.array(values, mask=mask, from_pandas=True))
+    return columns
+
+
+def _arrow_df(
+    blocks: Iterable[np.ndarray],
+    num_cols: int,
+    columns: Optional[List[str]],
+    backend: str,
+    start: int = 0,
+) -> Frame:
+    # every block becomes one chunk of the Arrow columns
+    arrays = chunked_arrays([string_arrays(cells) for cells in blocks], num_cols)
+    names = range(num_cols) if columns is None else columns
+    return arrow_output(names, arrays, backend, start)
+
+
+def _string_block(
+    shape: Tuple[int, int],
+    content_length: int,
+    allowed_chars: str,
+    seed: int,
+    block_rows: int,
+    block: int,
+) -> Tuple[np.ndarray]:
+    rows, cols = shape
+    return (
+        random_strings(
+            (min(block_rows, rows - block * block_rows), cols),
+            str_size=content_length,
+            allowed_chars=allowed_chars,
+            rng=_block_rng(seed, block),
         ),
-        content_length=content_length,
-        allowed_chars=allowed_chars,
-        rng=rng,
     )
 
 
+def _schema_block(
+    rows: int,
+    schema: Schema,
+    seed: int,
+    block_rows: int,
+    block: int,
+) -> Tuple[np.ndarray, ...]:
+    size = min(block_rows, rows - block * block_rows)
+    # every column has its own stream, so columns do not depend on each other
+    return tuple(
+        array
+        for column, spec in enumerate(schema.values())
+        for array in sample_column(spec, size, _block_rng(seed, block, column))
+    )
+
+
+def _df_blocks(
+    shape: Tuple[int, int],
+    content_length: int,
+    allowed_chars: str,
+    seed: int,
+    workers: int = 1,
+    schema: Optional[Schema] = None,
+    blocks: Optional[range] = None,
+) -> Iterator[Tuple[np.ndarray, ...]]:
+    func: Callable[[int], Tuple[np.ndarray, ...]]
+    if schema is None:
+        func = partial(
+            _string_block, shape, content_length, allowed_chars, seed, DF_BLOCK_ROWS
+        )
+    else:
+        func = partial(_schema_block, shape[0], schema, seed, DF_BLOCK_ROWS)
+    return _ordered_map(
+        func,
+        range(-(-shape[0] // DF_BLOCK_ROWS)) if blocks is None else blocks,
+        workers=workers,
+    )
+
+
+def _prefixed_ids(prefix: str, num: int) -> np.ndarray:
+    return np.array([prefix + str(i) for i in range(num)], dtype=object)
+
+
+class _TripleLabels(NamedTuple):
+    columns: List[str]
+    heads: np.ndarray
+    rels: np.ndarray
+    tails: np.ndarray
+    # number of attribute values or None for relation triples
+    num_tail: Optional[int]
+
+    @property
+    def width(self) -> int:
+        return max(
+            (
+                len(str(label))
+                for values in (self.heads, self.rels, self.tails)
+                for label in values
+            ),
+            default=1,
+        )
+
+
 def _coherence_check(
     length: int,
     num_entities: Optional[int],
@@ -106,32 +717,6 @@ def _coherence_check(
                 )
 
 
-def _choose_tail(head: str, tail_values: List[str], rng: np.random.Generator):
-    tail = sequence_choice(tail_values, rng)
-    while head == tail and not len(tail_values) == 1:
-        tail = sequence_choice(tail_values, rng)
-    return tail
-
-
-def _choose_rel_tail(
-    head: str, rel_values: List[str], tail_values: List[str], rng: np.random.Generator
-) -> Tuple[str, str]:
-    """Choose relation and tail where tail is not equal to head.
-
-    Args:
-        head: head value
-        rel_values: possible relation values
-        tail_values: possible tail values
-        rng: rng to control randomness
-
-    Returns:
-        relation, tail
-    """
-    rel = sequence_choice(rel_values, rng)
-    tail = _choose_tail(head=head, tail_values=tail_values, rng=rng)
-    return rel, tail
-
-
 def dummy_triples(
     length: int,
     num_entities: int = None,
@@ -145,7 +730,17 @@ def dummy_triples(
     content_length: int = 3,
     allowed_chars: str = string.ascii_letters,
     seed: int = None,
-) -> pd.DataFrame:
+    strategy: str = "auto",
+    workers: int = 1,
+    output: str = "strings",
+    dtype_backend: Optional[str] = None,
+    backend: str = "pandas",
+    head_distribution: Distribution = "uniform",
+    relation_distribution: Distribution = "uniform",
+    tail_distribution: Distribution = "uniform",
+    stats: Optional[GenerationStats] = None,
+    plan: Optional["TriplesPlan"] = None,
+) -> Union[Frame, TripleIds]:
     """Create dummy DataFrame in form of triples.
 
     The default columns are ["head","relation","tail"].
@@ -157,6 +752,30 @@ def dummy_triples(
 
     If `relation_triples` is False, the last column contains randomly generated strings.
 
+    By default triples are drawn randomly and duplicates are rejected. If a large
+    share of all possible triples is requested, distinct triples are sampled
+    directly instead, which cannot fail (see `strawman.sampling.sample_triple_ids`).
+
+    With `output="categorical"` the columns are pandas Categoricals, head and
+    tail share one entity dtype for relation triples. `output="ids"` skips
+    creating labels altogether and returns a [TripleIds][strawman.sampling.TripleIds]
+    with an int32 (or int64 for huge label sets) array of shape `(length, 3)`
+    and the label arrays the ids refer to.
+
+    With `dtype_backend="pyarrow"` the columns are Arrow backed (`ArrowDtype`),
+    strings are taken from one Arrow array of labels and categorical output
+    becomes Arrow dictionary arrays. `backend="pyarrow"` returns a
+    `pyarrow.Table` instead of a DataFrame. Both require pyarrow.
+
+    Heads, relations and tails are uniformly distributed by default. Skewed
+    distributions like `head_distribution="zipf"` give a few entities very
+    high degrees, like in real knowledge graphs. All entities still show up
+    and self-links are still avoided.
+
+    A [TriplesPlan][strawman.planning.TriplesPlan] of `strawman.planning.plan`
+    sets the strategy. Plans that require streaming have to be passed to
+    `iter_dummy_triples` or `write_dummy_triples` instead.
+
     Args:
         length: Length of the DataFrame
         num_entities: Number of unique entities
@@ -170,9 +789,19 @@ def dummy_triples(
         content_length: Length of randomly generated string
         allowed_chars: Allowed characters in randomly generated string
         seed: Seed for reproducibility.
+        strategy: Sampling strategy, one of "auto", "rejection" or "exact"
+        workers: Number of processes drawing candidate triples
+        output: One of "strings", "categorical" or "ids"
+        dtype_backend: None for numpy backed columns or "pyarrow" for Arrow backed columns
+        backend: "pandas", "numpy", "structured", "pyarrow" or "polars", see `strawman.backends`
+        head_distribution: "uniform", "zipf", a `strawman.sampling.Zipf` or weights of the entities as heads
+        relation_distribution: Distribution of the relations, like `head_distribution`
+        tail_distribution: Distribution of the entities or attribute values as tails
+        stats: Collects the time of the "labels", "warm_up", "sampling" and "frame" phases and the candidate counters, see `strawman.stats`
+        plan: Strategy planned by `strawman.planning.plan` for the same arguments, overrides `strategy`
 
     Returns:
-        randomly generated triple DataFrame
+        randomly generated triple DataFrame, `TripleIds` if `output` is "ids" or the output of `backend`
 
     Raises:
         ValueError: If dummy_triples cannot be generated with the given specifications
@@ -212,70 +841,744 @@ def dummy_triples(
     9   e5     rel0  rmM
     ```
     """
-    _coherence_check(
+    if plan is not None:
+        if plan.streaming:
+            raise ValueError(
+                f"The plan streams chunks of {plan.chunk_size} rows, use iter_dummy_triples or write_dummy_triples"
+            )
+    with _phase(stats, "labels"):
+        labels, seed = _prepare_triples(
+            length=length,
+            num_entities=num_entities,
+            num_rel=num_rel,
+            entity_prefix=entity_prefix,
+            relation_prefix=relation_prefix,
+            relation_triples=relation_triples,
+            entity_ids=entity_ids,
+            relation_ids=relation_ids,
+            columns=columns,
+            content_length=content_length,
+            allowed_chars=allowed_chars,
+            seed=seed,
+        )
+        build = _triples_builder(labels, output, dtype_backend, backend)
+    if plan is not None:
+        strategy = _apply_plan(
+            plan,
+            labels,
+            length=length,
+            relation_triples=relation_triples,
+            content_length=content_length,
+            allowed_chars=allowed_chars,
+            entity_prefix=entity_prefix,
+            relation_prefix=relation_prefix,
+            output=output,
+            backend=backend,
+            head_distribution=head_distribution,
+            relation_distribution=relation_distribution,
+            tail_distribution=tail_distribution,
+        )
+    heads, rels, tails = (
+        np.concatenate(col)
+        for col in zip(
+            *iter_triple_ids(
+                length=length,
+                num_entities=len(labels.heads),
+                num_rel=len(labels.rels),
+                num_tail=labels.num_tail,
+                seed=seed,
+                strategy=strategy,
+                workers=workers,
+                head_distribution=head_distribution,
+                relation_distribution=relation_distribution,
+                tail_distribution=tail_distribution,
+                stats=stats,
+            )
+        )
+    )
+    with _phase(stats, "frame"):
+        return build(heads, rels, tails, 0)
+
+
+def iter_dummy_triples(
+    length: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    num_entities: int = None,
+    num_rel: int = None,
+    entity_prefix: str = "e",
+    relation_prefix: str = "rel",
+    relation_triples: bool = True,
+    entity_ids: List[str] = None,
+    relation_ids: List[str] = None,
+    columns: List[str] = None,
+    content_length: int = 3,
+    allowed_chars: str = string.ascii_letters,
+    seed: int = None,
+    strategy: str = "auto",
+    workers: int = 1,
+    output: str = "strings",
+    dtype_backend: Optional[str] = None,
+    backend: str = "pandas",
+    head_distribution: Distribution = "uniform",
+    relation_distribution: Distribution = "uniform",
+    tail_distribution: Distribution = "uniform",
+    stats: Optional[GenerationStats] = None,
+    plan: Optional["TriplesPlan"] = None,
+) -> Iterator[Union[Frame, TripleIds]]:
+    """Create dummy triples chunk by chunk.
+
+    Rows are unique across all chunks and all entities show up at least once.
+    Previously generated rows are only remembered as packed int64 keys.
+    For a given seed the concatenated chunks are equal to `dummy_triples`,
+    regardless of the chunk size.
+
+    Args:
+        length: Length of the whole DataFrame
+        chunk_size: Number of rows per chunk
+        num_entities: Number of unique entities
+        num_rel: Number of unique relations
+        entity_prefix: Prefix for entity strings
+        relation_prefix: Prefix for relation strings
+        relation_triples: If True the last column contains entities, else randomly generated string
+        entity_ids: Predefined entity ids
+        relation_ids: Predefined relation ids
+        columns: Column names ["head","relation","tail"] by default
+        content_length: Length of randomly generated string
+        allowed_chars: Allowed characters in randomly generated string
+        seed: Seed for reproducibility.
+        strategy: Sampling strategy, one of "auto", "rejection" or "exact"
+        workers: Number of processes drawing candidate triples
+        output: One of "strings", "categorical" or "ids", see `dummy_triples`
+        dtype_backend: None for numpy backed columns or "pyarrow" for Arrow backed columns
+        backend: "pandas", "numpy", "structured", "pyarrow" or "polars", see `strawman.backends`
+        head_distribution: "uniform", "zipf", a `strawman.sampling.Zipf` or weights of the entities as heads
+        relation_distribution: Distribution of the relations, like `head_distribution`
+        tail_distribution: Distribution of the entities or attribute values as tails
+        stats: Collects phase times and counters over all chunks, see `dummy_triples`
+        plan: Strategy and chunk size planned by `strawman.planning.plan` for the same arguments, overrides `strategy` and `chunk_size`
+
+    Yields:
+        consecutive chunks of the randomly generated triple DataFrame
+
+    Example:
+    ```pycon
+    >>> from strawman import iter_dummy_triples
+    >>> for chunk in iter_dummy_triples(1000, chunk_size=400, seed=1):
+    ...     print(chunk.shape)
+    (400, 3)
+    (400, 3)
+    (200, 3)
+    ```
+    """
+    _, frames = _triple_frames(
         length=length,
+        chunk_size=chunk_size,
         num_entities=num_entities,
         num_rel=num_rel,
         entity_prefix=entity_prefix,
+        relation_prefix=relation_prefix,
         relation_triples=relation_triples,
+        entity_ids=entity_ids,
+        relation_ids=relation_ids,
         columns=columns,
         content_length=content_length,
         allowed_chars=allowed_chars,
+        seed=seed,
+        strategy=strategy,
+        workers=workers,
+        output=output,
+        dtype_backend=dtype_backend,
+        backend=backend,
+        head_distribution=head_distribution,
+        relation_distribution=relation_distribution,
+        tail_distribution=tail_distribution,
+        stats=stats,
+        plan=plan,
     )
+    yield from frames
 
-    if columns is None:
-        columns = TRIPLES_COL
+
+def extend_triples(
+    existing: Union["pd.DataFrame", TripleIds],
+    length: int,
+    num_new_entities: int = 0,
+    num_new_rel: int = 0,
+    entity_prefix: str = "e",
+    relation_prefix: str = "rel",
+    seed: int = None,
+    workers: int = 1,
+    output: str = "strings",
+    dtype_backend: Optional[str] = None,
+    backend: str = "pandas",
+) -> Union[Frame, TripleIds]:
+    """Create new triples that extend an existing relation triple DataFrame.
+
+    The existing triples are integer coded and packed into int64 keys once,
+    new triples are then drawn like in `dummy_triples` and only looked up in
+    these keys, so generating them costs time proportional to `length` instead
+    of the size of the existing graph. The new triples are unique, differ
+    from all existing triples and contain no self-links.
+
+    New entities and relations are labelled with the prefixes and the numbers
+    following the existing ones (skipping labels that are already taken) and
+    show up at least once in the new triples.
+
+    Args:
+        existing: Relation triples, e.g. from `dummy_triples`, or their `TripleIds`
+        length: Number of new triples
+        num_new_entities: Number of entities to introduce
+        num_new_rel: Number of relations to introduce
+        entity_prefix: Prefix of new entity labels
+        relation_prefix: Prefix of new relation labels
+        seed: Seed for reproducibility.
+        workers: Number of processes drawing candidate triples
+        output: One of "strings", "categorical" or "ids", see `dummy_triples`
+        dtype_backend: None for numpy backed columns or "pyarrow" for Arrow backed columns
+        backend: "pandas", "numpy", "structured", "pyarrow" or "polars", see `strawman.backends`
+
+    Returns:
+        the new triples only, indexed after the existing rows; `TripleIds` whose labels include the existing ones if `output` is "ids"
+
+    Raises:
+        ValueError: If the new triples cannot be generated with the given specifications
+
+    Example:
+    ```pycon
+    >>> import pandas as pd
+    >>> from strawman import dummy_triples, extend_triples
+    >>> df = dummy_triples(10, seed=1)
+    >>> new = extend_triples(df, 3, num_new_entities=1, seed=2)
+    >>> new
+       head relation tail
+    10   e7     rel2   e5
+    11   e1     rel2   e5
+    12   e4     rel0   e6
+    >>> df = pd.concat([df, new])
+    ```
+    """
+    _coherence_check_non_negative(length)
+    _coherence_check_non_negative(num_new_entities)
+    _coherence_check_non_negative(num_new_rel)
+    columns, entities, rels, ids = _existing_triple_ids(existing)
+    heads, new_rels, tails = extend_triple_ids(
+        length,
+        ids,
+        num_entities=len(entities),
+        num_rel=len(rels),
+        num_new_entities=num_new_entities,
+        num_new_rel=num_new_rel,
+        seed=seed,
+        workers=workers,
+    )
+    entities = np.concatenate(
+        [entities, _new_labels(entity_prefix, entities, num_new_entities)]
+    )
+    labels = _TripleLabels(
+        columns,
+        entities,
+        np.concatenate([rels, _new_labels(relation_prefix, rels, num_new_rel)]),
+        entities,
+        None,
+    )
+    build = _triples_builder(labels, output, dtype_backend, backend)
+    return build(heads, new_rels, tails, len(ids[0]))
+
+
+def corrupt_triples(
+    triples: Union["pd.DataFrame", TripleIds],
+    num_negatives: int = 1,
+    corrupt: str = "both",
+    avoid_self_links: bool = True,
+    seed: int = None,
+    output: str = "strings",
+    dtype_backend: Optional[str] = None,
+    backend: str = "pandas",
+) -> Union[Frame, TripleIds]:
+    """Create corrupted triples that do not occur in a graph, e.g. for negative sampling.
+
+    Every triple is repeated `num_negatives` times and its head, tail or
+    randomly one of both is replaced by a random entity of the graph. The
+    triples are integer coded and packed into int64 keys once, corruptions
+    that are triples of the graph are found by vectorized lookups and redrawn
+    (see [iter_corrupted_triple_ids][strawman.sampling.iter_corrupted_triple_ids]).
+    The negatives are not deduplicated.
+
+    Args:
+        triples: Relation triples, e.g. from `dummy_triples`, or their `TripleIds`
+        num_negatives: Number of corrupted triples per positive
+        corrupt: Replace the "head", the "tail" or randomly one of "both"
+        avoid_self_links: If True the corrupted triples contain no self-links
+        seed: Seed for reproducibility.
+        output: One of "strings", "categorical" or "ids", see `dummy_triples`
+        dtype_backend: None for numpy backed columns or "pyarrow" for Arrow backed columns
+        backend: "pandas", "numpy", "structured", "pyarrow" or "polars", see `strawman.backends`
+
+    Returns:
+        the corrupted triples, rows ``i * num_negatives`` to ``(i + 1) * num_negatives - 1`` belong to triple ``i``
+
+    Raises:
+        ValueError: If some triple cannot be corrupted
+
+    Example:
+    ```pycon
+    >>> from strawman import corrupt_triples, dummy_triples
+    >>> df = dummy_triples(10, seed=1)
+    >>> corrupt_triples(df, num_negatives=2, corrupt="tail", seed=2).head(4)
+      head relation tail
+    0   e4     rel0   e1
+    1   e4     rel0   e6
+    2   e5     rel1   e6
+    3   e5     rel1   e4
+    ```
+    """
+    build, ids = _corrupted_ids(
+        triples=triples,
+        num_negatives=num_negatives,
+        corrupt=corrupt,
+        avoid_self_links=avoid_self_links,
+        seed=seed,
+        output=output,
+        dtype_backend=dtype_backend,
+        backend=backend,
+    )
+    heads, rels, tails = (np.concatenate(col) for col in zip(*ids))
+    return build(heads, rels, tails, 0)
+
+
+def iter_corrupted_triples(
+    triples: Union["pd.DataFrame", TripleIds],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    num_negatives: int = 1,
+    corrupt: str = "both",
+    avoid_self_links: bool = True,
+    seed: int = None,
+    output: str = "strings",
+    dtype_backend: Optional[str] = None,
+    backend: str = "pandas",
+) -> Iterator[Union[Frame, TripleIds]]:
+    """Create corrupted triples chunk by chunk, see `corrupt_triples`.
+
+    For a given seed the concatenated chunks are equal to `corrupt_triples`,
+    regardless of the chunk size.
+
+    Args:
+        triples: Relation triples, e.g. from `dummy_triples`, or their `TripleIds`
+        chunk_size: Number of rows per chunk
+        num_negatives: Number of corrupted triples per positive
+        corrupt: Replace the "head", the "tail" or randomly one of "both"
+        avoid_self_links: If True the corrupted triples contain no self-links
+        seed: Seed for reproducibility.
+        output: One of "strings", "categorical" or "ids", see `dummy_triples`
+        dtype_backend: None for numpy backed columns or "pyarrow" for Arrow backed columns
+        backend: "pandas", "numpy", "structured", "pyarrow" or "polars", see `strawman.backends`
+
+    Yields:
+        consecutive chunks of the corrupted triples
+    """
+    build, ids = _corrupted_ids(
+        triples=triples,
+        num_negatives=num_negatives,
+        corrupt=corrupt,
+        avoid_self_links=avoid_self_links,
+        seed=seed,
+        output=output,
+        dtype_backend=dtype_backend,
+        backend=backend,
+    )
+    start = 0
+    for heads, rels, tails in _rechunk(ids, chunk_size):
+        yield build(heads, rels, tails, start)
+        start += len(heads)
+
+
+def _corrupted_ids(
+    triples: Union["pd.DataFrame", TripleIds],
+    num_negatives: int,
+    corrupt: str,
+    avoid_self_links: bool,
+    seed: Optional[int],
+    output: str,
+    dtype_backend: Optional[str],
+    backend: str,
+) -> Tuple[TriplesBuilder, Iterator[Tuple[np.ndarray, ...]]]:
+    columns, entities, rels, ids = _existing_triple_ids(triples)
+    labels = _TripleLabels(columns, entities, rels, entities, None)
+    build = _triples_builder(labels, output, dtype_backend, backend)
+    return build, iter_corrupted_triple_ids(
+        ids,
+        num_entities=len(entities),
+        num_rel=len(rels),
+        num_negatives=num_negatives,
+        corrupt=corrupt,
+        avoid_self_links=avoid_self_links,
+        seed=_init_seed(seed),
+    )
+
+
+def _existing_triple_ids(
+    existing: Union["pd.DataFrame", TripleIds],
+) -> Tuple[List[str], np.ndarray, np.ndarray, TripleIdArrays]:
+    # columns, entity labels, relation labels and ids of existing triples
+    if isinstance(existing, TripleIds):
+        if existing.attribute_values is not None:
+            raise ValueError("Only relation triples can be extended")
+        return (
+            TRIPLES_COL,
+            np.asarray(existing.entity_ids, dtype=object),
+            np.asarray(existing.relation_ids, dtype=object),
+            (existing.triples[:, 0], existing.triples[:, 1], existing.triples[:, 2]),
+        )
+    import pandas as pd
+
+    if len(existing.columns) != 3:
+        raise ValueError(f"Expected 3 columns but got {existing.columns.tolist()}")
+    head, rel, tail = (existing.iloc[:, col] for col in range(3))
+    if isinstance(head.dtype, pd.CategoricalDtype) and head.dtype == tail.dtype:
+        # categories are already integer coded
+        entities = head.cat.categories
+        head_ids, tail_ids = head.cat.codes.to_numpy(), tail.cat.codes.to_numpy()
+    else:
+        codes, entities = pd.factorize(pd.concat([head, tail], ignore_index=True))
+        head_ids, tail_ids = codes[: len(head)], codes[len(head) :]
+    if isinstance(rel.dtype, pd.CategoricalDtype):
+        rels, rel_ids = rel.cat.categories, rel.cat.codes.to_numpy()
+    else:
+        rel_ids, rels = pd.factorize(rel)
+    ids = (head_ids, rel_ids, tail_ids)
+    if any((codes < 0).any() for codes in ids):
+        raise ValueError("Existing triples must not contain missing values")
+    return (
+        existing.columns.tolist(),
+        np.asarray(entities, dtype=object),
+        np.asarray(rels, dtype=object),
+        ids,
+    )
+
+
+def _new_labels(prefix: str, taken: np.ndarray, num: int) -> np.ndarray:
+    # prefixed labels numbered after the taken ones, skipping taken labels
+    taken_labels = set(taken)
+    labels = np.empty(0, dtype=object)
+    start = len(taken)
+    while len(labels) < num:
+        missing = num - len(labels)
+        candidates = np.array(
+            [prefix + str(i) for i in range(start, start + missing)], dtype=object
+        )
+        free = np.array([label not in taken_labels for label in candidates], dtype=bool)
+        labels = np.concatenate([labels, candidates[free]])
+        start += missing
+    return labels
+
+
+def _triple_frames(
+    length: int,
+    chunk_size: int,
+    seed: Optional[int] = None,
+    strategy: str = "auto",
+    workers: int = 1,
+    output: str = "strings",
+    dtype_backend: Optional[str] = None,
+    backend: str = "pandas",
+    head_distribution: Distribution = "uniform",
+    relation_distribution: Distribution = "uniform",
+    tail_distribution: Distribution = "uniform",
+    stats: Optional[GenerationStats] = None,
+    plan: Optional["TriplesPlan"] = None,
+    **kwargs,
+) -> Tuple[_TripleLabels, Iterator[Union[Frame, TripleIds]]]:
+    # kwargs are the label arguments of iter_dummy_triples
+    with _phase(stats, "labels"):
+        labels, seed = _prepare_triples(length=length, seed=seed, **kwargs)
+        build = _triples_builder(labels, output, dtype_backend, backend)
+    if plan is not None:
+        strategy = _apply_plan(
+            plan,
+            labels,
+            length=length,
+            output=output,
+            backend=backend,
+            head_distribution=head_distribution,
+            relation_distribution=relation_distribution,
+            tail_distribution=tail_distribution,
+            **kwargs,
+        )
+        if plan.chunk_size is not None:
+            chunk_size = plan.chunk_size
+    ids = iter_triple_ids(
+        length=length,
+        num_entities=len(labels.heads),
+        num_rel=len(labels.rels),
+        num_tail=labels.num_tail,
+        seed=seed,
+        strategy=strategy,
+        workers=workers,
+        head_distribution=head_distribution,
+        relation_distribution=relation_distribution,
+        tail_distribution=tail_distribution,
+        stats=stats,
+    )
+
+    def frames() -> Iterator[Union[Frame, TripleIds]]:
+        start = 0
+        for heads, rels, tails in _rechunk(ids, chunk_size):
+            with _phase(stats, "frame"):
+                frame = build(heads, rels, tails, start)
+            yield frame
+            start += len(heads)
+
+    return labels, frames()
+
+
+def _apply_plan(plan: "TriplesPlan", labels: _TripleLabels, **arguments) -> str:
+    # strategy of the plan, which has to be made for the same generator
+    # arguments and label sizes, other arguments are not planned for
+    arguments.update(
+        num_entities=len(labels.heads),
+        num_rel=len(labels.rels),
+        num_tail=len(labels.heads) if labels.num_tail is None else labels.num_tail,
+    )
+    planned = plan.estimate.parameters._asdict()
+    for name, value in arguments.items():
+        if name in planned and not _same_argument(planned[name], value):
+            raise ValueError(
+                f"The plan was made for {name}={planned[name]!r}, not {value!r}"
+            )
+    return plan.strategy
+
+
+def _same_argument(planned: Any, value: Any) -> bool:
+    # distributions can be names, Zipf tuples or arrays of weights
+    if isinstance(planned, (str, Zipf)) or isinstance(value, (str, Zipf)):
+        return type(planned) is type(value) and planned == value
+    return bool(np.array_equal(planned, value))
+
+
+def _triple_sizes(
+    length: int, num_entities: Optional[int], num_rel: Optional[int]
+) -> Tuple[int, int]:
+    # default number of entities and relations
     if num_entities is None:
         num_entities = math.ceil(length * 0.7)
     if num_rel is None:
         minimum_rel = int(length / (num_entities * num_entities)) + 1
         num_rel = min(max(minimum_rel, int(num_entities * 0.7)), length)
+    return num_entities, num_rel
+
 
-    if seed is None:
-        seed = np.random.default_rng().integers(0, 10000)
-        logger.debug(f"Selected seed {seed}")
-    rng = np.random.default_rng(seed=seed)
+def _prepare_triples(
+    length: int,
+    num_entities: Optional[int] = None,
+    num_rel: Optional[int] = None,
+    entity_prefix: str = "e",
+    relation_prefix: str = "rel",
+    relation_triples: bool = True,
+    entity_ids: Optional[List[str]] = None,
+    relation_ids: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None,
+    content_length: int = 3,
+    allowed_chars: str = string.ascii_letters,
+    seed: Optional[int] = None,
+) -> Tuple[_TripleLabels, int]:
+    _coherence_check(
+        length=length,
+        num_entities=num_entities,
+        num_rel=num_rel,
+        entity_prefix=entity_prefix,
+        relation_triples=relation_triples,
+        columns=columns,
+        content_length=content_length,
+        allowed_chars=allowed_chars,
+    )
+
+    if columns is None:
+        columns = TRIPLES_COL
+    num_entities, num_rel = _triple_sizes(length, num_entities, num_rel)
+
+    seed = _init_seed(seed)
     head_values = (
-        [entity_prefix + str(i) for i in range(num_entities)]
+        _prefixed_ids(entity_prefix, num_entities)
         if entity_ids is None
-        else entity_ids
+        else np.asarray(list(entity_ids), dtype=object)
     )
     rel_values = (
-        [relation_prefix + str(i) for i in range(num_rel)]
+        _prefixed_ids(relation_prefix, num_rel)
         if relation_ids is None
-        else relation_ids
+        else np.asarray(list(relation_ids), dtype=object)
     )
-    tail_values = (
-        head_values
-        if relation_triples
-        else [
-            random_string_generator(str_size=content_length, rng=rng)
-            for _ in range(num_entities)
-        ]
+    if relation_triples:
+        return _TripleLabels(columns, head_values, rel_values, head_values, None), seed
+    num_attributes = min(num_entities, len(set(allowed_chars)) ** content_length)
+    tail_values = random_strings(
+        num_attributes,
+        str_size=content_length,
+        allowed_chars=allowed_chars,
+        # streams 0-2 are used for sampling the triple ids
+        rng=_block_rng(seed, 3),
+        unique=True,
+    ).astype(object)
+    labels = _TripleLabels(
+        columns, head_values, rel_values, tail_values, len(tail_values)
     )
-    rows: Set[Tuple[str, str, str]] = set()
-    ensured_all_entities = False
-    max_tries = length * 3
-    while len(rows) < length:
-        if max_tries == 0:
+    return labels, seed
+
+
+def _triples_builder(
+    labels: _TripleLabels,
+    output: str,
+    dtype_backend: Optional[str] = None,
+    backend: str = "pandas",
+) -> TriplesBuilder:
+    # categories are hashed once, not for every chunk
+    if output not in TRIPLE_OUTPUTS:
+        raise ValueError(f"Unknown output {output}, choose one of {TRIPLE_OUTPUTS}")
+    if _uses_arrow(backend, dtype_backend):
+        if output == "ids":
+            raise ValueError('output="ids" cannot be combined with Arrow backends')
+        pa = _import_pyarrow("Arrow output")
+        entities = pa.array(labels.heads, type=pa.string())
+        dictionaries = (
+            entities,
+            pa.array(labels.rels, type=pa.string()),
+            (
+                entities
+                if labels.num_tail is None
+                else pa.array(labels.tails, type=pa.string())
+            ),
+        )
+        return partial(
+            _arrow_triples,
+            labels.columns,
+            dictionaries,
+            id_dtype(*(len(dictionary) for dictionary in dictionaries)),
+            output == "categorical",
+            backend,
+        )
+    if output == "ids":
+        return partial(_triple_ids, labels)
+    if _uses_numpy(backend):
+        if output == "categorical":
             raise ValueError(
-                "Could not create DataFrame with the given specifications..."
+                f'output="categorical" cannot be combined with backend "{backend}"'
             )
-        # ensure all entities show up
-        if not ensured_all_entities:
-            longest = max(len(head_values), len(rel_values))
-            for head, rel in zip(
-                shuffled_overlong(head_values, longest, rng),
-                shuffled_overlong(rel_values, longest, rng),
-            ):
-                tail = _choose_tail(head=head, tail_values=tail_values, rng=rng)
-                rows.add((head, rel, tail))
-            ensured_all_entities = True
-        else:
-            head = sequence_choice(head_values, rng)
-            rel, tail = _choose_rel_tail(
-                head=head, rel_values=rel_values, tail_values=tail_values, rng=rng
+        return partial(_triple_arrays, labels, backend)
+    import pandas as pd
+
+    if output == "strings":
+        return partial(_triples_frame, labels)
+    entities = pd.CategoricalDtype(labels.heads)
+    return partial(
+        _categorical_frame,
+        labels.columns,
+        entities,
+        pd.CategoricalDtype(labels.rels),
+        entities if labels.num_tail is None else pd.CategoricalDtype(labels.tails),
+    )
+
+
+def _triples_frame(
+    labels: _TripleLabels,
+    heads: np.ndarray,
+    rels: np.ndarray,
+    tails: np.ndarray,
+    start: int = 0,
+) -> "pd.DataFrame":
+    import pandas as pd
+
+    return pd.DataFrame(
+        dict(
+            zip(
+                labels.columns,
+                (labels.heads[heads], labels.rels[rels], labels.tails[tails]),
             )
-            rows.add((head, rel, tail))
-        max_tries -= 1
-    return pd.DataFrame(rows, columns=columns)
+        ),
+        index=pd.RangeIndex(start, start + len(heads)),
+    )
+
+
+def _categorical_frame(
+    columns: List[str],
+    head_dtype: "pd.CategoricalDtype",
+    rel_dtype: "pd.CategoricalDtype",
+    tail_dtype: "pd.CategoricalDtype",
+    heads: np.ndarray,
+    rels: np.ndarray,
+    tails: np.ndarray,
+    start: int = 0,
+) -> "pd.DataFrame":
+    import pandas as pd
+
+    return pd.DataFrame(
+        {
+            column: pd.Categorical.from_codes(codes, dtype=dtype)
+            for column, codes, dtype in zip(
+                columns,
+                (heads, rels, tails),
+                (head_dtype, rel_dtype, tail_dtype),
+            )
+        },
+        index=pd.RangeIndex(start, start + len(heads)),
+    )
+
+
+def _triple_arrays(
+    labels: _TripleLabels,
+    backend: str,
+    heads: np.ndarray,
+    rels: np.ndarray,
+    tails: np.ndarray,
+    start: int = 0,
+) -> Frame:
+    return numpy_output(
+        dict(
+            zip(
+                labels.columns,
+                (labels.heads[heads], labels.rels[rels], labels.tails[tails]),
+            )
+        ),
+        backend,
+    )
+
+
+def _triple_ids(
+    labels: _TripleLabels,
+    heads: np.ndarray,
+    rels: np.ndarray,
+    tails: np.ndarray,
+    start: int = 0,
+) -> TripleIds:
+    triples = np.empty(
+        (len(heads), 3),
+        dtype=id_dtype(len(labels.heads), len(labels.rels), len(labels.tails)),
+    )
+    triples[:, 0] = heads
+    triples[:, 1] = rels
+    triples[:, 2] = tails
+    return TripleIds(
+        triples=triples,
+        entity_ids=labels.heads,
+        relation_ids=labels.rels,
+        attribute_values=None if labels.num_tail is None else labels.tails,
+    )
+
+
+def _arrow_triples(
+    columns: List[str],
+    dictionaries: Tuple["pa.Array", "pa.Array", "pa.Array"],
+    dtype: np.dtype,
+    categorical: bool,
+    backend: str,
+    heads: np.ndarray,
+    rels: np.ndarray,
+    tails: np.ndarray,
+    start: int = 0,
+) -> Frame:
+    arrays = [
+        (
+            dictionary_array(codes.astype(dtype, copy=False), dictionary)
+            if categorical
+            else dictionary.take(codes)
+        )
+        for codes, dictionary in zip((heads, rels, tails), dictionaries)
+    ]
+    return arrow_output(columns, arrays, backend, start)
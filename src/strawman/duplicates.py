@@ -0,0 +1,297 @@
+"""Records with near-duplicates and ground truth clusters for entity resolution.
+
+`dummy_duplicates` creates the records of `dummy_df` and adds perturbed
+copies of some of them, together with the cluster every record belongs to.
+
+```pycon
+>>> from strawman.duplicates import dummy_duplicates
+>>> df = dummy_duplicates((10**6, 4), duplicate_ratio=0.3, edit_distance=2, seed=1)
+>>> df["cluster"].value_counts().max() <= 5
+True
+```
+"""
+
+import string
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from .arrow import _import_pyarrow
+from .backends import Frame, _uses_arrow, _uses_numpy, arrow_output, numpy_output
+from .dummy_pandas import VOCABULARY_STREAM, _coherence_check_df, _df_blocks
+from .sampling import Distribution, distribution_weights, sample_weighted
+from .utils import _block_rng, _init_seed
+
+CLUSTER_COL = "cluster"
+# stream of the duplicates, beyond the stream of any block or vocabulary
+DUPLICATES_STREAM = VOCABULARY_STREAM + 1
+EDIT_OPERATIONS = ("substitute", "delete", "insert", "transpose")
+_SUBSTITUTE, _DELETE, _INSERT, _TRANSPOSE = range(len(EDIT_OPERATIONS))
+
+
+def dummy_duplicates(
+    shape: Tuple[int, int],
+    duplicate_ratio: float = 0.2,
+    max_cluster_size: int = 5,
+    cluster_size: Distribution = "uniform",
+    edit_distance: int = 1,
+    swap_probability: float = 0.0,
+    null_probability: float = 0.0,
+    content_length: int = 3,
+    allowed_chars: str = string.ascii_letters,
+    columns: Optional[List[str]] = None,
+    cluster_column: str = CLUSTER_COL,
+    seed: int = None,
+    workers: int = 1,
+    backend: str = "pandas",
+) -> Frame:
+    """Create random string records with clusters of near-duplicates.
+
+    A share of `1 - duplicate_ratio` of the rows are original records, which
+    are the rows of `dummy_df` with the same seed. Some originals get
+    duplicates, so their cluster has between 2 and `max_cluster_size` records,
+    distributed according to `cluster_size` ("uniform", "zipf" for mostly
+    small clusters or one weight per size from 2 on).
+
+    Every duplicate gets between 1 and `edit_distance` character edits
+    (substitution, deletion, insertion or transposition of adjacent
+    characters) in random cells, so its Damerau-Levenshtein distance to the
+    original is at most `edit_distance`. With `swap_probability` the values of two of its
+    columns are swapped, with `null_probability` one of its values is dropped.
+    The edits are applied to the code points of all duplicates at once, one
+    array operation per edit round.
+
+    Rows are shuffled. The `cluster_column` contains the cluster id, i.e. the
+    row of the original in `dummy_df`, records with the same id are matches.
+
+    Args:
+        shape: Number of rows (originals and duplicates) and columns
+        duplicate_ratio: Share of rows that are duplicates
+        max_cluster_size: Largest number of records of a cluster
+        cluster_size: Distribution of the cluster sizes from 2 to `max_cluster_size`
+        edit_distance: Largest number of character edits per duplicate
+        swap_probability: Probability that two values of a duplicate are swapped
+        null_probability: Probability that a value of a duplicate is dropped
+        content_length: Length of the original strings
+        allowed_chars: Allowed characters of the strings and edits
+        columns: Column names, range(cols) by default
+        cluster_column: Name of the cluster id column
+        seed: Seed for reproducibility.
+        workers: Number of processes generating the originals
+        backend: "pandas", "numpy", "structured", "pyarrow" or "polars", see `strawman.backends`
+
+    Returns:
+        records and their cluster ids, with nullable string columns if `null_probability` is positive
+
+    Raises:
+        ValueError: If the records cannot be generated with the given specifications
+
+    Example:
+    ```pycon
+    >>> from strawman.duplicates import dummy_duplicates
+    >>> dummy_duplicates((6, 2), duplicate_ratio=0.5, seed=1)
+         0     1  cluster
+    0  lfG   ibK        1
+    1  mWa  EXvk        0
+    2  Xzh   HLz        2
+    3   Wa   EXk        0
+    4  Xzh   Hjz        2
+    5  mWa   EXk        0
+    ```
+    """
+    rows, num_cols = shape
+    _coherence_check_df(shape, columns, None)
+    arrow = _uses_arrow(backend, None)
+    for name, value in (
+        ("duplicate_ratio", duplicate_ratio),
+        ("swap_probability", swap_probability),
+        ("null_probability", null_probability),
+    ):
+        if not 0 <= value <= 1:
+            raise ValueError(f"{name} must be between 0 and 1 but was {value}")
+    if max_cluster_size < 2:
+        raise ValueError(f"max_cluster_size must be >= 2 but was {max_cluster_size}")
+    if edit_distance < 0:
+        raise ValueError(f"edit_distance must be >= 0 but was {edit_distance}")
+    if len(allowed_chars) == 0:
+        raise ValueError("allowed_chars must not be empty")
+    names: List[Hashable] = list(range(num_cols) if columns is None else columns)
+    if cluster_column in names:
+        raise ValueError(f"cluster_column {cluster_column} is already a column")
+
+    seed = _init_seed(seed)
+    rng = _block_rng(seed, DUPLICATES_STREAM)
+    num_duplicates = round(duplicate_ratio * rows)
+    num_originals = rows - num_duplicates
+    sources = _duplicate_sources(
+        num_originals, num_duplicates, max_cluster_size, cluster_size, rng
+    )
+
+    blocks = list(
+        _df_blocks(
+            (num_originals, num_cols), content_length, allowed_chars, seed, workers
+        )
+    )
+    originals = (
+        np.concatenate([cells for cells, in blocks])
+        if blocks
+        else np.empty((0, num_cols), dtype="U1")
+    )
+    # only the duplicates are edited, with room for insertions
+    width = max(content_length + edit_distance, 1)
+    codes = np.zeros((len(sources), num_cols, width), dtype=np.uint32)
+    if len(sources) and content_length:
+        codes[..., :content_length] = (
+            np.ascontiguousarray(originals[sources])
+            .view(np.uint32)
+            .reshape(len(sources), num_cols, content_length)
+        )
+    lengths = np.full((len(sources), num_cols), content_length, dtype=np.int64)
+    _perturb(
+        codes,
+        lengths,
+        edit_distance,
+        swap_probability,
+        np.unique(np.array(list(allowed_chars), dtype="U1").view(np.uint32)),
+        rng,
+    )
+    duplicates = codes.view(f"U{width}")[..., 0]
+    del codes
+    nulls = None
+    if null_probability > 0:
+        nulls = np.zeros((rows, num_cols), dtype=bool)
+        dropped = np.flatnonzero(rng.random(num_duplicates) < null_probability)
+        nulls[num_originals + dropped, rng.integers(0, num_cols, len(dropped))] = True
+
+    order = rng.permutation(rows)
+    data: Dict[Hashable, Any] = {}
+    # column by column, so only one shuffled column is kept as numpy strings
+    for col, column in enumerate(names):
+        values = np.concatenate([originals[:, col], duplicates[:, col]])[order]
+        mask = None if nulls is None else nulls[order, col]
+        data[column] = _column(values, mask, arrow, backend)
+    clusters = np.concatenate([np.arange(num_originals), sources])[order]
+    if arrow:
+        pa = _import_pyarrow("Arrow output")
+        data[cluster_column] = pa.array(clusters)
+        return arrow_output(list(data), list(data.values()), backend)
+    data[cluster_column] = clusters
+    if _uses_numpy(backend):
+        return numpy_output(data, backend)
+    import pandas as pd
+
+    return pd.DataFrame(data)
+
+
+def _column(values: np.ndarray, mask: Optional[np.ndarray], arrow: bool, backend: str):
+    # string column with nulls where mask is True, in the format of the backend
+    if arrow:
+        return _import_pyarrow("Arrow output").array(values, mask=mask)
+    if mask is None:
+        return values
+    if _uses_numpy(backend):
+        return np.ma.MaskedArray(values, mask)
+    import pandas as pd
+
+    values = values.astype(object)
+    values[mask] = None
+    return pd.array(values, dtype="string")
+
+
+def _duplicate_sources(
+    num_originals: int,
+    num_duplicates: int,
+    max_cluster_size: int,
+    cluster_size: Distribution,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    # row of the original of every duplicate
+    if num_duplicates == 0:
+        return np.empty(0, dtype=np.int64)
+    weights = distribution_weights(cluster_size, max_cluster_size - 1)
+    if weights is None:
+        extra = rng.integers(1, max_cluster_size, size=num_duplicates)
+    else:
+        extra = 1 + sample_weighted(np.cumsum(weights), num_duplicates, rng)
+    # cut the clusters at the requested number of duplicates
+    total = np.cumsum(extra)
+    num_clusters = int(np.searchsorted(total, num_duplicates)) + 1
+    extra = extra[:num_clusters]
+    extra[-1] -= total[num_clusters - 1] - num_duplicates
+    if num_clusters > num_originals:
+        raise ValueError(
+            f"{num_clusters} clusters need more than {num_originals} original rows, lower duplicate_ratio"
+        )
+    originals = rng.choice(num_originals, size=num_clusters, replace=False)
+    return np.repeat(originals, extra)
+
+
+def _perturb(
+    codes: np.ndarray,
+    lengths: np.ndarray,
+    edit_distance: int,
+    swap_probability: float,
+    alphabet: np.ndarray,
+    rng: np.random.Generator,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # edit code points of shape (rows, cols, width) in place, round by round
+    rows, num_cols, _ = codes.shape
+    if rows == 0:
+        return codes, lengths
+    num_edits = rng.integers(1, edit_distance + 1, size=rows) if edit_distance else 0
+    for edit in range(edit_distance):
+        active = np.flatnonzero(num_edits > edit)
+        cols = rng.integers(0, num_cols, size=len(active))
+        codes[active, cols], lengths[active, cols] = _edit_cells(
+            codes[active, cols], lengths[active, cols], alphabet, rng
+        )
+    if num_cols > 1 and swap_probability > 0:
+        swapped = np.flatnonzero(rng.random(rows) < swap_probability)
+        first = rng.integers(0, num_cols, size=len(swapped))
+        second = rng.integers(0, num_cols - 1, size=len(swapped))
+        second += second >= first
+        for array in (codes, lengths):
+            array[swapped, first], array[swapped, second] = (
+                array[swapped, second],
+                array[swapped, first],
+            )
+    return codes, lengths
+
+
+def _edit_cells(
+    cells: np.ndarray,
+    lengths: np.ndarray,
+    alphabet: np.ndarray,
+    rng: np.random.Generator,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # apply one random edit to every cell, given as code points of shape (n, width)
+    num, width = cells.shape
+    ops = rng.integers(0, len(EDIT_OPERATIONS), size=len(cells))
+    # edits a cell is too short for, or a single char cannot substitute, become insertions
+    ops[(lengths == 0) | ((ops == _TRANSPOSE) & (lengths < 2))] = _INSERT
+    if len(alphabet) < 2:
+        ops[ops == _SUBSTITUTE] = _INSERT
+    positions = (
+        rng.random(num) * (lengths + (ops == _INSERT) - (ops == _TRANSPOSE))
+    ).astype(np.int64)
+
+    # gather every cell from shifted or swapped positions of itself
+    idx = np.arange(width)
+    source = np.broadcast_to(idx, (num, width)).copy()
+    after = idx >= positions[:, None]
+    source += after & (ops == _DELETE)[:, None]
+    source -= (idx > positions[:, None]) & (ops == _INSERT)[:, None]
+    swapped = np.flatnonzero(ops == _TRANSPOSE)
+    source[swapped, positions[swapped]] += 1
+    source[swapped, positions[swapped] + 1] -= 1
+    edited = np.take_along_axis(cells, np.minimum(source, width - 1), axis=1)
+    edited[source >= width] = 0
+
+    # inserted chars are any char, substituted ones skip over the current char
+    changed = np.flatnonzero((ops == _SUBSTITUTE) | (ops == _INSERT))
+    substituted = ops[changed] == _SUBSTITUTE
+    chars = rng.integers(0, len(alphabet) - substituted)
+    current = np.searchsorted(alphabet, cells[changed, positions[changed]])
+    chars += substituted & (chars >= current)
+    edited[changed, positions[changed]] = alphabet[chars]
+    return edited, lengths + (ops == _INSERT) - (ops == _DELETE)
@@ -0,0 +1,558 @@
+"""Estimate the cost of generating triples and plan how to generate them.
+
+`estimate` predicts whether a parameter set of
+[dummy_triples][strawman.dummy_triples] is feasible, how many candidates
+are rejected, how much memory the output and the sampling need and roughly
+how long it takes, without sampling anything. `plan` picks the strategy
+and, if the whole output does not fit into `memory_budget`, the chunk size
+for streaming. The generators accept the plan:
+
+```pycon
+>>> from strawman import dummy_triples, iter_dummy_triples
+>>> from strawman.planning import plan
+>>> small = plan(10_000, num_entities=1000, num_rel=10)
+>>> small.strategy, small.chunk_size
+('exact', None)
+>>> df = dummy_triples(10_000, num_entities=1000, num_rel=10, plan=small, seed=1)
+>>> large = plan(10**8, num_entities=10**6, num_rel=100, memory_budget=2 * 2**30)
+>>> large.streaming
+True
+>>> chunks = iter_dummy_triples(10**8, num_entities=10**6, num_rel=100, plan=large)
+```
+
+Memory is predicted from the sizes of the arrays the generators allocate,
+runtimes from throughputs measured on a single core, so both are rough
+approximations. Collisions of skewed distributions are estimated from the
+expected number of distinct triples, grouping values of similar
+probability.
+"""
+
+import math
+import string
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .backends import _check_backends
+from .dummy_pandas import TRIPLE_OUTPUTS, _triple_sizes
+from .sampling import (
+    CANDIDATE_FACTOR,
+    SKEWED_CANDIDATE_FACTOR,
+    TRIPLE_BLOCK_ROWS,
+    Distribution,
+    _num_possible,
+    _select_strategy,
+    distribution_weights,
+    id_dtype,
+)
+
+# bytes of the temporary arrays of a candidate block, per candidate
+BLOCK_BYTES_PER_ROW = 96
+# bytes of the head, relation and tail id of a sampled triple
+ID_BYTES = 3 * 8
+# bytes of a key of an accepted triple, the key index merges into new runs
+KEY_BYTES = 16
+# bytes per drawn index of sampling without replacement from a sparse space
+SPARSE_RANK_BYTES = 40
+# bytes per possible triple of weighted sampling without replacement
+WEIGHTED_BYTES_PER_POSSIBLE = 24
+# bytes of a label string and its pointer
+LABEL_BYTES = 64
+# seconds per candidate of rejection sampling, including the key lookups
+SECONDS_PER_CANDIDATE = 3e-7
+# seconds per triple of sampling without replacement
+SECONDS_PER_EXACT_ROW = 1.5e-7
+# seconds per possible triple of permuting a dense index space
+SECONDS_PER_POSSIBLE = 2e-8
+# seconds per possible triple of weighted sampling without replacement
+SECONDS_PER_WEIGHTED_POSSIBLE = 1e-7
+# seconds per triple of the warm-up
+SECONDS_PER_WARM_UP = 1.5e-7
+# seconds per label string
+SECONDS_PER_LABEL = 2e-7
+# seconds per label of a categorical dtype
+SECONDS_PER_CATEGORY = 7e-7
+# seconds per triple of building string columns of objects
+SECONDS_PER_STRING_ROW = 7e-7
+# seconds per triple of building Arrow string columns
+SECONDS_PER_ARROW_ROW = 1e-7
+# bins of similar probability per skewed distribution
+PROBABILITY_BINS = 32
+# candidates per triple beyond which rejection sampling is considered hopeless
+MAX_ATTEMPTS_FACTOR = 1000
+# smallest chunk size of a streaming plan
+MIN_CHUNK_SIZE = 1_000
+
+
+class TriplesParameters(NamedTuple):
+    """Arguments of the triple generators an estimate is made for."""
+
+    length: int
+    # number of entities, relations and tails after applying the defaults
+    num_entities: int
+    num_rel: int
+    num_tail: int
+    relation_triples: bool
+    content_length: int
+    allowed_chars: str
+    entity_prefix: str
+    relation_prefix: str
+    output: str
+    backend: str
+    head_distribution: Distribution
+    relation_distribution: Distribution
+    tail_distribution: Distribution
+
+
+class TriplesEstimate(NamedTuple):
+    """Predicted cost of generating triples with one strategy."""
+
+    length: int
+    strategy: str
+    # number of possible unique triples
+    possible: int
+    # expected share of rejected candidates
+    collision_rate: float
+    # expected number of random candidates
+    attempts: float
+    # False if more candidates than allowed or more than the possible triples are needed
+    feasible: bool
+    # bytes of the whole output
+    output_bytes: int
+    # bytes needed for sampling, independent of the chunk size
+    sampling_bytes: int
+    # bytes of one row of a chunk, its ids and its output
+    row_bytes: int
+    # bytes of the labels
+    label_bytes: int
+    # peak bytes of generating the whole output at once
+    peak_bytes: int
+    # rough runtime in seconds
+    seconds: float
+    # the generators only accept plans made for the same arguments
+    parameters: TriplesParameters
+
+    def streaming_bytes(self, chunk_size: int) -> int:
+        """Predict the peak memory when streaming chunks.
+
+        Args:
+            chunk_size: number of rows per chunk
+
+        Returns:
+            peak bytes of generating one chunk at a time
+        """
+        return (
+            self.sampling_bytes
+            + self.label_bytes
+            + min(chunk_size, self.length) * self.row_bytes
+        )
+
+
+class TriplesPlan(NamedTuple):
+    """Strategy and chunk size for generating triples."""
+
+    strategy: str
+    # rows per chunk if the output has to be streamed, else None
+    chunk_size: Optional[int]
+    # predicted peak bytes
+    peak_bytes: int
+    estimate: TriplesEstimate
+
+    @property
+    def streaming(self) -> bool:
+        """True if the output does not fit into memory at once."""
+        return self.chunk_size is not None
+
+
+def estimate(
+    length: int,
+    num_entities: Optional[int] = None,
+    num_rel: Optional[int] = None,
+    relation_triples: bool = True,
+    content_length: int = 3,
+    allowed_chars: str = string.ascii_letters,
+    entity_prefix: str = "e",
+    relation_prefix: str = "rel",
+    strategy: str = "auto",
+    output: str = "strings",
+    backend: str = "pandas",
+    head_distribution: Distribution = "uniform",
+    relation_distribution: Distribution = "uniform",
+    tail_distribution: Distribution = "uniform",
+) -> TriplesEstimate:
+    """Predict the cost of `dummy_triples` with the given parameters.
+
+    Arguments are the ones of [dummy_triples][strawman.dummy_triples], nothing
+    is sampled. Rejection sampling is infeasible if more candidates than the
+    limit of `strawman.sampling.iter_triple_ids` are expected to be needed.
+
+    Args:
+        length: Number of triples
+        num_entities: Number of unique entities
+        num_rel: Number of unique relations
+        relation_triples: If True the tails are entities, else random strings
+        content_length: Length of the random tail strings
+        allowed_chars: Allowed characters of the random tail strings
+        entity_prefix: Prefix of the entity labels
+        relation_prefix: Prefix of the relation labels
+        strategy: One of "auto", "rejection" or "exact"
+        output: One of "strings", "categorical" or "ids"
+        backend: "pandas", "numpy", "structured", "pyarrow" or "polars"
+        head_distribution: Distribution of the heads over the entities
+        relation_distribution: Distribution of the relations
+        tail_distribution: Distribution of the tails
+
+    Returns:
+        the predicted cost
+
+    Raises:
+        ValueError: if an argument is invalid
+
+    Example:
+    ```pycon
+    >>> from strawman.planning import estimate
+    >>> estimate(10**6, num_entities=1000, num_rel=1).strategy
+    'exact'
+    ```
+    """
+    if length < 0:
+        raise ValueError(f"length must be >= 0 but was {length}")
+    if output not in TRIPLE_OUTPUTS:
+        raise ValueError(f"Unknown output {output}, choose one of {TRIPLE_OUTPUTS}")
+    _check_backends(backend, None)
+    num_entities, num_rel, num_tail = _space(
+        length, num_entities, num_rel, relation_triples, content_length, allowed_chars
+    )
+    possible = _num_possible(num_entities, num_rel, num_tail, relation_triples)
+    weights = _weights(
+        (num_entities, num_rel, num_tail),
+        (head_distribution, relation_distribution, tail_distribution),
+    )
+    skewed = any(weight is not None for weight in weights)
+    strategy = _select_strategy(strategy, length, possible)
+    warm_up = min(max(num_entities, num_rel), length)
+    block = min(TRIPLE_BLOCK_ROWS, max(length, 1))
+    # id blocks of a chunk and their concatenation
+    id_bytes = 2 * ID_BYTES * length
+
+    if strategy == "exact" and skewed:
+        attempts = float(max(length - warm_up, 0))
+        collision_rate = 0.0
+        feasible = length <= possible
+        # weights and exponential keys of all possible triples
+        sampling_bytes = WEIGHTED_BYTES_PER_POSSIBLE * num_entities * num_rel * num_tail
+        sampling_peak = max(sampling_bytes, 8 * length + id_bytes)
+        sampling_seconds = (
+            SECONDS_PER_EXACT_ROW * length
+            + SECONDS_PER_WEIGHTED_POSSIBLE * num_entities * num_rel * num_tail
+        )
+    elif strategy == "exact":
+        attempts = float(max(length - warm_up, 0))
+        collision_rate = 0.0
+        feasible = length <= possible
+        # numpy permutes the whole index space unless few indices are drawn
+        dense = attempts > possible // 50
+        ranks = 8 * possible if dense else SPARSE_RANK_BYTES * length
+        # the ranks are mapped to the triples of all chunks at once
+        sampling_bytes = ranks + 8 * length
+        sampling_peak = max(sampling_bytes, 8 * length + id_bytes)
+        sampling_seconds = SECONDS_PER_EXACT_ROW * length
+        if dense:
+            sampling_seconds += SECONDS_PER_POSSIBLE * possible
+    else:
+        attempts = _expected_attempts(
+            length,
+            warm_up,
+            possible,
+            (num_entities, num_rel, num_tail),
+            weights,
+            relation_triples,
+        )
+        collision_rate = (
+            0.0 if attempts in (0, math.inf) else 1 - (length - warm_up) / attempts
+        )
+        factor = SKEWED_CANDIDATE_FACTOR if skewed else CANDIDATE_FACTOR
+        limit = -(-length * factor // block) * block
+        # small spaces are sampled without replacement once candidates run out
+        feasible = length <= possible and (
+            attempts <= limit or num_entities * num_rel * num_tail <= length * factor
+        )
+        sampling_bytes = KEY_BYTES * length + BLOCK_BYTES_PER_ROW * block
+        sampling_peak = sampling_bytes + id_bytes
+        # candidates are drawn in whole blocks
+        drawn = min(-(-attempts // block) * block, limit)
+        sampling_seconds = SECONDS_PER_CANDIDATE * drawn
+        if attempts > limit:
+            sampling_bytes += (
+                WEIGHTED_BYTES_PER_POSSIBLE * num_entities * num_rel * num_tail
+            )
+            sampling_peak = sampling_bytes + id_bytes
+            sampling_seconds += (
+                SECONDS_PER_WEIGHTED_POSSIBLE * num_entities * num_rel * num_tail
+            )
+
+    num_labels = num_entities + num_rel + (0 if relation_triples else num_tail)
+    entity_chars = len(entity_prefix) + len(str(max(num_entities - 1, 0)))
+    output_row = _output_row_bytes(
+        output,
+        backend,
+        (num_entities, num_rel, num_tail),
+        entity_chars
+        + len(relation_prefix)
+        + len(str(max(num_rel - 1, 0)))
+        + (entity_chars if relation_triples else content_length),
+    )
+    seconds = (
+        SECONDS_PER_LABEL * num_labels
+        + SECONDS_PER_WARM_UP * warm_up
+        + sampling_seconds
+    )
+    if output == "categorical":
+        seconds += SECONDS_PER_CATEGORY * num_labels
+    elif output == "strings":
+        seconds += length * (
+            SECONDS_PER_ARROW_ROW
+            if backend in ("pyarrow", "polars")
+            else SECONDS_PER_STRING_ROW
+        )
+    label_bytes = LABEL_BYTES * num_labels
+    return TriplesEstimate(
+        length=length,
+        strategy=strategy,
+        possible=possible,
+        collision_rate=collision_rate,
+        attempts=attempts,
+        feasible=feasible,
+        output_bytes=output_row * length,
+        sampling_bytes=sampling_bytes,
+        row_bytes=2 * ID_BYTES + output_row,
+        label_bytes=label_bytes,
+        peak_bytes=sampling_peak + label_bytes + output_row * length,
+        seconds=seconds,
+        parameters=TriplesParameters(
+            length=length,
+            num_entities=num_entities,
+            num_rel=num_rel,
+            num_tail=num_tail,
+            relation_triples=relation_triples,
+            content_length=content_length,
+            allowed_chars=allowed_chars,
+            entity_prefix=entity_prefix,
+            relation_prefix=relation_prefix,
+            output=output,
+            backend=backend,
+            head_distribution=head_distribution,
+            relation_distribution=relation_distribution,
+            tail_distribution=tail_distribution,
+        ),
+    )
+
+
+def plan(
+    length: int,
+    num_entities: Optional[int] = None,
+    num_rel: Optional[int] = None,
+    relation_triples: bool = True,
+    content_length: int = 3,
+    allowed_chars: str = string.ascii_letters,
+    entity_prefix: str = "e",
+    relation_prefix: str = "rel",
+    output: str = "strings",
+    backend: str = "pandas",
+    head_distribution: Distribution = "uniform",
+    relation_distribution: Distribution = "uniform",
+    tail_distribution: Distribution = "uniform",
+    memory_budget: Optional[int] = None,
+) -> TriplesPlan:
+    """Pick the fastest feasible strategy and, if needed, a chunk size.
+
+    Rejection sampling and sampling without replacement are estimated. The fastest feasible one whose peak memory
+    fits into `memory_budget` is used to generate the whole output at once.
+    If none fits, the output has to be streamed with
+    [iter_dummy_triples][strawman.iter_dummy_triples] or
+    [write_dummy_triples][strawman.write_dummy_triples], using the
+    largest chunk size that fits next to the sampling state.
+
+    Args:
+        length: Number of triples
+        num_entities: Number of unique entities
+        num_rel: Number of unique relations
+        relation_triples: If True the tails are entities, else random strings
+        content_length: Length of the random tail strings
+        allowed_chars: Allowed characters of the random tail strings
+        entity_prefix: Prefix of the entity labels
+        relation_prefix: Prefix of the relation labels
+        output: One of "strings", "categorical" or "ids"
+        backend: "pandas", "numpy", "structured", "pyarrow" or "polars"
+        head_distribution: Distribution of the heads over the entities
+        relation_distribution: Distribution of the relations
+        tail_distribution: Distribution of the tails
+        memory_budget: Bytes available for generation, unlimited if None
+
+    Returns:
+        the plan, to pass as `plan` to the triple generators with the same arguments
+
+    Raises:
+        ValueError: if no strategy is feasible or even streaming exceeds the budget
+    """
+    estimates = [
+        estimate(
+            length,
+            num_entities,
+            num_rel,
+            relation_triples,
+            content_length,
+            allowed_chars,
+            entity_prefix,
+            relation_prefix,
+            strategy,
+            output,
+            backend,
+            head_distribution,
+            relation_distribution,
+            tail_distribution,
+        )
+        for strategy in ("rejection", "exact")
+    ]
+    feasible = sorted(
+        (e for e in estimates if e.feasible), key=lambda e: (e.seconds, e.peak_bytes)
+    )
+    if not feasible:
+        raise ValueError(
+            f"Cannot create {length} unique triples out of {estimates[0].possible} possible ones "
+            f"(expected {estimates[0].attempts:.3g} candidates), add entities or relations"
+        )
+    if memory_budget is None:
+        return TriplesPlan(
+            feasible[0].strategy, None, feasible[0].peak_bytes, feasible[0]
+        )
+    for candidate in feasible:
+        if candidate.peak_bytes <= memory_budget:
+            return TriplesPlan(
+                candidate.strategy, None, candidate.peak_bytes, candidate
+            )
+    # stream with the least sampling memory, in chunks as large as possible
+    candidate = min(feasible, key=lambda e: (e.sampling_bytes, e.seconds))
+    free = memory_budget - candidate.streaming_bytes(0)
+    chunk_size = min(free // candidate.row_bytes, length) if free > 0 else 0
+    if chunk_size < min(MIN_CHUNK_SIZE, length):
+        raise ValueError(
+            f"Generating {length} triples needs more than {memory_budget} bytes, "
+            f"at least {candidate.streaming_bytes(MIN_CHUNK_SIZE)} bytes when streaming"
+        )
+    return TriplesPlan(
+        candidate.strategy,
+        int(chunk_size),
+        candidate.streaming_bytes(int(chunk_size)),
+        candidate,
+    )
+
+
+def _space(
+    length: int,
+    num_entities: Optional[int],
+    num_rel: Optional[int],
+    relation_triples: bool,
+    content_length: int,
+    allowed_chars: str,
+) -> Tuple[int, int, int]:
+    # number of entities, relations and tails as created by dummy_triples
+    num_entities, num_rel = _triple_sizes(length, num_entities, num_rel)
+    num_tail = (
+        num_entities
+        if relation_triples
+        else min(num_entities, len(set(allowed_chars)) ** content_length)
+    )
+    return num_entities, num_rel, num_tail
+
+
+def _weights(
+    sizes: Tuple[int, int, int], distributions: Tuple[Distribution, ...]
+) -> List[Optional[np.ndarray]]:
+    return [
+        distribution_weights(distribution, num)
+        for distribution, num in zip(distributions, sizes)
+    ]
+
+
+def _expected_attempts(
+    length: int,
+    warm_up: int,
+    possible: int,
+    sizes: Tuple[int, int, int],
+    weights: List[Optional[np.ndarray]],
+    relation_triples: bool,
+) -> float:
+    # expected candidates until `length - warm_up` new triples are accepted
+    missing = length - warm_up
+    if missing <= 0:
+        return 0.0
+    if length > possible:
+        return math.inf
+    if all(weight is None for weight in weights):
+        # coupon collector: the k-th new triple needs possible / (possible - k) draws
+        return possible * math.log((possible - warm_up) / (possible - length))
+    head, rel, tail = (
+        np.full(num, 1 / num) if weight is None else weight / weight.sum()
+        for weight, num in zip(weights, sizes)
+    )
+    # skewed tails are not shifted past the head but dropped
+    self_link_rate = float(head @ tail) if relation_triples else 0.0
+    if self_link_rate >= 1:
+        return math.inf
+    # triples of similar probability, the warm-up takes its share of all of them
+    probabilities, counts = np.ones(1), np.ones(1)
+    for bin_probabilities, bin_counts in map(_probability_bins, (head, rel, tail)):
+        probabilities = np.multiply.outer(probabilities, bin_probabilities).ravel()
+        counts = np.multiply.outer(counts, bin_counts).ravel()
+    probabilities /= 1 - self_link_rate
+    counts *= (possible - warm_up) / counts.sum()
+
+    def distinct(draws: float) -> float:
+        # expected number of new triples among `draws` candidates without self-links
+        return float(counts @ -np.expm1(-draws * probabilities))
+
+    high = float(missing)
+    while distinct(high) < missing:
+        high *= 2
+        if high > MAX_ATTEMPTS_FACTOR * length:
+            return math.inf
+    low = high / 2
+    for _ in range(50):
+        middle = (low + high) / 2
+        if distinct(middle) < missing:
+            low = middle
+        else:
+            high = middle
+    return high / (1 - self_link_rate)
+
+
+def _probability_bins(probabilities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # mean probability and number of values of bins of similar probability
+    if probabilities.min() == probabilities.max():
+        return probabilities[:1], np.array([len(probabilities)], dtype=float)
+    positive = probabilities[probabilities > 0]
+    edges = np.geomspace(positive.min(), positive.max(), PROBABILITY_BINS + 1)
+    bins = np.clip(
+        np.searchsorted(edges, positive, side="right") - 1, 0, PROBABILITY_BINS - 1
+    )
+    counts = np.bincount(bins, minlength=PROBABILITY_BINS).astype(float)
+    sums = np.bincount(bins, weights=positive, minlength=PROBABILITY_BINS)
+    used = counts > 0
+    return sums[used] / counts[used], counts[used]
+
+
+def _output_row_bytes(
+    output: str, backend: str, sizes: Tuple[int, int, int], chars: int
+) -> int:
+    # bytes of one output row, `chars` is the length of the three labels
+    if output == "ids":
+        return 3 * id_dtype(*sizes).itemsize
+    if output == "categorical":
+        # pandas and Arrow use at most 32 bit codes for these sizes
+        return 3 * min(id_dtype(*sizes).itemsize, 4)
+    if backend in ("pyarrow", "polars"):
+        # string data and 32 bit offsets
+        return chars + 3 * 4
+    # pointers to the label objects
+    return 3 * 8
@@ -0,0 +1,170 @@
+"""pytest plugin with dummy data fixtures shared by all test processes.
+
+The plugin is registered through an entry point when strawman is installed.
+Its fixtures are prefixed, so they never shadow fixtures of other test
+suites, and it does nothing until they are used. The
+`strawman_dummy_df` and `strawman_dummy_triples` fixtures take the
+arguments of the corresponding functions via indirect parametrization:
+
+```python
+import pytest
+
+@pytest.mark.parametrize(
+    "strawman_dummy_triples", [dict(length=10**6, seed=1)], indirect=True
+)
+def test_embedding(strawman_dummy_triples):
+    ...
+```
+
+Datasets are stored as memory mapped Arrow files in a directory shared with
+all pytest-xdist workers (see [DatasetCache][strawman.cache.DatasetCache])
+and generated by the first process that needs them. Datasets returned by
+the `pytest_strawman_datasets` hook are generated once by the controller
+process before any test runs, together with the defaults of the fixtures:
+
+```python
+def pytest_strawman_datasets(config):
+    return [("dummy_triples", dict(length=10**6, seed=1))]
+```
+
+The defaults are generated up front as well if a directory is given with
+`--strawman-cache-dir` or the `strawman_cache_dir` ini option, which keeps
+the datasets between sessions. The fixtures default to
+`dtype_backend="pyarrow"`, so the columns of every process are read-only
+views of the shared pages instead of private copies. Requires pyarrow.
+"""
+
+import os
+import shutil
+import tempfile
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+from .cache import DatasetCache
+from .dummy_pandas import dummy_df as _dummy_df
+from .dummy_pandas import dummy_triples as _dummy_triples
+
+# Arrow backed columns are zero-copy views of the memory mapped files
+DEFAULT_DF_ARGUMENTS: Dict[str, Any] = {
+    "shape": (100, 3),
+    "seed": 0,
+    "dtype_backend": "pyarrow",
+}
+DEFAULT_TRIPLES_ARGUMENTS: Dict[str, Any] = {
+    "length": 100,
+    "seed": 0,
+    "dtype_backend": "pyarrow",
+}
+DATASETS: Dict[str, Tuple[Callable, Dict[str, Any]]] = {
+    "dummy_df": (_dummy_df, DEFAULT_DF_ARGUMENTS),
+    "dummy_triples": (_dummy_triples, DEFAULT_TRIPLES_ARGUMENTS),
+}
+
+_WORKER_INPUT_KEY = "strawman_cache_dir"
+_cache_dir_key = pytest.StashKey[str]()
+_temporary_key = pytest.StashKey[bool]()
+
+
+class _Hookspecs:
+    @pytest.hookspec
+    def pytest_strawman_datasets(
+        self, config: pytest.Config
+    ) -> Optional[List[Tuple[str, dict]]]:
+        """Declare datasets the controller generates before any test runs.
+
+        Args:
+            config: pytest config
+
+        Returns:
+            pairs of dataset name ("dummy_df" or "dummy_triples") and its arguments, or None
+        """
+
+
+def pytest_addhooks(pluginmanager: pytest.PytestPluginManager):
+    """Add the hook declaring datasets."""
+    pluginmanager.add_hookspecs(_Hookspecs)
+
+
+def pytest_addoption(parser: pytest.Parser):
+    """Add the cache directory option."""
+    group = parser.getgroup("strawman")
+    group.addoption(
+        "--strawman-cache-dir",
+        help="keep generated dummy data in this directory, a temporary directory per session by default",
+    )
+    parser.addini(
+        "strawman_cache_dir",
+        help="keep generated dummy data in this directory, overridden by --strawman-cache-dir",
+    )
+
+
+def pytest_configure(config: pytest.Config):
+    """Determine the shared directory and generate the datasets on the controller."""
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None and _WORKER_INPUT_KEY in workerinput:
+        config.stash[_cache_dir_key] = workerinput[_WORKER_INPUT_KEY]
+        config.stash[_temporary_key] = False
+        return
+    directory = config.getoption("strawman_cache_dir") or config.getini(
+        "strawman_cache_dir"
+    )
+    config.stash[_temporary_key] = not directory
+    # the temporary directory is only created once a dataset is needed
+    config.stash[_cache_dir_key] = directory or os.path.join(
+        tempfile.gettempdir(), f"strawman-{uuid.uuid4().hex}"
+    )
+    declared = [
+        dataset
+        for datasets in config.hook.pytest_strawman_datasets(config=config)
+        for dataset in datasets
+    ]
+    if not declared and not directory:
+        return
+    # workers only map what the controller generated
+    cache = DatasetCache(config.stash[_cache_dir_key])
+    for name, arguments in [(name, {}) for name in DATASETS] + declared:
+        if name not in DATASETS:
+            raise pytest.UsageError(
+                f"Unknown strawman dataset {name}, choose one of {sorted(DATASETS)}"
+            )
+        func, defaults = DATASETS[name]
+        cache(func, **{**defaults, **arguments})
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Hand the directory to pytest-xdist workers."""
+    node.workerinput[_WORKER_INPUT_KEY] = node.config.stash[_cache_dir_key]
+
+
+def pytest_unconfigure(config: pytest.Config):
+    """Remove the temporary directory once the controller is done."""
+    if config.stash.get(_temporary_key, False):
+        shutil.rmtree(config.stash[_cache_dir_key], ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def strawman_cache(pytestconfig: pytest.Config) -> DatasetCache:
+    """Cache shared by all processes of the session."""
+    return DatasetCache(pytestconfig.stash[_cache_dir_key])
+
+
+def _dataset(request: pytest.FixtureRequest, cache: DatasetCache, name: str):
+    func, defaults = DATASETS[name]
+    return cache(func, **{**defaults, **getattr(request, "param", {})})
+
+
+@pytest.fixture
+def strawman_dummy_df(request: pytest.FixtureRequest, strawman_cache: DatasetCache):
+    """Shared result of [dummy_df][strawman.dummy_df], parametrize with its arguments."""
+    return _dataset(request, strawman_cache, "dummy_df")
+
+
+@pytest.fixture
+def strawman_dummy_triples(
+    request: pytest.FixtureRequest, strawman_cache: DatasetCache
+):
+    """Shared result of [dummy_triples][strawman.dummy_triples], parametrize with its arguments."""
+    return _dataset(request, strawman_cache, "dummy_triples")
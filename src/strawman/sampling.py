@@ -0,0 +1,1097 @@
+import logging
+from functools import partial
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .stats import GenerationStats, _phase, _timed
+from .utils import _block_rng, _init_seed, _ordered_map, _permutation_blocks
+
+logger = logging.getLogger(__name__)
+
+TripleIdArrays = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+_INT64_MAX = np.iinfo(np.int64).max
+
+STRATEGIES = ("auto", "rejection", "exact")
+# share of the possible triples above which "auto" samples without replacement
+DENSE_THRESHOLD = 0.25
+# number of candidate triples drawn from one random stream
+TRIPLE_BLOCK_ROWS = 2**20
+# candidates drawn per requested triple before giving up
+CANDIDATE_FACTOR = 3
+# skewed candidates are duplicates more often
+SKEWED_CANDIDATE_FACTOR = 20
+# child stream of the seed for extending triples, streams 0-3 are used by
+# iter_triple_ids, so the candidates of the existing triples are not redrawn
+EXTENSION_STREAM = 5
+CORRUPTIONS = ("head", "tail", "both")
+# rounds of redrawing corruptions that are positives before giving up
+CORRUPTION_ROUNDS = 100
+
+
+class TripleIds(NamedTuple):
+    """Integer coded triples together with their labels.
+
+    Row ``i`` of `triples` stands for ``entity_ids[h], relation_ids[r], tail``,
+    where the tail is ``entity_ids[t]`` for relation triples and
+    ``attribute_values[t]`` for attribute triples.
+    """
+
+    triples: np.ndarray
+    entity_ids: np.ndarray
+    relation_ids: np.ndarray
+    # None for relation triples, whose tails are entities
+    attribute_values: Optional[np.ndarray] = None
+
+
+class Zipf(NamedTuple):
+    """Zipf distribution, the value of rank k has weight ``1 / k**exponent``."""
+
+    exponent: float = 1.0
+
+
+# "uniform", "zipf" (exponent 1), Zipf(exponent) or explicit weights
+Distribution = Union[str, Zipf, Sequence[float], np.ndarray]
+DISTRIBUTIONS = ("uniform", "zipf")
+
+
+def distribution_weights(distribution: Distribution, num: int) -> Optional[np.ndarray]:
+    """Resolve a distribution over `num` values to weights.
+
+    Args:
+        distribution: "uniform", "zipf", a `Zipf` or one non-negative weight per value
+        num: number of values
+
+    Returns:
+        float64 weights, None for the uniform distribution
+
+    Raises:
+        ValueError: if the distribution is unknown or the weights do not fit
+    """
+    if isinstance(distribution, str):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown distribution {distribution}, choose one of {DISTRIBUTIONS}, a Zipf or weights"
+            )
+        if distribution == "uniform":
+            return None
+        distribution = Zipf()
+    if isinstance(distribution, Zipf):
+        if distribution.exponent < 0:
+            raise ValueError(
+                f"Zipf exponent must be >= 0 but was {distribution.exponent}"
+            )
+        return np.arange(1, num + 1, dtype=np.float64) ** -distribution.exponent
+    weights = np.asarray(distribution, dtype=np.float64)
+    if weights.shape != (num,) or (weights < 0).any() or not weights.sum() > 0:
+        raise ValueError(
+            f"Expected {num} non-negative weights that are not all zero, got {weights.shape[0]}"
+        )
+    return weights
+
+
+def sample_weighted(
+    cumulative: np.ndarray, size: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Draw indices with probabilities given by cumulative weights.
+
+    One uniform draw per value is mapped to an index with a binary search, so
+    skewed sampling costs about as much as uniform sampling.
+
+    Args:
+        cumulative: cumulative sum of the weights
+        size: number of draws
+        rng: generator to draw from
+
+    Returns:
+        int64 indices
+    """
+    idx = np.searchsorted(cumulative, rng.random(size) * cumulative[-1], side="right")
+    # guard against rounding at the upper end
+    return np.minimum(idx, len(cumulative) - 1)
+
+
+def id_dtype(*sizes: int) -> np.dtype:
+    """Smallest signed integer dtype (int32 or int64) holding ids up to the sizes.
+
+    Args:
+        sizes: number of possible values of each id column
+
+    Returns:
+        int32 if all ids fit, else int64
+    """
+    return np.dtype(np.int32 if max(sizes, default=0) <= 2**31 else np.int64)
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    # splitmix64 finalizer, operates with wrapping uint64 arithmetic
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def triple_keys(
+    heads: np.ndarray,
+    rels: np.ndarray,
+    tails: np.ndarray,
+    num_entities: int,
+    num_rel: int,
+    num_tail: int,
+) -> np.ndarray:
+    """Pack integer coded triples into int64 keys.
+
+    If the triple space fits into int64 the keys are exact (``h*R*T + r*T + t``),
+    otherwise a 64-bit hash is used. Identical triples always get identical keys,
+    so deduplicating on keys never lets a duplicate through.
+
+    Args:
+        heads: head ids
+        rels: relation ids
+        tails: tail ids
+        num_entities: number of possible heads
+        num_rel: number of possible relations
+        num_tail: number of possible tails
+
+    Returns:
+        int64 key for every triple
+    """
+    if num_entities * num_rel * num_tail <= _INT64_MAX:
+        return (
+            heads.astype(np.int64) * (num_rel * num_tail)
+            + rels.astype(np.int64) * num_tail
+            + tails
+        )
+    with np.errstate(over="ignore"):
+        x = _mix64(
+            heads.astype(np.uint64) * np.uint64(num_rel) + rels.astype(np.uint64)
+        )
+        return _mix64(x ^ tails.astype(np.uint64)).view(np.int64)
+
+
+def _first_occurrences(keys: np.ndarray) -> np.ndarray:
+    # indices of the first occurrence of each key, in draw order
+    if len(keys) == 0:
+        return np.empty(0, dtype=np.intp)
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    idx = np.minimum.reduceat(order, starts)
+    idx.sort()
+    return idx
+
+
+def _sample_tails(
+    heads: np.ndarray,
+    num_tail: int,
+    rng: np.random.Generator,
+    avoid_self_links: bool,
+) -> np.ndarray:
+    if avoid_self_links and num_tail > 1:
+        # draw from all but one value and skip over the head
+        tails = rng.integers(0, num_tail - 1, size=len(heads))
+        tails += tails >= heads
+        return tails
+    return rng.integers(0, num_tail, size=len(heads))
+
+
+def _warm_up_ids(
+    num_entities: int,
+    num_rel: int,
+    num_tail: int,
+    rng: np.random.Generator,
+    avoid_self_links: bool,
+) -> TripleIdArrays:
+    # every entity and relation shows up at least once
+    longest = max(num_entities, num_rel)
+    heads = _permutation_blocks(num_entities, longest, rng)
+    rels = _permutation_blocks(num_rel, longest, rng)
+    tails = _sample_tails(heads, num_tail, rng, avoid_self_links)
+    return heads, rels, tails
+
+
+def _first_positions(ids: np.ndarray, num: int) -> np.ndarray:
+    # row of the first occurrence of every id, len(ids) if it never shows up
+    positions = np.full(num, len(ids), dtype=np.int64)
+    values, first = np.unique(ids, return_index=True)
+    positions[values] = first
+    return positions
+
+
+def _cover_included(
+    include: TripleIdArrays,
+    length: int,
+    num_entities: int,
+    num_rel: int,
+    num_tail: int,
+    rng: np.random.Generator,
+    avoid_self_links: bool,
+) -> Tuple[TripleIdArrays, TripleIdArrays]:
+    # keep as many included triples as fit next to the triples covering the
+    # entities and relations missing from the kept ones
+    heads, rels, tails = include
+    entity_first = _first_positions(heads, num_entities)
+    if avoid_self_links:
+        entity_first = np.minimum(entity_first, _first_positions(tails, num_entities))
+    rel_first = _first_positions(rels, num_rel)
+    sorted_entities, sorted_rels = np.sort(entity_first), np.sort(rel_first)
+    kept = min(len(heads), length)
+    while True:
+        # cutting off included triples can only add missing ids
+        num_cover = max(
+            num_entities - int(np.searchsorted(sorted_entities, kept)),
+            num_rel - int(np.searchsorted(sorted_rels, kept)),
+        )
+        if kept + num_cover <= length:
+            break
+        kept = length - num_cover
+    missing_entities = np.flatnonzero(entity_first >= kept)
+    missing_rels = np.flatnonzero(rel_first >= kept)
+    cover_heads = (
+        missing_entities[_permutation_blocks(len(missing_entities), num_cover, rng)]
+        if len(missing_entities)
+        else rng.integers(0, num_entities, size=num_cover)
+    )
+    cover_rels = (
+        missing_rels[_permutation_blocks(len(missing_rels), num_cover, rng)]
+        if len(missing_rels)
+        else rng.integers(0, num_rel, size=num_cover)
+    )
+    cover_tails = _sample_tails(cover_heads, num_tail, rng, avoid_self_links)
+    return (cover_heads, cover_rels, cover_tails), (
+        heads[:kept],
+        rels[:kept],
+        tails[:kept],
+    )
+
+
+def _num_possible(num_entities: int, num_rel: int, num_tail: int, avoid: bool) -> int:
+    if avoid and num_tail > 1:
+        return num_entities * num_rel * (num_tail - 1)
+    return num_entities * num_rel * num_tail
+
+
+def _select_strategy(strategy: str, length: int, possible: int) -> str:
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy}, choose one of {STRATEGIES}")
+    if strategy == "auto":
+        return "exact" if length > possible * DENSE_THRESHOLD else "rejection"
+    return strategy
+
+
+class KeyIndex:
+    """Set of int64 keys kept as a few sorted runs.
+
+    New keys are added as a sorted run, runs of similar size are merged, so
+    adding and looking up keys stays cheap even for hundreds of millions of
+    keys, using 8 bytes per key.
+
+    Example:
+    ```pycon
+    >>> import numpy as np
+    >>> from strawman.sampling import KeyIndex
+    >>> index = KeyIndex(np.array([3, 1]))
+    >>> index.add(np.array([7]))
+    >>> index.contains(np.array([1, 2, 7]))
+    array([ True, False,  True])
+    ```
+    """
+
+    def __init__(self, keys: Optional[np.ndarray] = None):
+        self._runs: List[np.ndarray] = []
+        if keys is not None:
+            self.add(keys)
+
+    def __len__(self) -> int:
+        return sum(len(run) for run in self._runs)
+
+    def add(self, keys: np.ndarray):
+        """Add keys, which must not already be contained.
+
+        Args:
+            keys: new int64 keys
+        """
+        if len(keys) == 0:
+            # an empty run would break the lookups of `contains`
+            return
+        run = np.sort(keys)
+        while self._runs and len(self._runs[-1]) <= len(run):
+            # timsort merges the two sorted runs in linear time
+            run = np.sort(np.concatenate([self._runs.pop(), run]), kind="stable")
+        self._runs.append(run)
+
+    def keys(self) -> np.ndarray:
+        """All keys, in no particular order.
+
+        Returns:
+            int64 keys
+        """
+        if not self._runs:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(self._runs)
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        """Check which keys are contained.
+
+        Args:
+            keys: int64 keys to look up
+
+        Returns:
+            boolean mask
+        """
+        found = np.zeros(len(keys), dtype=bool)
+        if not self._runs or len(keys) == 0:
+            return found
+        # searching sorted queries is much more cache friendly
+        order = np.argsort(keys)
+        sorted_keys = keys[order]
+        for run in self._runs:
+            pos = np.searchsorted(run, sorted_keys)
+            pos[pos == len(run)] = 0
+            found[order] |= run[pos] == sorted_keys
+        return found
+
+
+def _exact_id_blocks(
+    length: int,
+    num_entities: int,
+    num_rel: int,
+    num_tail: int,
+    rng: np.random.Generator,
+    avoid_self_links: bool,
+    warm_up: TripleIdArrays,
+) -> Iterator[TripleIdArrays]:
+    # linear index space (h * R + r) * T' + t' that excludes self-links
+    shift = avoid_self_links and num_tail > 1
+    width = num_tail - 1 if shift else num_tail
+    heads, rels, tails = warm_up
+    compact_tails = tails - (tails > heads) if shift else tails
+    excluded = np.sort((heads * num_rel + rels) * width + compact_tails)
+
+    possible = num_entities * num_rel * width
+    missing = max(length - len(excluded), 0)
+    ranks = rng.choice(possible - len(excluded), size=missing, replace=False)
+    # map ranks among the remaining indices back to the full index space
+    values = ranks + np.searchsorted(
+        excluded - np.arange(len(excluded)), ranks, side="right"
+    )
+    del ranks
+    for start in range(0, missing, TRIPLE_BLOCK_ROWS):
+        new_heads, rest = np.divmod(
+            values[start : start + TRIPLE_BLOCK_ROWS], num_rel * width
+        )
+        new_rels, new_tails = np.divmod(rest, width)
+        if shift:
+            new_tails += new_tails >= new_heads
+        yield new_heads, new_rels, new_tails
+
+
+def _weighted_id_blocks(
+    missing: int,
+    num_entities: int,
+    num_rel: int,
+    num_tail: int,
+    rng: np.random.Generator,
+    avoid_self_links: bool,
+    excluded: np.ndarray,
+    cumulative: Tuple[Optional[np.ndarray], ...],
+) -> Iterator[TripleIdArrays]:
+    # weighted sampling without replacement of `missing` triples that are not
+    # `excluded` (exact keys), in the order sequential draws would accept them:
+    # the triples with the smallest exponential keys scaled by their weights
+    head, rel, tail = (
+        np.ones(num) if weights is None else np.diff(weights, prepend=0.0)
+        for weights, num in zip(cumulative, (num_entities, num_rel, num_tail))
+    )
+    weights = np.multiply.outer(np.multiply.outer(head, rel), tail)
+    if avoid_self_links:
+        diagonal = np.arange(min(num_entities, num_tail))
+        weights[diagonal, :, diagonal] = 0
+    weights = weights.ravel()
+    weights[excluded] = 0
+    if np.count_nonzero(weights) < missing:
+        raise ValueError("Could not create DataFrame with the given specifications...")
+    with np.errstate(divide="ignore"):
+        ranks = rng.standard_exponential(len(weights)) / weights
+    del weights
+    chosen = np.argpartition(ranks, missing - 1)[:missing] if missing else ranks[:0]
+    chosen = chosen[np.argsort(ranks[chosen], kind="stable")]
+    del ranks
+    for start in range(0, missing, TRIPLE_BLOCK_ROWS):
+        new_heads, rest = np.divmod(
+            chosen[start : start + TRIPLE_BLOCK_ROWS], num_rel * num_tail
+        )
+        new_rels, new_tails = np.divmod(rest, num_tail)
+        yield new_heads, new_rels, new_tails
+
+
+def _sample_ids(
+    num: int,
+    size: int,
+    rng: np.random.Generator,
+    cumulative: Optional[np.ndarray],
+) -> np.ndarray:
+    if cumulative is None:
+        return rng.integers(0, num, size=size)
+    return sample_weighted(cumulative, size, rng)
+
+
+def _candidate_block(
+    seed: int,
+    size: int,
+    num_entities: int,
+    num_rel: int,
+    num_tail: int,
+    avoid_self_links: bool,
+    cumulative: Tuple[Optional[np.ndarray], ...],
+    stream: Tuple[int, ...],
+    block: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]:
+    # candidates of one block, deduplicated within the block, and the number
+    # of dropped self-links
+    rng = _block_rng(seed, *stream, 1, block)
+    head_cumulative, rel_cumulative, tail_cumulative = cumulative
+    heads = _sample_ids(num_entities, size, rng, head_cumulative)
+    rels = _sample_ids(num_rel, size, rng, rel_cumulative)
+    if tail_cumulative is None:
+        tails = _sample_tails(heads, num_tail, rng, avoid_self_links)
+    else:
+        tails = sample_weighted(tail_cumulative, size, rng)
+        if avoid_self_links:
+            # skewed tails cannot be shifted past the head, drop self-links
+            keep = tails != heads
+            heads, rels, tails = heads[keep], rels[keep], tails[keep]
+    keys = triple_keys(heads, rels, tails, num_entities, num_rel, num_tail)
+    first = _first_occurrences(keys)
+    return heads[first], rels[first], tails[first], keys[first], size - len(keys)
+
+
+def iter_triple_ids(
+    length: int,
+    num_entities: int,
+    num_rel: int,
+    num_tail: Optional[int] = None,
+    seed: int = None,
+    strategy: str = "auto",
+    workers: int = 1,
+    head_distribution: Distribution = "uniform",
+    relation_distribution: Distribution = "uniform",
+    tail_distribution: Distribution = "uniform",
+    include: Optional[TripleIdArrays] = None,
+    stats: Optional[GenerationStats] = None,
+) -> Iterator[TripleIdArrays]:
+    """Sample unique integer coded triples block by block.
+
+    All entities and relations show up at least once. If `num_tail` is None the
+    tails are entities and self-links are avoided, otherwise tails are ids
+    of `num_tail` attribute values.
+
+    With the "rejection" strategy candidates are drawn in blocks, deduplicated
+    via packed int64 keys and rejected if they were already accepted. At most
+    `length * CANDIDATE_FACTOR` candidates are drawn. The "exact" strategy samples distinct
+    indices of the space of all possible triples (without self-links) directly
+    and therefore never fails. "auto" uses "exact" if more than
+    `DENSE_THRESHOLD` of all possible triples are requested.
+
+    Every block uses its own random stream derived from `seed`, so the
+    concatenated output only depends on the seed. Candidate blocks can be
+    drawn by a pool of `workers` processes, the result is identical for any
+    number of workers.
+
+    Heads, relations and tails of the candidates can be skewed by a
+    [Distribution][strawman.sampling.Distribution], e.g. "zipf", so some
+    entities get much higher degrees than others. Skewed ids are drawn by a
+    binary search in the cumulative weights, self-links are dropped and up to
+    `length * SKEWED_CANDIDATE_FACTOR` candidates are drawn. The warm-up still
+    contains every entity and relation. The "exact" strategy draws skewed
+    triples without replacement with exponential keys over all possible
+    triples, allocating 24 bytes per possible triple. If rejection sampling
+    runs out of candidates and there are at most as many possible triples as
+    candidates, the remaining triples are sampled this way instead of failing.
+
+    Triples given as `include` (e.g. structure shared with another graph) are
+    accepted first, without duplicates and self-links. The warm-up then only
+    covers the entities and relations missing from them, included triples are
+    cut off if they do not fit into `length` next to it. Random triples fill
+    up the rest.
+
+    Args:
+        length: Number of triples
+        num_entities: Number of unique entities
+        num_rel: Number of unique relations
+        num_tail: Number of possible tail values for attribute triples
+        seed: Seed for reproducibility
+        strategy: One of "auto", "rejection" or "exact"
+        workers: Number of processes drawing candidate blocks
+        head_distribution: Distribution of the heads over the entities
+        relation_distribution: Distribution of the relations
+        tail_distribution: Distribution of the tails over the entities or attribute values
+        include: Triples to accept right after the warm-up
+        stats: Collects the time of the "warm_up" and "sampling" phases and the candidate counters, see `strawman.stats`
+
+    Yields:
+        head, relation and tail ids of consecutive blocks
+
+    Raises:
+        ValueError: If not enough unique triples could be sampled
+    """
+    seed = _init_seed(seed)
+    avoid_self_links = num_tail is None
+    if num_tail is None:
+        num_tail = num_entities
+
+    possible = _num_possible(num_entities, num_rel, num_tail, avoid_self_links)
+    if length > possible:
+        raise ValueError(
+            f"Cannot create {length} unique rows with {num_entities} entities and {num_rel} relations"
+        )
+    cumulative = tuple(
+        None if weights is None else np.cumsum(weights)
+        for weights in (
+            distribution_weights(head_distribution, num_entities),
+            distribution_weights(relation_distribution, num_rel),
+            distribution_weights(tail_distribution, num_tail),
+        )
+    )
+    skewed = any(weights is not None for weights in cumulative)
+    strategy = _select_strategy(strategy, length, possible)
+    logger.debug(f"Sampling {length} triples with strategy {strategy}")
+
+    with _phase(stats, "warm_up"):
+        heads, rels, tails = _warm_up_or_cover(
+            length, num_entities, num_rel, num_tail, seed, avoid_self_links, include
+        )
+        keys = triple_keys(heads, rels, tails, num_entities, num_rel, num_tail)
+        first = _first_occurrences(keys)
+        accepted = (heads[first], rels[first], tails[first])
+    if stats is not None:
+        stats.count(warm_up=len(first), accepted=len(first))
+    yield accepted
+    if strategy == "exact" and skewed:
+        blocks = _weighted_id_blocks(
+            length - len(first),
+            num_entities,
+            num_rel,
+            num_tail,
+            _block_rng(seed, 2),
+            avoid_self_links,
+            keys[first],
+            cumulative,
+        )
+        if stats is not None:
+            blocks = _counted(blocks, stats)
+    elif strategy == "exact":
+        blocks = _exact_id_blocks(
+            length,
+            num_entities,
+            num_rel,
+            num_tail,
+            _block_rng(seed, 2),
+            avoid_self_links,
+            accepted,
+        )
+        if stats is not None:
+            blocks = _counted(blocks, stats)
+    else:
+        blocks = _rejection_blocks(
+            KeyIndex(keys[first]),
+            length - len(first),
+            length,
+            seed,
+            num_entities,
+            num_rel,
+            num_tail,
+            avoid_self_links,
+            cumulative,
+            workers,
+            stats,
+        )
+    yield from _timed(blocks, stats, "sampling")
+
+
+def _warm_up_or_cover(
+    length: int,
+    num_entities: int,
+    num_rel: int,
+    num_tail: int,
+    seed: int,
+    avoid_self_links: bool,
+    include: Optional[TripleIdArrays],
+) -> TripleIdArrays:
+    if include is None:
+        return _warm_up_ids(
+            num_entities, num_rel, num_tail, _block_rng(seed, 0), avoid_self_links
+        )
+    heads, rels, tails = include
+    keep = _first_occurrences(
+        triple_keys(heads, rels, tails, num_entities, num_rel, num_tail)
+    )
+    if avoid_self_links:
+        keep = keep[heads[keep] != tails[keep]]
+    # only the entities and relations missing from the included triples
+    # need a warm-up
+    cover, include = _cover_included(
+        (heads[keep], rels[keep], tails[keep]),
+        length,
+        num_entities,
+        num_rel,
+        num_tail,
+        _block_rng(seed, 0),
+        avoid_self_links,
+    )
+    heads, rels, tails = (np.concatenate(ids) for ids in zip(cover, include))
+    return heads, rels, tails
+
+
+def _counted(
+    blocks: Iterator[TripleIdArrays], stats: GenerationStats
+) -> Iterator[TripleIdArrays]:
+    # exact sampling accepts every drawn triple
+    for block in blocks:
+        stats.count(attempts=len(block[0]), accepted=len(block[0]))
+        yield block
+
+
+def _rejection_blocks(
+    index: KeyIndex,
+    missing: int,
+    length: int,
+    seed: int,
+    num_entities: int,
+    num_rel: int,
+    num_tail: int,
+    avoid_self_links: bool,
+    cumulative: Tuple[Optional[np.ndarray], ...],
+    workers: int,
+    stats: Optional[GenerationStats] = None,
+    stream: Tuple[int, ...] = (),
+) -> Iterator[TripleIdArrays]:
+    # accept `missing` candidates that are not in the index yet, candidate
+    # blocks and their number are derived from the total `length`, their
+    # random streams are children of `stream`
+    if missing <= 0:
+        return
+    skewed = any(weights is not None for weights in cumulative)
+    factor = SKEWED_CANDIDATE_FACTOR if skewed else CANDIDATE_FACTOR
+    block_size = min(TRIPLE_BLOCK_ROWS, length)
+    # candidate blocks are independent, only accepting them is sequential
+    candidates = _ordered_map(
+        partial(
+            _candidate_block,
+            seed,
+            block_size,
+            num_entities,
+            num_rel,
+            num_tail,
+            avoid_self_links,
+            cumulative,
+            stream,
+        ),
+        range(-(-length * factor // block_size)),
+        workers=workers,
+    )
+    try:
+        while missing > 0:
+            candidate = next(candidates, None)
+            if candidate is None:
+                if num_entities * num_rel * num_tail > length * factor:
+                    raise ValueError(
+                        "Could not create DataFrame with the given specifications..."
+                    )
+                logger.debug(
+                    f"Out of candidates, sampling {missing} triples without replacement"
+                )
+                blocks = _weighted_id_blocks(
+                    missing,
+                    num_entities,
+                    num_rel,
+                    num_tail,
+                    _block_rng(seed, *stream, 2),
+                    avoid_self_links,
+                    index.keys(),
+                    cumulative,
+                )
+                yield from blocks if stats is None else _counted(blocks, stats)
+                return
+            heads, rels, tails, keys, self_links = candidate
+            new = ~index.contains(keys)
+            accept = np.flatnonzero(new)[:missing]
+            index.add(keys[accept])
+            missing -= len(accept)
+            if stats is not None:
+                stats.count(
+                    attempts=block_size,
+                    accepted=len(accept),
+                    self_links=self_links,
+                    # drawn twice within the block or accepted before
+                    duplicates=block_size - self_links - np.count_nonzero(new),
+                )
+            yield heads[accept], rels[accept], tails[accept]
+    finally:
+        candidates.close()
+
+
+def sample_triple_ids(
+    length: int,
+    num_entities: int,
+    num_rel: int,
+    num_tail: Optional[int] = None,
+    seed: int = None,
+    strategy: str = "auto",
+    workers: int = 1,
+    head_distribution: Distribution = "uniform",
+    relation_distribution: Distribution = "uniform",
+    tail_distribution: Distribution = "uniform",
+    include: Optional[TripleIdArrays] = None,
+    stats: Optional[GenerationStats] = None,
+) -> TripleIdArrays:
+    """Sample unique integer coded triples.
+
+    See [iter_triple_ids][strawman.sampling.iter_triple_ids] for details.
+
+    Args:
+        length: Number of triples
+        num_entities: Number of unique entities
+        num_rel: Number of unique relations
+        num_tail: Number of possible tail values for attribute triples
+        seed: Seed for reproducibility
+        strategy: One of "auto", "rejection" or "exact"
+        workers: Number of processes drawing candidate blocks
+        head_distribution: Distribution of the heads over the entities
+        relation_distribution: Distribution of the relations
+        tail_distribution: Distribution of the tails over the entities or attribute values
+        include: Triples to accept right after the warm-up
+        stats: Collects phase times and counters, see `strawman.stats`
+
+    Returns:
+        head, relation and tail ids
+
+    Example:
+    ```pycon
+    >>> from strawman.sampling import sample_triple_ids
+    >>> heads, rels, tails = sample_triple_ids(5, 3, 2, seed=1)
+    >>> heads
+    array([1, 0, 2, 0, 1])
+    ```
+    """
+    heads, rels, tails = (
+        np.concatenate(col)
+        for col in zip(
+            *iter_triple_ids(
+                length,
+                num_entities,
+                num_rel,
+                num_tail,
+                seed,
+                strategy,
+                workers,
+                head_distribution,
+                relation_distribution,
+                tail_distribution,
+                include,
+                stats,
+            )
+        )
+    )
+    return heads, rels, tails
+
+
+def extend_triple_ids(
+    length: int,
+    existing: TripleIdArrays,
+    num_entities: int,
+    num_rel: int,
+    num_new_entities: int = 0,
+    num_new_rel: int = 0,
+    seed: int = None,
+    workers: int = 1,
+) -> TripleIdArrays:
+    """Sample unique integer coded relation triples that are not in an existing graph.
+
+    The existing triples are packed into int64 keys once and kept in a
+    [KeyIndex][strawman.sampling.KeyIndex], afterwards only candidates for the
+    new triples are drawn and looked up, so the cost is proportional to
+    `length`. If the new triples take more than `DENSE_THRESHOLD` of the
+    remaining possible ones, they are sampled without replacement instead. New entities get the ids following `num_entities`, new relations
+    the ids following `num_rel`, they all show up in the new triples.
+    Self-links are avoided.
+
+    Args:
+        length: Number of new triples
+        existing: head, relation and tail ids of the existing triples
+        num_entities: Number of existing entities
+        num_rel: Number of existing relations
+        num_new_entities: Number of entities to introduce
+        num_new_rel: Number of relations to introduce
+        seed: Seed for reproducibility
+        workers: Number of processes drawing candidate blocks
+
+    Returns:
+        head, relation and tail ids of the new triples
+
+    Raises:
+        ValueError: If not enough new unique triples could be sampled
+
+    Example:
+    ```pycon
+    >>> from strawman.sampling import extend_triple_ids, sample_triple_ids
+    >>> existing = sample_triple_ids(20, 10, 2, seed=1)
+    >>> heads, rels, tails = extend_triple_ids(
+    ...     5, existing, 10, 2, num_new_entities=1, seed=2
+    ... )
+    >>> heads
+    array([10,  3,  1,  5,  1])
+    ```
+    """
+    seed = _init_seed(seed)
+    total_entities = num_entities + num_new_entities
+    total_rel = num_rel + num_new_rel
+    num_cover = max(num_new_entities, num_new_rel)
+    if length < num_cover:
+        raise ValueError(
+            f"Cannot introduce {num_new_entities} entities and {num_new_rel} relations with {length} triples"
+        )
+    keys = triple_keys(*existing, total_entities, total_rel, total_entities)
+    index = KeyIndex(keys)
+    remaining = _num_possible(total_entities, total_rel, total_entities, True) - len(
+        index
+    )
+    if length > remaining:
+        raise ValueError(
+            f"Cannot create {length} new unique rows with {total_entities} entities and {total_rel} relations"
+        )
+
+    # every new entity and relation shows up, these triples cannot exist yet
+    rng = _block_rng(seed, EXTENSION_STREAM, 0)
+    heads = (
+        num_entities + _permutation_blocks(num_new_entities, num_cover, rng)
+        if num_new_entities
+        else rng.integers(0, total_entities, size=num_cover)
+    )
+    rels = (
+        num_rel + _permutation_blocks(num_new_rel, num_cover, rng)
+        if num_new_rel
+        else rng.integers(0, total_rel, size=num_cover)
+    )
+    tails = _sample_tails(heads, total_entities, rng, True)
+    keys = triple_keys(heads, rels, tails, total_entities, total_rel, total_entities)
+    first = _first_occurrences(keys)
+    blocks = [(heads[first], rels[first], tails[first])]
+    if _select_strategy("auto", length, remaining) == "exact":
+        # rank sampling around the existing triples, which may contain
+        # duplicates and self-links
+        taken_heads, taken_rels, taken_tails = (
+            np.concatenate(ids) for ids in zip(existing, blocks[0])
+        )
+        keep = _first_occurrences(
+            triple_keys(
+                taken_heads,
+                taken_rels,
+                taken_tails,
+                total_entities,
+                total_rel,
+                total_entities,
+            )
+        )
+        keep = keep[taken_heads[keep] != taken_tails[keep]]
+        blocks.extend(
+            _exact_id_blocks(
+                len(keep) + length - len(first),
+                total_entities,
+                total_rel,
+                total_entities,
+                _block_rng(seed, EXTENSION_STREAM, 2),
+                True,
+                (taken_heads[keep], taken_rels[keep], taken_tails[keep]),
+            )
+        )
+    else:
+        index.add(keys[first])
+        blocks.extend(
+            _rejection_blocks(
+                index,
+                length - len(first),
+                length,
+                seed,
+                total_entities,
+                total_rel,
+                total_entities,
+                True,
+                (None, None, None),
+                workers,
+                stream=(EXTENSION_STREAM,),
+            )
+        )
+    heads, rels, tails = (np.concatenate(ids) for ids in zip(*blocks))
+    return heads, rels, tails
+
+
+def iter_corrupted_triple_ids(
+    triples: TripleIdArrays,
+    num_entities: int,
+    num_rel: int,
+    num_tail: Optional[int] = None,
+    num_negatives: int = 1,
+    corrupt: str = "both",
+    avoid_self_links: bool = True,
+    seed: int = None,
+) -> Iterator[TripleIdArrays]:
+    """Corrupt integer coded triples block by block, e.g. for negative sampling.
+
+    Every triple is repeated `num_negatives` times and its head, tail or (for
+    `corrupt="both"`) randomly one of them is replaced by a random entity. The
+    positives are packed into int64 keys and kept in a
+    [KeyIndex][strawman.sampling.KeyIndex], corruptions that are positives are
+    redrawn until none is left. Self-links are avoided like in
+    `iter_triple_ids`. Negatives are not deduplicated.
+
+    Every block of positives uses its own random stream derived from `seed`.
+
+    Args:
+        triples: head, relation and tail ids of the positive triples
+        num_entities: Number of entities
+        num_rel: Number of relations
+        num_tail: Number of possible tail values for attribute triples
+        num_negatives: Number of corrupted triples per positive
+        corrupt: One of "head", "tail" or "both"
+        avoid_self_links: If True corrupted relation triples contain no self-links
+        seed: Seed for reproducibility
+
+    Yields:
+        head, relation and tail ids, the negatives of triple ``i`` are rows
+        ``i * num_negatives`` to ``(i + 1) * num_negatives - 1``
+
+    Raises:
+        ValueError: If some triple cannot be corrupted
+    """
+    if corrupt not in CORRUPTIONS:
+        raise ValueError(f"Unknown corrupt {corrupt}, choose one of {CORRUPTIONS}")
+    if num_negatives < 1:
+        raise ValueError(f"num_negatives must be >= 1 but was {num_negatives}")
+    seed = _init_seed(seed)
+    avoid_self_links = avoid_self_links and num_tail is None
+    if num_tail is None:
+        num_tail = num_entities
+    if avoid_self_links and num_entities < 2:
+        raise ValueError("Cannot avoid self-links with less than 2 entities")
+    index = KeyIndex(triple_keys(*triples, num_entities, num_rel, num_tail))
+    block_size = max(TRIPLE_BLOCK_ROWS // num_negatives, 1)
+    for block, start in enumerate(range(0, len(triples[0]), block_size)):
+        heads, rels, tails = (
+            np.repeat(ids[start : start + block_size], num_negatives) for ids in triples
+        )
+        yield _corrupt_block(
+            heads,
+            rels,
+            tails,
+            num_entities,
+            num_rel,
+            num_tail,
+            corrupt,
+            avoid_self_links,
+            index,
+            _block_rng(seed, block),
+        )
+
+
+def _corrupt_block(
+    heads: np.ndarray,
+    rels: np.ndarray,
+    tails: np.ndarray,
+    num_entities: int,
+    num_rel: int,
+    num_tail: int,
+    corrupt: str,
+    avoid_self_links: bool,
+    index: KeyIndex,
+    rng: np.random.Generator,
+) -> TripleIdArrays:
+    if corrupt == "both":
+        corrupt_head = rng.random(len(heads)) < 0.5
+    else:
+        corrupt_head = np.full(len(heads), corrupt == "head")
+    new_heads, new_tails = heads.copy(), tails.copy()
+    pending = np.arange(len(heads))
+    for _ in range(CORRUPTION_ROUNDS):
+        head_rows = pending[corrupt_head[pending]]
+        tail_rows = pending[~corrupt_head[pending]]
+        # the tail sampler skips over the fixed end to avoid self-links
+        new_heads[head_rows] = _sample_tails(
+            tails[head_rows], num_entities, rng, avoid_self_links
+        )
+        new_tails[tail_rows] = _sample_tails(
+            heads[tail_rows], num_tail, rng, avoid_self_links
+        )
+        keys = triple_keys(
+            new_heads[pending],
+            rels[pending],
+            new_tails[pending],
+            num_entities,
+            num_rel,
+            num_tail,
+        )
+        pending = pending[index.contains(keys)]
+        if len(pending) == 0:
+            return new_heads, rels, new_tails
+    raise ValueError(
+        f"Could not corrupt {len(pending)} triples, their corruptions are positives"
+    )
+
+
+def corrupt_triple_ids(
+    triples: TripleIdArrays,
+    num_entities: int,
+    num_rel: int,
+    num_tail: Optional[int] = None,
+    num_negatives: int = 1,
+    corrupt: str = "both",
+    avoid_self_links: bool = True,
+    seed: int = None,
+) -> TripleIdArrays:
+    """Corrupt integer coded triples, e.g. for negative sampling.
+
+    See [iter_corrupted_triple_ids][strawman.sampling.iter_corrupted_triple_ids] for details.
+
+    Args:
+        triples: head, relation and tail ids of the positive triples
+        num_entities: Number of entities
+        num_rel: Number of relations
+        num_tail: Number of possible tail values for attribute triples
+        num_negatives: Number of corrupted triples per positive
+        corrupt: One of "head", "tail" or "both"
+        avoid_self_links: If True corrupted relation triples contain no self-links
+        seed: Seed for reproducibility
+
+    Returns:
+        head, relation and tail ids of the negatives
+
+    Example:
+    ```pycon
+    >>> from strawman.sampling import corrupt_triple_ids, sample_triple_ids
+    >>> positives = sample_triple_ids(5, 4, 2, seed=1)
+    >>> heads, rels, tails = corrupt_triple_ids(
+    ...     positives, 4, 2, num_negatives=2, corrupt="tail", seed=2
+    ... )
+    >>> tails
+    array([0, 2, 3, 0, 3, 3, 0, 0, 3, 3])
+    ```
+    """
+    blocks = list(
+        iter_corrupted_triple_ids(
+            triples,
+            num_entities,
+            num_rel,
+            num_tail,
+            num_negatives,
+            corrupt,
+            avoid_self_links,
+            seed,
+        )
+    )
+    if not blocks:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty.copy(), empty.copy()
+    heads, rels, tails = (np.concatenate(ids) for ids in zip(*blocks))
+    return heads, rels, tails
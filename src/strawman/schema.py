@@ -0,0 +1,488 @@
+"""Typed column specifications for [dummy_df][strawman.dummy_df].
+
+Every column is drawn as native NumPy array with a single vectorized call.
+A share of `null_fraction` cells is set to null, using pandas' nullable
+dtypes where NumPy has no missing value.
+
+```pycon
+>>> from strawman import dummy_df
+>>> from strawman.schema import Categoricals, Datetimes, Floats, Integers
+>>> df = dummy_df(
+...     (1000, 4),
+...     schema={
+...         "id": Integers(0, 10**6),
+...         "price": Floats(10.0, 2.5, distribution="normal", null_fraction=0.1),
+...         "created": Datetimes("2020-01-01", "2021-01-01"),
+...         "country": Categoricals(("DE", "FR", "US"), weights=(0.5, 0.3, 0.2)),
+...     },
+...     seed=1,
+... )
+>>> df.dtypes
+id                  int64
+price             float64
+created     datetime64[s]
+country          category
+dtype: object
+```
+"""
+
+import string
+from typing import Dict, Iterator, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .sampling import sample_weighted
+from .utils import _index_dtype, random_strings
+
+DISTRIBUTIONS = ("uniform", "normal", "exponential")
+
+
+def _check_null_fraction(spec: "ColumnSpec"):
+    if not 0 <= spec.null_fraction <= 1:
+        raise ValueError(
+            f"null_fraction must be between 0 and 1 but was {spec.null_fraction}"
+        )
+
+
+class Integers(NamedTuple):
+    """Integers drawn uniformly from `[low, high)`."""
+
+    low: int = 0
+    high: int = 100
+    dtype: str = "int64"
+    null_fraction: float = 0.0
+
+    def validate(self):
+        """Check the parameters.
+
+        Raises:
+            ValueError: if the range is empty or null_fraction is not a share
+        """
+        _check_null_fraction(self)
+        if self.low >= self.high:
+            raise ValueError(
+                f"low ({self.low}) must be smaller than high ({self.high})"
+            )
+
+    def sample(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        """Draw values.
+
+        Args:
+            size: number of values
+            rng: generator to draw from
+
+        Returns:
+            array of `dtype`
+        """
+        return rng.integers(self.low, self.high, size=size, dtype=self.dtype)
+
+    def to_pandas(self, values: np.ndarray, mask: Optional[np.ndarray]):
+        """Insert nulls.
+
+        Args:
+            values: sampled values
+            mask: True for nulls, None if there are none
+
+        Returns:
+            the values, as nullable integer array if there are nulls
+        """
+        import pandas as pd
+
+        return values if mask is None else pd.arrays.IntegerArray(values, mask)
+
+    def to_numpy(self, values: np.ndarray, mask: Optional[np.ndarray]):
+        """Insert nulls.
+
+        Args:
+            values: sampled values
+            mask: True for nulls, None if there are none
+
+        Returns:
+            the values, as masked array if there are nulls
+        """
+        return values if mask is None else np.ma.MaskedArray(values, mask)
+
+
+class Floats(NamedTuple):
+    """Floats with location `loc` and scale `scale`.
+
+    "uniform" draws from `[loc, loc + scale)`, "normal" uses `loc` as mean and
+    `scale` as standard deviation and "exponential" adds `loc` to values with
+    mean `scale`.
+    """
+
+    loc: float = 0.0
+    scale: float = 1.0
+    distribution: str = "uniform"
+    null_fraction: float = 0.0
+
+    def validate(self):
+        """Check the parameters.
+
+        Raises:
+            ValueError: if the distribution is unknown, scale is negative or null_fraction is not a share
+        """
+        _check_null_fraction(self)
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown distribution {self.distribution}, choose one of {DISTRIBUTIONS}"
+            )
+        if self.scale < 0:
+            raise ValueError(f"scale must be >= 0 but was {self.scale}")
+
+    def sample(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        """Draw values.
+
+        Args:
+            size: number of values
+            rng: generator to draw from
+
+        Returns:
+            float64 array
+        """
+        if self.distribution == "normal":
+            return rng.normal(self.loc, self.scale, size=size)
+        if self.distribution == "exponential":
+            return self.loc + rng.exponential(self.scale, size=size)
+        return rng.uniform(self.loc, self.loc + self.scale, size=size)
+
+    def to_pandas(self, values: np.ndarray, mask: Optional[np.ndarray]):
+        """Insert nulls.
+
+        Args:
+            values: sampled values
+            mask: True for nulls, None if there are none
+
+        Returns:
+            the values with NaN as nulls
+        """
+        return values if mask is None else np.where(mask, np.nan, values)
+
+    def to_numpy(self, values: np.ndarray, mask: Optional[np.ndarray]):
+        """Insert nulls.
+
+        Args:
+            values: sampled values
+            mask: True for nulls, None if there are none
+
+        Returns:
+            the values with NaN as nulls
+        """
+        return self.to_pandas(values, mask)
+
+
+class Datetimes(NamedTuple):
+    """Datetimes drawn uniformly from `[start, end)` with resolution `unit`."""
+
+    start: str = "2000-01-01"
+    end: str = "2030-01-01"
+    unit: str = "s"
+    null_fraction: float = 0.0
+
+    def _bounds(self) -> Tuple[int, int]:
+        dtype = f"datetime64[{self.unit}]"
+        return (
+            int(np.array(self.start, dtype=dtype).astype(np.int64)),
+            int(np.array(self.end, dtype=dtype).astype(np.int64)),
+        )
+
+    def validate(self):
+        """Check the parameters.
+
+        Raises:
+            ValueError: if the range is empty or null_fraction is not a share
+        """
+        _check_null_fraction(self)
+        low, high = self._bounds()
+        if low >= high:
+            raise ValueError(f"start ({self.start}) must be before end ({self.end})")
+
+    def sample(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        """Draw values.
+
+        Args:
+            size: number of values
+            rng: generator to draw from
+
+        Returns:
+            datetime64 array
+        """
+        low, high = self._bounds()
+        return rng.integers(low, high, size=size).view(f"datetime64[{self.unit}]")
+
+    def to_pandas(self, values: np.ndarray, mask: Optional[np.ndarray]):
+        """Insert nulls.
+
+        Args:
+            values: sampled values
+            mask: True for nulls, None if there are none
+
+        Returns:
+            the values with NaT as nulls
+        """
+        if mask is None:
+            return values
+        return np.where(mask, np.array("NaT", dtype=f"datetime64[{self.unit}]"), values)
+
+    def to_numpy(self, values: np.ndarray, mask: Optional[np.ndarray]):
+        """Insert nulls.
+
+        Args:
+            values: sampled values
+            mask: True for nulls, None if there are none
+
+        Returns:
+            the values with NaT as nulls
+        """
+        return self.to_pandas(values, mask)
+
+
+class Booleans(NamedTuple):
+    """Booleans that are True with probability `p`."""
+
+    p: float = 0.5
+    null_fraction: float = 0.0
+
+    def validate(self):
+        """Check the parameters.
+
+        Raises:
+            ValueError: if p or null_fraction is not a share
+        """
+        _check_null_fraction(self)
+        if not 0 <= self.p <= 1:
+            raise ValueError(f"p must be between 0 and 1 but was {self.p}")
+
+    def sample(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        """Draw values.
+
+        Args:
+            size: number of values
+            rng: generator to draw from
+
+        Returns:
+            bool array
+        """
+        return rng.random(size) < self.p
+
+    def to_pandas(self, values: np.ndarray, mask: Optional[np.ndarray]):
+        """Insert nulls.
+
+        Args:
+            values: sampled values
+            mask: True for nulls, None if there are none
+
+        Returns:
+            the values, as nullable boolean array if there are nulls
+        """
+        import pandas as pd
+
+        return values if mask is None else pd.arrays.BooleanArray(values, mask)
+
+    def to_numpy(self, values: np.ndarray, mask: Optional[np.ndarray]):
+        """Insert nulls.
+
+        Args:
+            values: sampled values
+            mask: True for nulls, None if there are none
+
+        Returns:
+            the values, as masked array if there are nulls
+        """
+        return values if mask is None else np.ma.MaskedArray(values, mask)
+
+
+class Categoricals(NamedTuple):
+    """Values of a small set of categories, optionally with weights."""
+
+    categories: Union[Sequence[str], np.ndarray] = ("a", "b", "c")
+    weights: Optional[Union[Sequence[float], np.ndarray]] = None
+    null_fraction: float = 0.0
+
+    def validate(self):
+        """Check the parameters.
+
+        Raises:
+            ValueError: if there are no categories, the weights do not fit or null_fraction is not a share
+        """
+        _check_null_fraction(self)
+        if len(self.categories) == 0:
+            raise ValueError("categories must not be empty")
+        if self.weights is not None and (
+            len(self.weights) != len(self.categories)
+            or min(self.weights) < 0
+            or sum(self.weights) <= 0
+        ):
+            raise ValueError(
+                "weights must be non-negative, not all zero and one per category"
+            )
+
+    def sample(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        """Draw category codes.
+
+        Args:
+            size: number of values
+            rng: generator to draw from
+
+        Returns:
+            integer codes of the categories
+        """
+        num = len(self.categories)
+        if self.weights is None:
+            return rng.integers(0, num, size=size, dtype=_index_dtype(num))
+        cumulative = np.cumsum(self.weights, dtype=np.float64)
+        return sample_weighted(cumulative, size, rng).astype(_index_dtype(num))
+
+    def to_pandas(self, values: np.ndarray, mask: Optional[np.ndarray]):
+        """Turn codes into a Categorical.
+
+        Args:
+            values: sampled codes
+            mask: True for nulls, None if there are none
+
+        Returns:
+            Categorical of the categories
+        """
+        import pandas as pd
+
+        codes = values.astype(np.int32 if len(self.categories) < 2**31 else np.int64)
+        if mask is not None:
+            codes[mask] = -1
+        return pd.Categorical.from_codes(
+            codes, dtype=pd.CategoricalDtype(self.categories)
+        )
+
+    def to_numpy(self, values: np.ndarray, mask: Optional[np.ndarray]):
+        """Turn codes into their categories.
+
+        Args:
+            values: sampled codes
+            mask: True for nulls, None if there are none
+
+        Returns:
+            the categories, as masked array if there are nulls
+        """
+        labels = np.asarray(self.categories)[values]
+        return labels if mask is None else np.ma.MaskedArray(labels, mask)
+
+
+class Strings(NamedTuple):
+    """Random strings, like the cells of `dummy_df` without a schema."""
+
+    content_length: int = 3
+    allowed_chars: str = string.ascii_letters
+    null_fraction: float = 0.0
+
+    def validate(self):
+        """Check the parameters.
+
+        Raises:
+            ValueError: if no chars are allowed or null_fraction is not a share
+        """
+        _check_null_fraction(self)
+        if len(self.allowed_chars) == 0:
+            raise ValueError("allowed_chars must not be empty")
+
+    def sample(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        """Draw values.
+
+        Args:
+            size: number of values
+            rng: generator to draw from
+
+        Returns:
+            fixed-width unicode array
+        """
+        return random_strings(size, self.content_length, self.allowed_chars, rng)
+
+    def to_pandas(self, values: np.ndarray, mask: Optional[np.ndarray]):
+        """Insert nulls.
+
+        Args:
+            values: sampled values
+            mask: True for nulls, None if there are none
+
+        Returns:
+            the values, as nullable string array if there are nulls
+        """
+        if mask is None:
+            return values
+        import pandas as pd
+
+        values = values.astype(object)
+        values[mask] = None
+        return pd.array(values, dtype="string")
+
+    def to_numpy(self, values: np.ndarray, mask: Optional[np.ndarray]):
+        """Insert nulls.
+
+        Args:
+            values: sampled values
+            mask: True for nulls, None if there are none
+
+        Returns:
+            the values, as masked array if there are nulls
+        """
+        return values if mask is None else np.ma.MaskedArray(values, mask)
+
+
+ColumnSpec = Union[Integers, Floats, Datetimes, Booleans, Categoricals, Strings]
+Schema = Dict[str, ColumnSpec]
+
+
+def sample_column(
+    spec: ColumnSpec, size: int, rng: np.random.Generator
+) -> Tuple[np.ndarray, ...]:
+    """Draw the values of a column and, if it has nulls, the null mask.
+
+    Args:
+        spec: column specification
+        size: number of values
+        rng: generator to draw from
+
+    Returns:
+        values and, if `spec.null_fraction` is positive, a boolean null mask
+    """
+    values = spec.sample(size, rng)
+    if spec.null_fraction > 0:
+        return values, rng.random(size) < spec.null_fraction
+    return (values,)
+
+
+def schema_parts(
+    schema: Schema, arrays: Sequence[np.ndarray]
+) -> Iterator[Tuple[str, ColumnSpec, np.ndarray, Optional[np.ndarray]]]:
+    """Pair every column with its sampled values and null mask.
+
+    Args:
+        schema: column specifications
+        arrays: output of `sample_column` for every column, concatenated
+
+    Yields:
+        column name, specification, values and null mask or None
+    """
+    position = 0
+    for name, spec in schema.items():
+        has_nulls = spec.null_fraction > 0
+        mask = arrays[position + 1] if has_nulls else None
+        yield name, spec, arrays[position], mask
+        position += 2 if has_nulls else 1
+
+
+def schema_columns(
+    schema: Schema, arrays: Sequence[np.ndarray], numpy: bool = False
+) -> Dict[str, object]:
+    """Turn sampled arrays into pandas compatible or NumPy columns.
+
+    Args:
+        schema: column specifications
+        arrays: output of `sample_column` for every column, concatenated
+        numpy: If True, return NumPy arrays with masked arrays for nulls
+
+    Returns:
+        column name to array
+    """
+    return {
+        name: (spec.to_numpy if numpy else spec.to_pandas)(values, mask)
+        for name, spec, values, mask in schema_parts(schema, arrays)
+    }
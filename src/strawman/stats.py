@@ -0,0 +1,143 @@
+"""Instrumentation of the generators.
+
+Pass a `GenerationStats` as `stats` to collect the wall time of every phase
+and counters of the sampling, e.g. how many candidate triples were drawn and
+why they were rejected. Without `stats` nothing is measured.
+
+```pycon
+>>> from strawman import dummy_triples
+>>> from strawman.stats import GenerationStats
+>>> stats = GenerationStats()
+>>> df = dummy_triples(1000, seed=1, stats=stats)
+>>> stats.counters["accepted"]
+1000
+>>> sorted(stats.phases)
+['frame', 'labels', 'sampling', 'warm_up']
+```
+"""
+
+import contextlib
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class GenerationStats:
+    """Phase times and counters collected during generation.
+
+    Phases that run repeatedly, e.g. for every chunk, are summed up. With
+    `trace_memory` the peak of the memory allocated during any phase is
+    measured with `tracemalloc`, which slows down generation. Allocations of
+    worker processes are not traced.
+
+    Counters of triple sampling:
+
+    - "warm_up": triples covering every entity and relation
+    - "attempts": randomly drawn candidate triples
+    - "accepted": triples in the output, including the warm-up
+    - "duplicates": candidates rejected because they were already accepted or drawn twice
+    - "self_links": candidates rejected because head and tail are equal
+
+    Candidates of the last block that were not needed are not rejected, so
+    attempts can exceed the sum of accepted random triples and rejections.
+
+    Args:
+        trace_memory: If True measure the peak allocation
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.peak_memory: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.as_dict()})"
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure the wall time (and allocations) of a phase.
+
+        Args:
+            name: name of the phase
+
+        Yields:
+            nothing, the phase runs in the with block
+        """
+        started = self.trace_memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        elif self.trace_memory and hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        memory = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (
+                time.perf_counter() - start
+            )
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1] - memory
+                self.peak_memory = max(self.peak_memory or 0, peak)
+            if started:
+                tracemalloc.stop()
+
+    def count(self, **counts: int):
+        """Add to counters.
+
+        Args:
+            counts: counter name to increment
+        """
+        for name, value in counts.items():
+            self.counters[name] = self.counters.get(name, 0) + int(value)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Flat representation, e.g. for a metrics system.
+
+        Returns:
+            "<phase>_seconds" for every phase, the counters and "peak_memory_bytes" if traced
+        """
+        result: Dict[str, Any] = {
+            f"{name}_seconds": seconds for name, seconds in self.phases.items()
+        }
+        result.update(self.counters)
+        if self.peak_memory is not None:
+            result["peak_memory_bytes"] = self.peak_memory
+        return result
+
+
+def _phase(stats: Optional[GenerationStats], name: str):
+    # phase of stats, or a no-op if stats are disabled
+    return contextlib.nullcontext() if stats is None else stats.phase(name)
+
+
+def _timed(
+    iterator: Iterator[T], stats: Optional[GenerationStats], name: str
+) -> Iterator[T]:
+    # count the time spent producing the items as phase `name`
+    if stats is None:
+        return iterator
+    return _timed_items(iterator, stats, name)
+
+
+def _timed_items(
+    iterator: Iterator[T], stats: GenerationStats, name: str
+) -> Iterator[T]:
+    try:
+        while True:
+            with stats.phase(name):
+                item = next(iterator, _DONE)
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        # release e.g. worker pools of the iterator if the caller stops early
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+_DONE: Any = object()
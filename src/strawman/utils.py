@@ -1,19 +1,160 @@
 import logging
 import string
-from typing import Any, List, Optional, Sequence, Union
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
-def _init_rng(seed: int = None):
+_local = threading.local()
+
+
+def _default_rng() -> np.random.Generator:
+    # generator used when neither rng nor seed is given, one per thread
+    rng = getattr(_local, "rng", None)
+    if rng is None:
+        rng = _local.rng = np.random.default_rng()
+    return rng
+
+
+class _SeedContext:
+    def __init__(self, previous: Optional[np.random.Generator]):
+        self._previous = previous
+
+    def __enter__(self) -> np.random.Generator:
+        return _local.rng
+
+    def __exit__(self, *exc_info):
+        _local.rng = self._previous
+
+
+def seed(value: Optional[int] = None) -> _SeedContext:
+    """Seed the generator that is used when no `rng` or `seed` is given.
+
+    The generator is cached per thread, so unseeded calls do not have to
+    create a new generator each time. Used as context manager, the previous
+    generator is restored on exit.
+
+    Args:
+        value: seed, fresh entropy if None
+
+    Returns:
+        context manager yielding the seeded generator
+
+    Example:
+    ```pycon
+    >>> import strawman
+    >>> from strawman.utils import sequence_choice
+    >>> _ = strawman.seed(42)
+    >>> with strawman.seed(1):
+    ...     sequence_choice("abcdef")
+    'c'
+    ```
+    """
+    previous = getattr(_local, "rng", None)
+    _local.rng = np.random.default_rng(value)
+    return _SeedContext(previous)
+
+
+def _init_seed(seed: int = None) -> int:
     if seed is None:
-        seed = np.random.default_rng().integers(0, 10000)
+        seed = int(_default_rng().integers(0, 10000))
         logger.debug(f"Selected seed {seed}")
+    return seed
+
+
+def _init_rng(seed: int = None) -> np.random.Generator:
+    if seed is None:
+        return _default_rng()
     return np.random.default_rng(seed=seed)
 
 
+def _block_rng(seed: int, *key: int) -> np.random.Generator:
+    # independent child stream, same as SeedSequence(seed).spawn(...)[key]
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=key))
+
+
+def _ordered_map(
+    func: Callable, args: Iterable, workers: int = 1
+) -> Generator[Any, None, None]:
+    """Lazily map `func` over `args`, keeping the order of the results.
+
+    With more than one worker the calls are distributed over a process pool,
+    submitting at most twice as many calls as there are workers ahead.
+
+    Args:
+        func: picklable function to apply
+        args: single arguments for `func`
+        workers: number of processes
+
+    Yields:
+        results in order of `args`
+    """
+    if workers <= 1:
+        yield from map(func, args)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        try:
+            for arg in args:
+                pending.append(pool.submit(func, arg))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _rechunk(
+    blocks: Iterable[Tuple[np.ndarray, ...]], chunk_size: int
+) -> Iterator[Tuple[np.ndarray, ...]]:
+    """Cut a stream of array tuples into tuples with `chunk_size` rows.
+
+    Args:
+        blocks: tuples of arrays with equal length
+        chunk_size: number of rows per chunk, the last chunk may be smaller
+
+    Yields:
+        tuples of arrays with `chunk_size` rows
+
+    Raises:
+        ValueError: if chunk_size is smaller than 1
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be >= 1 but was {chunk_size}")
+    pending: List[Tuple[np.ndarray, ...]] = []
+    pending_rows = 0
+    for block in blocks:
+        while len(block[0]) > 0:
+            take = min(chunk_size - pending_rows, len(block[0]))
+            pending.append(tuple(col[:take] for col in block))
+            pending_rows += take
+            block = tuple(col[take:] for col in block)
+            if pending_rows == chunk_size:
+                yield tuple(np.concatenate(cols) for cols in zip(*pending))
+                pending = []
+                pending_rows = 0
+    if pending_rows:
+        yield tuple(np.concatenate(cols) for cols in zip(*pending))
+
+
 def sequence_choice(seq: Sequence, rng: np.random.Generator = None) -> Any:
     """Choose an element randomly from the sequence.
 
@@ -39,6 +180,34 @@ def sequence_choice(seq: Sequence, rng: np.random.Generator = None) -> Any:
     return seq[rng.integers(0, len(seq))]
 
 
+def sequence_choices(seq: Sequence, k: int, rng: np.random.Generator = None) -> Any:
+    """Choose `k` elements randomly (with replacement) from the sequence.
+
+    All indices are drawn with a single call to the rng.
+
+    Args:
+        seq: sequence to choose from
+        k: number of elements to choose
+        rng: rng to control randomness
+
+    Returns:
+        numpy array if `seq` is a numpy array, else list of chosen elements
+
+    Example:
+    ```pycon
+    >>> from strawman.utils import sequence_choices
+    >>> sequence_choices([1,2,3,4], 5)
+    [2, 4, 4, 1, 3]
+    ```
+    """
+    if rng is None:
+        rng = _init_rng()
+    idx = rng.integers(0, len(seq), size=k)
+    if isinstance(seq, np.ndarray):
+        return seq[idx]
+    return [seq[i] for i in idx]
+
+
 def shuffle(
     mylist: List,
     rng: np.random.Generator = None,
@@ -65,14 +234,20 @@ def shuffle(
 
 
 def shuffled_overlong(
-    mylist: List, length: int, rng: np.random.Generator = None
-) -> List:
+    mylist: Sequence,
+    length: int,
+    rng: np.random.Generator = None,
+    as_array: bool = False,
+) -> Union[List, np.ndarray]:
     """Return a shuffled list which can be longer or shorter (containing the same elements).
 
+    The output consists of concatenated permutations of the input.
+
     Args:
         mylist: The list from which to choose elements
         length: length of output
         rng: rng to control randomness
+        as_array: If True return a numpy array instead of a list
 
     Returns:
         shuffled list with specified length containing input elements
@@ -86,13 +261,18 @@ def shuffled_overlong(
     """
     if rng is None:
         rng = _init_rng()
-    res: List = []
-    while len(res) < length:
-        for i in rng.permutation(len(mylist)):
-            res.append(mylist[i])
-            if len(res) == length:
-                break
-    return res
+    idx = _permutation_blocks(len(mylist), length, rng)
+    if as_array:
+        return np.asarray(mylist)[idx]
+    return [mylist[i] for i in idx]
+
+
+def _permutation_blocks(n: int, length: int, rng: np.random.Generator) -> np.ndarray:
+    # concatenated permutations of range(n), cut to length
+    blocks = [rng.permutation(n) for _ in range(-(-length // n))] if n else []
+    if not blocks:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(blocks)[:length]
 
 
 def random_string_generator(
@@ -118,9 +298,121 @@ def random_string_generator(
     'rhVShtnDZw'
     ```
     """
+    return str(random_strings(1, str_size, allowed_chars=allowed_chars, rng=rng)[0])
+
+
+# share of all possible strings above which unique strings are drawn by rank
+_DENSE_UNIQUE_SHARE = 0.25
+
+
+def _index_dtype(n: int) -> type:
+    # smallest unsigned dtype able to hold indices into a sequence of length n
+    if n <= 2**8:
+        return np.uint8
+    if n <= 2**16:
+        return np.uint16
+    return np.uint32
+
+
+def _random_codes(
+    shape: Tuple[int, ...],
+    str_size: int,
+    allowed_chars: str,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    # code points of random strings, with an additional last axis of str_size
+    if len(allowed_chars) == 0:
+        raise ValueError("allowed_chars must not be empty")
+    codes = np.array(list(allowed_chars), dtype="U1").view(np.uint32)
+    idx = rng.integers(
+        0, len(codes), size=(*shape, str_size), dtype=_index_dtype(len(codes))
+    )
+    return codes[idx]
+
+
+def _codes_to_strings(codes: np.ndarray) -> np.ndarray:
+    str_size = codes.shape[-1]
+    if str_size == 0:
+        return np.full(codes.shape[:-1], "", dtype="U1")
+    return np.ascontiguousarray(codes).view(f"U{str_size}")[..., 0]
+
+
+def _rank_codes(ranks: np.ndarray, str_size: int, allowed_chars: str) -> np.ndarray:
+    # code points of the strings with the given ranks among all possible strings
+    codes = np.array(list(dict.fromkeys(allowed_chars)), dtype="U1").view(np.uint32)
+    digits: np.ndarray = np.empty(
+        (len(ranks), str_size), dtype=_index_dtype(len(codes))
+    )
+    for position in range(str_size - 1, -1, -1):
+        ranks, digits[:, position] = np.divmod(ranks, len(codes))
+    return codes[digits]
+
+
+def random_strings(
+    n: Union[int, Tuple[int, ...]],
+    str_size: int,
+    allowed_chars: str = string.ascii_letters,
+    rng: np.random.Generator = None,
+    unique: bool = False,
+) -> np.ndarray:
+    """Generate many random strings at once.
+
+    All characters are drawn with a single call to the rng and the resulting
+    code points are reinterpreted as fixed-width unicode strings.
+
+    Args:
+        n: Number of strings or shape of the output array
+        str_size: Size of each string
+        allowed_chars: chars from which to pick
+        rng: rng to control randomness
+        unique: If True, duplicates are replaced until all strings are distinct
+
+    Returns:
+        numpy array of unicode strings
+
+    Raises:
+        ValueError: if no chars are allowed or not enough unique strings exist
+
+    Example:
+
+    ```pycon
+    >>> from strawman.utils import random_strings
+    >>> random_strings(3, 4)
+    array(['ZUgy', 'XMbA', 'uqNL'], dtype='<U4')
+    ```
+    """
     if rng is None:
         rng = _init_rng()
-    return "".join(sequence_choice(allowed_chars, rng) for x in range(str_size))
+    # numpy integers are valid sizes as well
+    shape = tuple(int(size) for size in np.atleast_1d(n))
+    if not unique:
+        return _codes_to_strings(_random_codes(shape, str_size, allowed_chars, rng))
+
+    total = int(np.prod(shape))
+    capacity = len(set(allowed_chars)) ** str_size
+    if total > capacity:
+        raise ValueError(
+            f"Cannot create {total} unique strings of size {str_size} from {capacity} possible strings"
+        )
+    if total > capacity * _DENSE_UNIQUE_SHARE:
+        # rejecting duplicates converges slowly, draw distinct ranks instead
+        return _codes_to_strings(
+            _rank_codes(
+                rng.choice(capacity, total, replace=False), str_size, allowed_chars
+            )
+        ).reshape(shape)
+    result = _codes_to_strings(_random_codes((total,), str_size, allowed_chars, rng))
+    while True:
+        _, first = np.unique(result, return_index=True)
+        if len(first) == total:
+            return result.reshape(shape)
+        # keep first occurrences in order and refill the rest
+        first.sort()
+        missing = total - len(first)
+        refill = _codes_to_strings(
+            _random_codes((missing,), str_size, allowed_chars, rng)
+        )
+        result = np.concatenate([result[first], refill])
 
 
 def split_seq(seq: Sequence, parts: int) -> List:
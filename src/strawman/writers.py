@@ -0,0 +1,396 @@
+import contextlib
+import logging
+import os
+import string
+import sys
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from .arrow import _import_pyarrow
+from .dummy_pandas import DEFAULT_CHUNK_SIZE, _triple_frames, iter_dummy_df
+from .sampling import Distribution
+from .schema import Schema
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+    import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, os.PathLike]
+ProgressCallback = Callable[[int], None]
+
+STDOUT = "-"
+FORMATS = ("csv", "tsv", "parquet", "feather", "npy", "ntriples")
+DEFAULT_BASE_IRI = "http://example.org/"
+_SUFFIXES = {
+    ".csv": "csv",
+    ".tsv": "tsv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".npy": "npy",
+    ".nt": "ntriples",
+}
+# formats whose chunks are generated as Arrow tables
+_ARROW_FORMATS = ("parquet", "feather")
+
+
+class WriteStats(NamedTuple):
+    """Summary of a finished write."""
+
+    path: str
+    format: str
+    rows: int
+    bytes: int
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        """Throughput of generating and writing."""
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+
+class _CountingFile:
+    # binary file wrapper counting the written bytes
+    closed = False
+
+    def __init__(self, raw: BinaryIO):
+        self.raw = raw
+        self.count = 0
+
+    def write(self, data: bytes) -> int:
+        self.count += len(data)
+        return self.raw.write(data)
+
+    def tell(self) -> int:
+        return self.count
+
+    def flush(self):
+        self.raw.flush()
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def close(self):
+        self.flush()
+
+
+def _write_csv(out: _CountingFile, chunks: Iterator["pd.DataFrame"], sep: str = ","):
+    for number, chunk in enumerate(chunks):
+        out.write(chunk.to_csv(header=number == 0, index=False, sep=sep).encode())
+
+
+def _write_tsv(out: _CountingFile, chunks: Iterator["pd.DataFrame"]):
+    _write_csv(out, chunks, sep="\t")
+
+
+def _as_table(pa, chunk: Union["pd.DataFrame", "pa.Table"]) -> "pa.Table":
+    if isinstance(chunk, pa.Table):
+        return chunk
+    return pa.Table.from_pandas(chunk, preserve_index=False)
+
+
+def _write_parquet(out: _CountingFile, chunks: Iterator["pd.DataFrame"]):
+    pa = _import_pyarrow("Writing parquet")
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = _as_table(pa, chunk)
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema)
+            # every chunk becomes a row group
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _write_feather(out: _CountingFile, chunks: Iterator["pd.DataFrame"]):
+    pa = _import_pyarrow("Writing feather")
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = _as_table(pa, chunk)
+            if writer is None:
+                writer = pa.ipc.new_file(out, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _iri(base_iri: str, values: "pd.Series") -> "pd.Series":
+    return "<" + base_iri + values.astype(str) + ">"
+
+
+def _literal(values: "pd.Series") -> "pd.Series":
+    escaped = values.astype(str).str.replace("\\", "\\\\").str.replace('"', '\\"')
+    return '"' + escaped + '"'
+
+
+def _write_ntriples(
+    out: _CountingFile,
+    chunks: Iterator["pd.DataFrame"],
+    base_iri: str = DEFAULT_BASE_IRI,
+    literal_tails: bool = False,
+):
+    for chunk in chunks:
+        heads, rels, tails = (chunk[column] for column in chunk.columns)
+        tail_terms = _literal(tails) if literal_tails else _iri(base_iri, tails)
+        lines = (
+            _iri(base_iri, heads)
+            + " "
+            + _iri(base_iri, rels)
+            + " "
+            + tail_terms
+            + " .\n"
+        )
+        out.write("".join(lines).encode())
+
+
+def _write_npy(
+    path: PathLike,
+    chunks: Iterator["pd.DataFrame"],
+    shape: Tuple[int, int],
+    width: int,
+):
+    # fixed-width unicode array, filled chunk by chunk through a memory map
+    out = np.lib.format.open_memmap(
+        path, mode="w+", dtype=f"U{max(width, 1)}", shape=shape
+    )
+    start = 0
+    for chunk in chunks:
+        if start + len(chunk) > shape[0]:
+            raise ValueError(f"Generated more rows than expected {shape[0]}")
+        out[start : start + len(chunk)] = chunk.to_numpy(dtype=str)
+        start += len(chunk)
+    out.flush()
+    del out
+
+
+_STREAM_WRITERS: Dict[str, Callable] = {
+    "csv": _write_csv,
+    "tsv": _write_tsv,
+    "parquet": _write_parquet,
+    "feather": _write_feather,
+    "ntriples": _write_ntriples,
+}
+
+
+def _resolve_format(path: PathLike, format: Optional[str]) -> str:
+    if format is None:
+        suffix = os.path.splitext(os.fspath(path))[1].lower()
+        if suffix not in _SUFFIXES:
+            raise ValueError(
+                f"Cannot infer format from {path}, please provide one of {FORMATS}"
+            )
+        return _SUFFIXES[suffix]
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format {format}, choose one of {FORMATS}")
+    return format
+
+
+def _counted(
+    chunks: Iterator["pd.DataFrame"],
+    counter: List[int],
+    progress: Optional[ProgressCallback],
+):
+    for chunk in chunks:
+        yield chunk
+        counter[0] += len(chunk)
+        if progress is not None:
+            progress(counter[0])
+
+
+def _write(
+    path: PathLike,
+    fmt: str,
+    chunks: Iterator["pd.DataFrame"],
+    shape: Tuple[int, int],
+    width: int = 0,
+    progress: Optional[ProgressCallback] = None,
+    **options,
+) -> WriteStats:
+    start = time.perf_counter()
+    rows = [0]
+    chunks = _counted(chunks, rows, progress)
+    to_stdout = os.fspath(path) == STDOUT
+    if fmt == "npy":
+        if to_stdout:
+            raise ValueError("npy files cannot be written to stdout")
+        _write_npy(path, chunks, shape=shape, width=width)
+        written = os.path.getsize(path)
+    else:
+        with (
+            contextlib.nullcontext(sys.stdout.buffer)
+            if to_stdout
+            else open(path, "wb", buffering=2**20)
+        ) as raw:
+            out = _CountingFile(raw)
+            _STREAM_WRITERS[fmt](out, chunks, **options)
+            out.flush()
+            written = out.count
+    stats = WriteStats(
+        path="<stdout>" if to_stdout else os.fspath(path),
+        format=fmt,
+        rows=rows[0],
+        bytes=written,
+        seconds=time.perf_counter() - start,
+    )
+    logger.info(
+        f"Wrote {stats.rows} rows ({stats.bytes} bytes) to {stats.path} in"
+        f" {stats.seconds:.2f}s ({stats.rows_per_sec:.0f} rows/s)"
+    )
+    return stats
+
+
+def _backend(fmt: str) -> str:
+    if fmt in _ARROW_FORMATS:
+        # skip building Python strings that would only be converted again
+        _import_pyarrow(f"Writing {fmt}")
+        return "pyarrow"
+    return "pandas"
+
+
+def write_dummy_df(
+    path: PathLike,
+    shape: Tuple[int, int],
+    format: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    content_length: int = 3,
+    allowed_chars: str = string.ascii_letters,
+    columns: Optional[List[str]] = None,
+    seed: int = None,
+    workers: int = 1,
+    progress: Optional[ProgressCallback] = None,
+    schema: Optional[Schema] = None,
+    vocabulary_size: Optional[Union[int, Sequence[int]]] = None,
+    vocabulary_distribution: Distribution = "uniform",
+) -> WriteStats:
+    """Generate a dummy DataFrame directly into a file.
+
+    Chunks are written as soon as they are generated, so memory usage does not
+    grow with the size of the output. Parquet and feather require pyarrow.
+    The .npy output is a fixed-width unicode array of shape `shape`.
+
+    Args:
+        path: Output file, "-" writes to stdout
+        shape: Dimensions of the DataFrame
+        format: One of "csv", "tsv", "parquet", "feather" or "npy", inferred from the suffix of `path` by default
+        chunk_size: Number of rows generated and written at once
+        content_length: length of the strings in the cells
+        allowed_chars: string containing the allowed chars
+        columns: columns names
+        seed: seed for reproducibility
+        workers: number of processes generating blocks of rows
+        progress: called with the number of written rows after every chunk
+        schema: typed columns, see [dummy_df][strawman.dummy_df], cannot be written as .npy
+        vocabulary_size: number of distinct strings per column, see [dummy_df][strawman.dummy_df]
+        vocabulary_distribution: distribution of the vocabulary strings
+
+    Returns:
+        written rows, bytes and throughput
+
+    Example:
+
+    ```pycon
+    >>> from strawman.writers import write_dummy_df
+    >>> write_dummy_df("dummy.csv", (1000, 3), seed=1).rows
+    1000
+    ```
+    """
+    fmt = _resolve_format(path, format)
+    if fmt == "ntriples":
+        raise ValueError("Only triples can be written as ntriples")
+    if fmt == "npy" and schema is not None:
+        raise ValueError("Typed columns cannot be written as npy")
+    chunks = iter_dummy_df(
+        shape,
+        chunk_size=chunk_size,
+        content_length=content_length,
+        allowed_chars=allowed_chars,
+        columns=columns,
+        seed=seed,
+        workers=workers,
+        backend=_backend(fmt),
+        schema=schema,
+        vocabulary_size=vocabulary_size,
+        vocabulary_distribution=vocabulary_distribution,
+    )
+    return _write(
+        path, fmt, chunks, shape=shape, width=content_length, progress=progress
+    )
+
+
+def write_dummy_triples(
+    path: PathLike,
+    length: int,
+    format: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    base_iri: str = DEFAULT_BASE_IRI,
+    progress: Optional[ProgressCallback] = None,
+    **kwargs,
+) -> WriteStats:
+    """Generate dummy triples directly into a file.
+
+    Chunks are written as soon as they are generated. Apart from the
+    packed keys needed to keep rows unique, memory usage does not grow with
+    the size of the output. Parquet and feather require pyarrow. The .npy
+    output is a fixed-width unicode array of shape `(length, 3)`. N-Triples
+    prefix all labels with `base_iri`, attribute values are written as literals.
+
+    Args:
+        path: Output file, "-" writes to stdout
+        length: Number of triples
+        format: One of "csv", "tsv", "parquet", "feather", "npy" or "ntriples", inferred from the suffix of `path` by default
+        chunk_size: Number of rows generated and written at once
+        base_iri: Namespace of the IRIs in N-Triples output
+        progress: called with the number of written rows after every chunk
+        kwargs: passed on to [iter_dummy_triples][strawman.iter_dummy_triples], the backend is chosen by the format
+
+    Returns:
+        written rows, bytes and throughput
+
+    Example:
+
+    ```pycon
+    >>> from strawman.writers import write_dummy_triples
+    >>> write_dummy_triples("triples.parquet", 1000, seed=1).rows
+    1000
+    ```
+    """
+    fmt = _resolve_format(path, format)
+    if kwargs.get("output") == "ids":
+        raise ValueError("Only DataFrame outputs can be written to files")
+    kwargs["backend"] = _backend(fmt)
+    labels, chunks = _triple_frames(length=length, chunk_size=chunk_size, **kwargs)
+    options: Dict[str, Any] = {}
+    if fmt == "npy":
+        options["width"] = labels.width
+    elif fmt == "ntriples":
+        options["base_iri"] = base_iri
+        options["literal_tails"] = labels.num_tail is not None
+    return _write(path, fmt, chunks, shape=(length, 3), progress=progress, **options)
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strawman import dummy_aligned_triples, dummy_triples, iter_dummy_aligned_triples
+from strawman.sampling import triple_keys
+
+
+def _check_graph(triples, num_entities, num_rel):
+    heads, rels, tails = triples.T
+    keys = triple_keys(heads, rels, tails, num_entities, num_rel, num_entities)
+    assert len(np.unique(keys)) == len(triples)
+    assert not (heads == tails).any()
+    assert len(np.union1d(heads, tails)) == num_entities
+    assert len(np.unique(rels)) == num_rel
+
+
+@pytest.mark.parametrize("strategy", ["auto", "exact"])
+def test_aligned_triples(strategy):
+    length, num_entities, num_rel = 3000, 400, 10
+    left, right, links = dummy_aligned_triples(
+        length,
+        num_entities=num_entities,
+        num_rel=num_rel,
+        overlap=0.4,
+        seed=3,
+        strategy=strategy,
+        output="ids",
+    )
+    for graph in (left, right):
+        assert graph.triples.shape == (length, 3)
+        _check_graph(graph.triples, num_entities, num_rel)
+    assert links.shape == (160, 2)
+    assert len(np.unique(links[:, 0])) == len(np.unique(links[:, 1])) == 160
+
+    # without noise all left triples among aligned entities are in the right graph
+    entity_map = np.full(num_entities, -1)
+    entity_map[links[:, 0]] = links[:, 1]
+    heads, tails = entity_map[left.triples[:, 0]], entity_map[left.triples[:, 2]]
+    aligned = (heads >= 0) & (tails >= 0)
+    assert aligned.any()
+    pairs = set(zip(heads[aligned], tails[aligned]))
+    assert pairs <= set(zip(right.triples[:, 0], right.triples[:, 2]))
+
+
+def test_aligned_triples_left_graph():
+    pair = dummy_aligned_triples(200, seed=5, entity_prefixes=("e", "f"))
+    expected = dummy_triples(200, seed=5, relation_prefix="left_rel")
+    pd.testing.assert_frame_equal(pair.left, expected)
+    assert pair.right["head"].str.startswith("f").all()
+    assert pair.links.columns.tolist() == ["left", "right"]
+    assert pair.links["left"].isin(pair.left["head"]).all()
+
+
+def test_aligned_triples_overlap_extremes():
+    _, right, links = dummy_aligned_triples(500, overlap=0.0, seed=1, output="ids")
+    assert links.shape == (0, 2)
+    left, right, links = dummy_aligned_triples(
+        500, num_entities=100, overlap=1.0, seed=1, output="categorical"
+    )
+    assert len(links) == 100
+    assert (left["head"].cat.categories == links["left"].cat.categories).all()
+
+
+def test_aligned_triples_noise():
+    num_entities = 300
+    kwargs = dict(num_entities=num_entities, overlap=1.0, seed=2, output="ids")
+    clean = dummy_aligned_triples(2000, **kwargs)
+    noisy = dummy_aligned_triples(2000, noise=0.5, relation_heterogeneity=1.0, **kwargs)
+    np.testing.assert_array_equal(clean.left.triples, noisy.left.triples)
+
+    def shared(pair):
+        entity_map = np.empty(num_entities, dtype=np.int64)
+        entity_map[pair.links[:, 0]] = pair.links[:, 1]
+        left = pair.left.triples
+        transferred = set(zip(entity_map[left[:, 0]], entity_map[left[:, 2]]))
+        return len(
+            transferred & set(zip(pair.right.triples[:, 0], pair.right.triples[:, 2]))
+        )
+
+    assert shared(noisy) < 0.7 * shared(clean)
+
+
+@pytest.mark.parametrize("chunk_size", [100, 333, 1000])
+def test_iter_aligned_triples(chunk_size):
+    kwargs = dict(length=700, num_entities=300, overlap=0.7, seed=4)
+    expected = dummy_aligned_triples(**kwargs)
+    chunks = list(iter_dummy_aligned_triples(chunk_size=chunk_size, **kwargs))
+    assert len(chunks) == -(-700 // chunk_size)
+    for name, frame in expected._asdict().items():
+        pd.testing.assert_frame_equal(
+            # links run out before the triples
+            pd.concat(
+                [getattr(chunk, name) for chunk in chunks if len(getattr(chunk, name))]
+            ),
+            frame,
+        )
+
+
+def test_aligned_triples_bad_inputs():
+    with pytest.raises(ValueError):
+        dummy_aligned_triples(100, overlap=1.5)
+    with pytest.raises(ValueError):
+        dummy_aligned_triples(100, noise=-0.1)
+    with pytest.raises(ValueError):
+        dummy_aligned_triples(100, link_columns=["a"])
+    with pytest.raises(ValueError):
+        dummy_aligned_triples(100, output="wrong")
+
+
+@pytest.mark.parametrize("output", ["strings", "categorical"])
+def test_arrow_aligned_triples(output):
+    pytest.importorskip("pyarrow")
+    expected = dummy_aligned_triples(100, seed=1, output=output)
+    tables = dummy_aligned_triples(100, seed=1, output=output, backend="pyarrow")
+    for table, frame in zip(tables, expected):
+        assert (
+            table.to_pandas().astype(str).values.tolist()
+            == frame.astype(str).values.tolist()
+        )
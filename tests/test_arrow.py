@@ -0,0 +1,69 @@
+import sys
+
+import pandas as pd
+import pytest
+
+from strawman import dummy_df, dummy_triples, iter_dummy_df, iter_dummy_triples
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.mark.parametrize("allowed_chars", ["abc", "äöü", ""])
+def test_arrow_df(allowed_chars):
+    kwargs = dict(shape=(50, 3), content_length=0 if not allowed_chars else 4)
+    kwargs["allowed_chars"] = allowed_chars or "a"
+    expected = dummy_df(seed=2, **kwargs)
+    frame = dummy_df(seed=2, dtype_backend="pyarrow", **kwargs)
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in frame.dtypes)
+    assert frame.astype(expected.dtypes.to_dict()).equals(expected)
+
+    table = dummy_df(seed=2, backend="pyarrow", **kwargs)
+    assert table.column_names == ["0", "1", "2"]
+    assert table.to_pandas().values.tolist() == expected.values.tolist()
+
+
+def test_iter_arrow_df():
+    chunks = list(iter_dummy_df((50, 2), chunk_size=20, seed=3, backend="pyarrow"))
+    assert [chunk.num_rows for chunk in chunks] == [20, 20, 10]
+    assert pa.concat_tables(chunks).equals(dummy_df((50, 2), seed=3, backend="pyarrow"))
+    frames = list(iter_dummy_df((50, 2), chunk_size=20, dtype_backend="pyarrow"))
+    assert frames[-1].index.tolist() == list(range(40, 50))
+
+
+@pytest.mark.parametrize("relation_triples", [True, False])
+@pytest.mark.parametrize("output", ["strings", "categorical"])
+def test_arrow_triples(relation_triples, output):
+    kwargs = dict(length=60, relation_triples=relation_triples, seed=4)
+    expected = dummy_triples(**kwargs)
+    frame = dummy_triples(output=output, dtype_backend="pyarrow", **kwargs)
+    assert frame.astype(expected.dtypes.to_dict()).equals(expected)
+
+    table = dummy_triples(output=output, backend="pyarrow", **kwargs)
+    if output == "categorical":
+        assert pa.types.is_dictionary(table.schema.field("head").type)
+        if relation_triples:
+            assert (
+                table["head"]
+                .chunk(0)
+                .dictionary.equals(table["tail"].chunk(0).dictionary)
+            )
+    chunks = iter_dummy_triples(
+        chunk_size=25, output=output, backend="pyarrow", **kwargs
+    )
+    assert pa.concat_tables(chunks).equals(table)
+
+
+def test_arrow_bad_inputs():
+    with pytest.raises(ValueError):
+        dummy_df((10, 2), backend="xyz")
+    with pytest.raises(ValueError):
+        dummy_df((10, 2), dtype_backend="numpy")
+    with pytest.raises(ValueError):
+        dummy_triples(10, output="ids", backend="pyarrow")
+
+
+def test_without_pyarrow(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    assert len(dummy_df((10, 2))) == 10
+    with pytest.raises(ImportError, match="strawman\\[arrow\\]"):
+        dummy_df((10, 2), backend="pyarrow")
@@ -0,0 +1,127 @@
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strawman import (
+    dummy_aligned_triples,
+    dummy_df,
+    dummy_duplicates,
+    dummy_triples,
+    iter_dummy_df,
+    iter_dummy_triples,
+)
+from strawman.schema import Booleans, Categoricals, Datetimes, Floats, Integers
+
+SCHEMA = {
+    "id": Integers(0, 100, null_fraction=0.3),
+    "price": Floats(null_fraction=0.3),
+    "created": Datetimes(null_fraction=0.3),
+    "flag": Booleans(null_fraction=0.3),
+    "country": Categoricals(("DE", "FR", "US"), null_fraction=0.3),
+}
+
+
+def test_import_without_pandas():
+    code = (
+        "import sys, strawman\n"
+        "assert 'pandas' not in sys.modules\n"
+        "strawman.dummy_df((10, 2), backend='structured')\n"
+        "strawman.dummy_triples(10, backend='numpy')\n"
+        "assert 'pandas' not in sys.modules\n"
+        "strawman.dummy_df((10, 2))\n"
+        "assert 'pandas' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_numpy_df():
+    expected = dummy_df((50, 3), columns=["a", "b", "c"], seed=1)
+    columns = dummy_df((50, 3), columns=["a", "b", "c"], seed=1, backend="numpy")
+    assert list(columns) == ["a", "b", "c"]
+    for name, values in columns.items():
+        assert values.tolist() == expected[name].tolist()
+
+    records = dummy_df((50, 3), seed=1, backend="structured")
+    assert records.dtype.names == ("0", "1", "2")
+    assert records.tolist() == [tuple(row) for row in expected.values.tolist()]
+
+    chunks = iter_dummy_df((50, 3), chunk_size=20, seed=1, backend="structured")
+    np.testing.assert_array_equal(np.concatenate(list(chunks)), records)
+
+
+def test_numpy_schema():
+    expected = dummy_df((40, len(SCHEMA)), schema=SCHEMA, seed=2)
+    columns = dummy_df((40, len(SCHEMA)), schema=SCHEMA, seed=2, backend="numpy")
+    for name in ("id", "flag", "country"):
+        assert np.ma.isMaskedArray(columns[name])
+        np.testing.assert_array_equal(
+            np.ma.getmaskarray(columns[name]), expected[name].isna()
+        )
+    np.testing.assert_array_equal(columns["price"], expected["price"])
+    assert columns["country"].compressed().tolist() == (
+        expected["country"].dropna().tolist()
+    )
+
+    records = dummy_df((40, len(SCHEMA)), schema=SCHEMA, seed=2, backend="structured")
+    assert records.dtype.names == tuple(SCHEMA)
+    assert records.mask["id"].tolist() == expected["id"].isna().tolist()
+
+
+def test_numpy_triples():
+    expected = dummy_triples(60, seed=3)
+    columns = dummy_triples(60, seed=3, backend="numpy")
+    for name, values in columns.items():
+        assert values.tolist() == expected[name].tolist()
+    chunks = iter_dummy_triples(60, chunk_size=25, seed=3, backend="structured")
+    records = np.concatenate(list(chunks))
+    assert records.tolist() == [tuple(row) for row in expected.values.tolist()]
+    ids = dummy_triples(60, seed=3, output="ids", backend="numpy")
+    assert ids.triples.shape == (60, 3)
+    with pytest.raises(ValueError):
+        dummy_triples(60, output="categorical", backend="numpy")
+
+
+def test_numpy_aligned_triples_and_duplicates():
+    expected = dummy_aligned_triples(100, seed=4)
+    pair = dummy_aligned_triples(100, seed=4, backend="numpy")
+    assert pair.links["right"].tolist() == expected.links["right"].tolist()
+    assert pair.right["tail"].tolist() == expected.right["tail"].tolist()
+
+    kwargs = dict(shape=(30, 2), null_probability=0.5, seed=5)
+    expected = dummy_duplicates(**kwargs)
+    records = dummy_duplicates(backend="structured", **kwargs)
+    assert records.dtype.names == ("0", "1", "cluster")
+    assert records.mask["1"].tolist() == expected[1].isna().tolist()
+    assert records["cluster"].tolist() == expected["cluster"].tolist()
+
+
+def test_polars():
+    pl = pytest.importorskip("polars")
+    expected = dummy_df((30, 2), seed=6)
+    frame = dummy_df((30, 2), seed=6, backend="polars")
+    assert isinstance(frame, pl.DataFrame)
+    assert frame.rows() == [tuple(row) for row in expected.values.tolist()]
+
+    expected = dummy_df((30, len(SCHEMA)), schema=SCHEMA, seed=6)
+    frame = dummy_df((30, len(SCHEMA)), schema=SCHEMA, seed=6, backend="polars")
+    assert frame.columns == list(SCHEMA)
+    assert frame["country"].dtype == pl.Categorical
+    assert frame["id"].null_count() == expected["id"].isna().sum()
+    assert frame["country"].to_list() == [
+        None if pd.isna(value) else value for value in expected["country"]
+    ]
+
+    triples = dummy_triples(30, seed=6, output="categorical", backend="polars")
+    assert triples.rows() == [
+        tuple(row) for row in dummy_triples(30, seed=6).values.tolist()
+    ]
+
+
+def test_without_polars(monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setitem(sys.modules, "polars", None)
+    with pytest.raises(ImportError, match="strawman\\[polars\\]"):
+        dummy_df((10, 2), backend="polars")
@@ -0,0 +1,39 @@
+import pytest
+
+from strawman.benchmarks import (
+    BENCHMARKS,
+    compare,
+    load_results,
+    main,
+    run_benchmarks,
+    save_results,
+)
+
+
+def test_run_benchmarks(tmp_path):
+    results = run_benchmarks(sizes=[10, 20], repeat=1)
+    assert len(results) == 2 * len(BENCHMARKS)
+    assert all(result.seconds > 0 and result.rows_per_sec > 0 for result in results)
+
+    path = tmp_path / "bench.json"
+    save_results(results, path)
+    assert load_results(path) == results
+    assert compare(results, results) == []
+
+    slower = [result._replace(seconds=result.seconds * 2) for result in results]
+    assert len(compare(slower, results, threshold=0.5)) == len(results)
+    assert compare(slower, results, threshold=1.5) == []
+
+
+def test_main(tmp_path):
+    path = str(tmp_path / "bench.json")
+    args = ["--sizes", "10", "--benchmarks", "dummy_df", "--repeat", "1"]
+    assert main([*args, "--output", path]) == 0
+    baseline = load_results(path)
+    save_results([r._replace(seconds=r.seconds / 100) for r in baseline], path)
+    assert main([*args, "--baseline", path, "--threshold", "0.1"]) == 1
+
+
+def test_unknown_benchmark():
+    with pytest.raises(ValueError):
+        run_benchmarks(names=["nope"])
@@ -0,0 +1,111 @@
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from strawman import dummy_df, dummy_triples
+from strawman.cache import DatasetCache, cached
+from strawman.sampling import Zipf
+from strawman.schema import Floats, Integers, Strings
+from strawman.stats import GenerationStats
+
+pytest.importorskip("pyarrow")
+
+
+def _cached_triples(directory):
+    return DatasetCache(directory)(dummy_triples, 200, seed=3)
+
+
+def test_import_without_pandas():
+    code = (
+        "import sys, strawman.cache\n"
+        "strawman.cache.DatasetCache.key(len, {'shape': (2, 3), 'seed': 1})\n"
+        "assert 'pandas' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_typed_key():
+    # NamedTuples keep their type, equal fields of other types get other keys
+    keys = {
+        DatasetCache.key(dummy_triples, {"head_distribution": value, "seed": 1})
+        for value in [Zipf(1.5), (1.5,), [1.5], Floats(1.5), Strings(1.5)]
+    }
+    assert len(keys) == 4
+    schema = {"a": Integers(0, 5)}
+    assert DatasetCache.key(dummy_df, {"schema": schema}) != DatasetCache.key(
+        dummy_df, {"schema": {"a": Floats(0, 5)}}
+    )
+
+
+def test_cache_hit(tmp_path):
+    cache = DatasetCache(tmp_path)
+    for kwargs in [{}, {"output": "categorical"}, {"dtype_backend": "pyarrow"}]:
+        first = cache(dummy_triples, 100, seed=1, **kwargs)
+        assert first.equals(cache(dummy_triples, 100, seed=1, **kwargs))
+    table = cache(dummy_df, (10, 2), seed=1, backend="pyarrow")
+    assert table.equals(cache(dummy_df, (10, 2), seed=1, backend="pyarrow"))
+    assert len(cache.entries()) == 4
+    # workers do not change the result and share the entry
+    cache(dummy_df, (10, 2), seed=1, backend="pyarrow", workers=2)
+    assert len(cache.entries()) == 4
+
+
+def test_not_cached(tmp_path):
+    cache = DatasetCache(tmp_path)
+    cache(dummy_df, (10, 2))
+    cache(dummy_triples, 10, seed=1, output="ids")
+    assert cache.entries() == []
+
+
+def test_stats_not_cached(tmp_path):
+    cache = DatasetCache(tmp_path)
+    cache(dummy_triples, 100, seed=1)
+    stats = GenerationStats()
+    df = cache(dummy_triples, 100, seed=1, stats=stats)
+    assert df.equals(dummy_triples(100, seed=1))
+    assert stats.counters["accepted"] == 100
+    assert len(cache.entries()) == 1
+    # stats do not change the result
+    assert DatasetCache.key(dummy_triples, {"seed": 1, "stats": stats}) == (
+        DatasetCache.key(dummy_triples, {"seed": 1})
+    )
+
+
+def test_lru_eviction(tmp_path):
+    cache = DatasetCache(tmp_path)
+    for seed in range(3):
+        cache(dummy_df, (100, 2), seed=seed)
+        time.sleep(0.01)
+    oldest = cache.entries()[0][0]
+    # reading an entry makes it the most recently used
+    cache(dummy_df, (100, 2), seed=0)
+    assert cache.entries()[-1][0] == oldest
+    sizes = [size for _, size, _ in cache.entries()]
+    cache.evict(sum(sizes[1:]))
+    assert oldest in [key for key, _, _ in cache.entries()]
+    assert len(cache.entries()) == 2
+    cache.clear()
+    assert cache.size() == 0
+    # the lock files of evicted entries are removed as well
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".lock")] == [
+        ".lock"
+    ]
+
+
+def test_concurrent_access(tmp_path):
+    expected = dummy_triples(200, seed=3)
+    with ProcessPoolExecutor(2) as pool:
+        results = list(pool.map(_cached_triples, [tmp_path] * 4))
+    assert all(result.equals(expected) for result in results)
+    assert len(DatasetCache(tmp_path).entries()) == 1
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_cached(tmp_path):
+    cached_dummy_df = cached(dummy_df, DatasetCache(tmp_path))
+    assert cached_dummy_df((10, 2), seed=2).equals(dummy_df((10, 2), seed=2))
+    assert cached_dummy_df.__name__ == "dummy_df"
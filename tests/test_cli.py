@@ -0,0 +1,49 @@
+import io
+
+import pandas as pd
+import pytest
+
+from strawman import dummy_df, dummy_triples
+from strawman.cli import ProgressReporter, main
+
+
+def test_df_to_file(tmp_path):
+    path = tmp_path / "dummy.tsv"
+    assert main(["df", "50", "3", "--seed", "1", "-o", str(path), "-q"]) == 0
+    written = pd.read_csv(path, sep="\t", dtype=str, keep_default_na=False)
+    assert (written.to_numpy() == dummy_df((50, 3), seed=1).to_numpy()).all()
+
+
+def test_triples_to_stdout(capsysbinary):
+    main(["triples", "20", "--seed", "1", "--format", "ntriples", "-q"])
+    lines = capsysbinary.readouterr().out.decode().splitlines()
+    expected = dummy_triples(20, seed=1)
+    assert len(lines) == 20
+    assert lines[0] == (
+        f"<http://example.org/{expected['head'][0]}>"
+        f" <http://example.org/{expected['relation'][0]}>"
+        f" <http://example.org/{expected['tail'][0]}> ."
+    )
+
+
+def test_attribute_triples_ntriples(capsysbinary):
+    main(["triples", "20", "--attributes", "--format", "ntriples", "-q"])
+    lines = capsysbinary.readouterr().out.decode().splitlines()
+    assert all(line.endswith('" .') for line in lines)
+
+
+def test_bad_arguments(tmp_path):
+    with pytest.raises(SystemExit):
+        main(["df", "10", "3", "-o", str(tmp_path / "dummy.xyz")])
+    with pytest.raises(SystemExit):
+        main(["df", "10", "3", "--format", "ntriples"])
+
+
+def test_progress_reporter():
+    stream = io.StringIO()
+    reporter = ProgressReporter(100, stream=stream, interval=0)
+    reporter(50)
+    reporter(100)
+    output = stream.getvalue()
+    assert "50/100 rows (50%)" in output
+    assert output.endswith("ETA 0s\n")
@@ -1,6 +1,19 @@
+import numpy as np
+import pandas as pd
 import pytest
 
-from strawman import dummy_df, dummy_triples
+from strawman import (
+    LazyDummyDf,
+    corrupt_triples,
+    dummy_df,
+    dummy_df_slice,
+    dummy_triples,
+    extend_triples,
+    iter_corrupted_triples,
+    iter_dummy_df,
+    iter_dummy_triples,
+    seed,
+)
 from strawman.dummy_pandas import TRIPLES_COL
 
 
@@ -12,6 +25,14 @@ def test_dummy_df():
     assert dummy_df(shape, seed=seed).equals(dummy_df(shape, seed=seed))
 
 
+def test_global_seed():
+    with seed(4):
+        first = dummy_df((10, 3)), dummy_triples(10)
+    with seed(4):
+        assert dummy_df((10, 3)).equals(first[0])
+        assert dummy_triples(10).equals(first[1])
+
+
 def test_dummy_df_bad_inputs():
     with pytest.raises(ValueError):
         dummy_df((10, 3), columns=["a", "b", "c", "d"])
@@ -74,6 +95,13 @@ def test_dummy_triples(length, num_entities, num_rel):
     assert set(trips[columns[0]]).intersection(trips[columns[2]]) == set()
 
 
+def test_dense_triples():
+    trips = dummy_triples(length=60, num_entities=5, num_rel=3, seed=1)
+    assert not trips.duplicated().any()
+    assert len(trips) == 60
+    assert not trips["head"].eq(trips["tail"]).any()
+
+
 def test_predefined():
     entity_ids = ["e1", "e2", "e3", "e4"]
     relation_ids = ["rel1", "rel2", "rel3"]
@@ -83,6 +111,34 @@ def test_predefined():
     assert set(trips[columns[1]]) == set(relation_ids)
 
 
+@pytest.mark.parametrize("relation_triples", [True, False])
+def test_triple_outputs(relation_triples):
+    kwargs = dict(length=50, relation_triples=relation_triples, seed=4)
+    expected = dummy_triples(**kwargs)
+
+    categorical = dummy_triples(output="categorical", **kwargs)
+    assert (categorical.dtypes == "category").all()
+    assert categorical.astype(expected.dtypes.to_dict()).equals(expected)
+    if relation_triples:
+        assert categorical["head"].dtype == categorical["tail"].dtype
+
+    ids = dummy_triples(output="ids", **kwargs)
+    assert ids.triples.shape == (50, 3)
+    assert ids.triples.dtype == np.int32
+    tail_values = ids.entity_ids if relation_triples else ids.attribute_values
+    assert (ids.attribute_values is None) == relation_triples
+    np.testing.assert_array_equal(ids.entity_ids[ids.triples[:, 0]], expected["head"])
+    np.testing.assert_array_equal(
+        ids.relation_ids[ids.triples[:, 1]], expected["relation"]
+    )
+    np.testing.assert_array_equal(tail_values[ids.triples[:, 2]], expected["tail"])
+
+    chunks = list(iter_dummy_triples(chunk_size=20, output="ids", **kwargs))
+    np.testing.assert_array_equal(
+        np.concatenate([chunk.triples for chunk in chunks]), ids.triples
+    )
+
+
 def test_dummy_triples_bad_inputs():
     with pytest.raises(ValueError):
         dummy_triples(length=1, num_entities=100, num_rel=2)
@@ -94,3 +150,181 @@ def test_dummy_triples_bad_inputs():
         dummy_triples(length=-10, num_entities=1, num_rel=2)
     with pytest.raises(ValueError):
         dummy_triples(length=10, columns=["too", "many", "values", "for", "triples"])
+    with pytest.raises(ValueError):
+        dummy_triples(length=10, output="xyz")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1000])
+def test_iter_dummy_df(chunk_size):
+    shape = (150, 3)
+    chunks = list(iter_dummy_df(shape, chunk_size=chunk_size, seed=3))
+    assert all(len(chunk) <= chunk_size for chunk in chunks)
+    assert pd.concat(chunks).equals(dummy_df(shape, seed=3))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1000])
+@pytest.mark.parametrize("relation_triples", [True, False])
+def test_iter_dummy_triples(chunk_size, relation_triples):
+    kwargs = dict(length=150, relation_triples=relation_triples, seed=3)
+    chunks = list(iter_dummy_triples(chunk_size=chunk_size, **kwargs))
+    assert all(len(chunk) <= chunk_size for chunk in chunks)
+    trips = pd.concat(chunks)
+    assert trips.equals(dummy_triples(**kwargs))
+    assert not trips.duplicated().any()
+
+
+def test_workers(monkeypatch):
+    monkeypatch.setattr("strawman.dummy_pandas.DF_BLOCK_ROWS", 16)
+    monkeypatch.setattr("strawman.sampling.TRIPLE_BLOCK_ROWS", 16)
+    assert dummy_df((100, 2), seed=5, workers=3).equals(dummy_df((100, 2), seed=5))
+    assert dummy_triples(100, seed=5, workers=3).equals(dummy_triples(100, seed=5))
+
+
+@pytest.mark.parametrize(
+    "start,stop", [(0, 100), (0, 0), (15, 17), (31, 77), (99, 100)]
+)
+def test_dummy_df_slice(monkeypatch, start, stop):
+    monkeypatch.setattr("strawman.dummy_pandas.DF_BLOCK_ROWS", 16)
+    expected = dummy_df((100, 3), seed=6).iloc[start:stop]
+    assert dummy_df_slice((100, 3), start, stop, seed=6).equals(expected)
+
+
+def test_lazy_dummy_df(monkeypatch):
+    monkeypatch.setattr("strawman.dummy_pandas.DF_BLOCK_ROWS", 16)
+    expected = dummy_df((50, 2), seed=6, columns=["a", "b"])
+    lazy = LazyDummyDf((50, 2), seed=6, columns=["a", "b"])
+    assert len(lazy) == 50
+    for key in [slice(None), slice(10, 40, 3), slice(-5, None), slice(40, 3, -7)]:
+        assert lazy[key].equals(expected.iloc[key])
+    assert lazy[-1].equals(expected.iloc[-1])
+    with pytest.raises(IndexError):
+        lazy[50]
+    with pytest.raises(ValueError):
+        dummy_df_slice((50, 2), 10, 51, seed=6)
+
+
+@pytest.mark.parametrize("distribution", ["uniform", "zipf", [1, 0, 5]])
+def test_vocabulary(distribution):
+    df = dummy_df(
+        (300, 3), vocabulary_size=3, vocabulary_distribution=distribution, seed=7
+    )
+    assert (df.dtypes == "category").all()
+    assert (df.nunique() <= 3).all()
+    if not isinstance(distribution, str):
+        assert df.apply(lambda column: column.value_counts().iloc[-1]).eq(0).all()
+    chunks = iter_dummy_df(
+        (300, 3),
+        chunk_size=70,
+        vocabulary_size=3,
+        vocabulary_distribution=distribution,
+        seed=7,
+    )
+    assert pd.concat(list(chunks)).equals(df)
+
+
+def test_vocabulary_per_column():
+    df = dummy_df((500, 2), vocabulary_size=[1, 2000], columns=["a", "b"], seed=7)
+    assert list(df.columns) == ["a", "b"]
+    assert df["a"].nunique() == 1
+    assert len(df["b"].cat.categories) == 2000
+    counts = dummy_df(
+        (5000, 1), vocabulary_size=100, vocabulary_distribution="zipf", seed=7
+    )[0].value_counts()
+    assert counts.iloc[0] > 10 * counts.iloc[-1]
+    df = dummy_df((10, 2), vocabulary_size=np.array([3, 4]), seed=7)
+    assert [len(df[column].cat.categories) for column in df] == [3, 4]
+    assert (dummy_df((10, 2), vocabulary_size=np.int64(3)).nunique() <= 3).all()
+    with pytest.raises(ValueError):
+        dummy_df((10, 2), vocabulary_size=[1, 2, 3])
+    with pytest.raises(ValueError):
+        dummy_df((10, 1), vocabulary_size=10**6)
+    with pytest.raises(ValueError):
+        dummy_df((10, 1), vocabulary_size=5, vocabulary_distribution="pareto")
+
+
+@pytest.mark.parametrize("output", ["strings", "categorical", "ids"])
+def test_extend_triples(output):
+    existing = dummy_triples(500, num_entities=50, num_rel=4, seed=1, output=output)
+    new = extend_triples(
+        existing, 300, num_new_entities=5, num_new_rel=2, seed=2, output=output
+    )
+    if output == "ids":
+        assert len(new.entity_ids) == 55 and len(new.relation_ids) == 6
+        new = pd.DataFrame(new.triples, columns=TRIPLES_COL).apply(
+            lambda col: (
+                new.relation_ids if col.name == "relation" else new.entity_ids
+            )[col]
+        )
+        existing = dummy_triples(500, num_entities=50, num_rel=4, seed=1)
+    else:
+        assert new.index.tolist() == list(range(500, 800))
+    new = new.astype(str)
+    combined = pd.concat([existing.astype(str), new])
+    assert not combined.duplicated().any()
+    assert not (new["head"] == new["tail"]).any()
+    assert {f"e{i}" for i in range(50, 55)} <= set(new["head"]) | set(new["tail"])
+    assert {"rel4", "rel5"} <= set(new["relation"])
+
+
+@pytest.mark.parametrize("output", ["strings", "ids"])
+def test_extend_triples_existing_only(output):
+    existing = dummy_triples(50, seed=1)
+    new = extend_triples(existing, 10, seed=3, output=output)
+    if output == "ids":
+        assert len(new.triples) == 10
+        new = pd.DataFrame(new.triples, columns=TRIPLES_COL).apply(
+            lambda col: (
+                new.relation_ids if col.name == "relation" else new.entity_ids
+            )[col]
+        )
+    combined = pd.concat([existing, new.astype(str)])
+    assert not combined.duplicated().any()
+    assert set(new["head"]) | set(new["tail"]) <= set(existing["head"]) | set(
+        existing["tail"]
+    )
+
+
+@pytest.mark.parametrize("output", ["strings", "ids"])
+def test_extend_triples_dense(output):
+    # all remaining triples are sampled without replacement
+    existing = dummy_triples(50, num_entities=5, num_rel=3, seed=1)
+    new = extend_triples(existing, 30, num_new_rel=1, seed=2, output=output)
+    if output == "ids":
+        new = pd.DataFrame(new.triples, columns=TRIPLES_COL).apply(
+            lambda col: (
+                new.relation_ids if col.name == "relation" else new.entity_ids
+            )[col]
+        )
+    combined = pd.concat([existing, new.astype(str)])
+    assert len(combined) == 5 * 4 * 4
+    assert not combined.duplicated().any()
+    assert not (combined["head"] == combined["tail"]).any()
+
+
+def test_extend_triples_labels():
+    existing = pd.DataFrame({"s": ["e2", "a"], "p": ["p", "p"], "o": ["a", "e2"]})
+    new = extend_triples(existing, 4, num_new_entities=2, seed=3)
+    assert new.columns.tolist() == ["s", "p", "o"]
+    # numbering starts after the existing entities and skips the taken e2
+    assert set(new["s"]) | set(new["o"]) == {"a", "e2", "e3", "e4"}
+    with pytest.raises(ValueError):
+        extend_triples(existing, 1, num_new_entities=2)
+    with pytest.raises(ValueError):
+        extend_triples(existing, 10)
+    with pytest.raises(ValueError):
+        extend_triples(existing.iloc[:, :2], 1)
+
+
+@pytest.mark.parametrize("chunk_size", [7, 1000])
+def test_corrupt_triples(chunk_size):
+    df = dummy_triples(300, seed=1, output="categorical")
+    negatives = corrupt_triples(df, num_negatives=2, seed=2, output="categorical")
+    assert len(negatives) == 600
+    assert negatives["head"].dtype == df["head"].dtype
+    assert negatives.merge(df).empty
+    chunks = list(
+        iter_corrupted_triples(df, chunk_size=chunk_size, num_negatives=2, seed=2)
+    )
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks), corrupt_triples(df, num_negatives=2, seed=2)
+    )
@@ -0,0 +1,105 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strawman import dummy_df, dummy_duplicates
+
+
+def _edit_distance(first: str, second: str) -> int:
+    # Damerau-Levenshtein distance (Lowrance-Wagner)
+    infinity = len(first) + len(second)
+    dist = np.full((len(first) + 2, len(second) + 2), infinity)
+    dist[1:, 1] = np.arange(len(first) + 1)
+    dist[1, 1:] = np.arange(len(second) + 1)
+    last_row: Dict[str, int] = {}
+    for i in range(1, len(first) + 1):
+        last_col = 0
+        for j in range(1, len(second) + 1):
+            k, match = last_row.get(second[j - 1], 0), last_col
+            cost = first[i - 1] != second[j - 1]
+            if not cost:
+                last_col = j
+            dist[i + 1, j + 1] = min(
+                dist[i, j] + cost,
+                dist[i + 1, j] + 1,
+                dist[i, j + 1] + 1,
+                dist[k, match] + (i - k - 1) + 1 + (j - match - 1),
+            )
+        last_row[first[i - 1]] = i
+    return dist[-1, -1]
+
+
+@pytest.mark.parametrize("edit_distance", [0, 1, 3])
+@pytest.mark.parametrize("cluster_size", ["uniform", "zipf", [0, 1, 0]])
+def test_dummy_duplicates(edit_distance, cluster_size):
+    df = dummy_duplicates(
+        (300, 3),
+        duplicate_ratio=0.4,
+        max_cluster_size=4,
+        cluster_size=cluster_size,
+        edit_distance=edit_distance,
+        content_length=4,
+        allowed_chars="abcde",
+        seed=1,
+    )
+    assert df.shape == (300, 4)
+    originals = dummy_df((180, 3), content_length=4, allowed_chars="abcde", seed=1)
+    sizes = df["cluster"].value_counts()
+    assert sizes.sum() - len(sizes) == 120
+    assert sizes.max() <= 4
+    if cluster_size == [0, 1, 0]:
+        # all but the last cluster have 3 records
+        assert (sizes[sizes > 1] == 3).sum() >= len(sizes[sizes > 1]) - 1
+    for cluster, records in df.groupby("cluster"):
+        original = originals.loc[cluster].tolist()
+        rows = records.drop(columns="cluster").values.tolist()
+        assert original in rows
+        for row in rows:
+            distance = sum(map(_edit_distance, row, original))
+            assert distance <= edit_distance
+
+
+def test_duplicates_swaps_and_nulls():
+    kwargs = dict(shape=(200, 3), duplicate_ratio=0.5, edit_distance=0, seed=2)
+    originals = dummy_df((100, 3), seed=2)
+    swapped = dummy_duplicates(swap_probability=1.0, **kwargs)
+    for _, row in swapped.iterrows():
+        original = originals.loc[row["cluster"]].tolist()
+        values = row.drop("cluster").tolist()
+        assert sorted(values) == sorted(original)
+        assert values == original or sum(map(str.__ne__, values, original)) == 2
+
+    nulls = dummy_duplicates(null_probability=1.0, **kwargs)
+    assert all(dtype == "string" for dtype in nulls.dtypes.drop("cluster"))
+    # every duplicate has exactly one missing value, originals have none
+    assert nulls.drop(columns="cluster").isna().sum(axis=1).sum() == 100
+    assert nulls.drop(columns="cluster").isna().sum(axis=1).max() == 1
+
+
+def test_duplicates_insertions():
+    # empty cells can only get insertions, which use the whole alphabet
+    df = dummy_duplicates(
+        (200, 1), duplicate_ratio=0.5, content_length=0, allowed_chars="ab", seed=1
+    )
+    assert set(df[0]) == {"", "a", "b"}
+
+
+def test_duplicates_seed():
+    kwargs = dict(shape=(500, 2), edit_distance=2, swap_probability=0.2, seed=3)
+    pd.testing.assert_frame_equal(
+        dummy_duplicates(**kwargs), dummy_duplicates(workers=2, **kwargs)
+    )
+
+
+def test_duplicates_bad_inputs():
+    with pytest.raises(ValueError):
+        dummy_duplicates((10, 2), duplicate_ratio=1.2)
+    with pytest.raises(ValueError):
+        dummy_duplicates((10, 2), max_cluster_size=1)
+    with pytest.raises(ValueError):
+        # more clusters than originals
+        dummy_duplicates((10, 2), duplicate_ratio=0.9, max_cluster_size=2)
+    with pytest.raises(ValueError):
+        dummy_duplicates((10, 2), columns=["a", "cluster"])
@@ -0,0 +1,128 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strawman import dummy_triples, iter_dummy_triples
+from strawman.planning import estimate, plan
+from strawman.sampling import Zipf, sample_triple_ids
+from strawman.stats import GenerationStats
+
+
+def test_estimate_uniform():
+    result = estimate(200_000, num_entities=1000, num_rel=2, strategy="rejection")
+    assert result.possible == 1000 * 2 * 999
+    assert result.feasible
+    # coupon collector for the triples after the warm-up
+    expected = result.possible * math.log(
+        (result.possible - 1000) / (result.possible - 200_000)
+    )
+    assert result.attempts == pytest.approx(expected)
+    assert 0 < result.collision_rate < 0.1
+    assert result.output_bytes == 200_000 * 3 * 8
+    assert result.peak_bytes > result.output_bytes
+
+    exact = estimate(200_000, num_entities=1000, num_rel=2, strategy="exact")
+    assert exact.collision_rate == 0
+    assert exact.attempts == 200_000 - 1000
+    ids = estimate(200_000, num_entities=1000, num_rel=2, output="ids")
+    assert ids.output_bytes < result.output_bytes
+
+
+def test_estimate_infeasible():
+    too_many = estimate(10**6, num_entities=1000, num_rel=1)
+    assert not too_many.feasible
+    # needs more than CANDIDATE_FACTOR candidates per triple, so the rest is
+    # sampled without replacement
+    dense = estimate(1_950_000, num_entities=1000, num_rel=2, strategy="rejection")
+    assert dense.feasible
+    assert dense.sampling_bytes > 1000 * 2 * 1000 * 24
+    assert estimate(1_950_000, num_entities=1000, num_rel=2, strategy="exact").feasible
+    with pytest.raises(ValueError, match="output"):
+        estimate(1000, output="wrong")
+
+
+def test_estimate_skewed():
+    kwargs = dict(
+        num_entities=50, num_rel=3, head_distribution="zipf", tail_distribution="zipf"
+    )
+    result = estimate(1500, strategy="rejection", **kwargs)
+    uniform = estimate(1500, num_entities=50, num_rel=3, strategy="rejection")
+    assert result.collision_rate > uniform.collision_rate
+    stats = GenerationStats()
+    sample_triple_ids(1500, seed=1, stats=stats, strategy="rejection", **kwargs)
+    # every candidate of the used blocks was drawn, so only the order is comparable
+    assert result.attempts <= stats.counters["attempts"]
+    assert result.attempts > stats.counters["accepted"]
+
+
+def test_plan():
+    unlimited = plan(50_000, num_entities=1000, num_rel=5)
+    assert not unlimited.streaming
+    assert unlimited.estimate.feasible
+    fits = plan(50_000, num_entities=1000, num_rel=5, memory_budget=2**30)
+    assert fits.chunk_size is None
+    assert fits.peak_bytes <= 2**30
+
+    # streaming only needs the sampling state and one chunk
+    exact = estimate(50_000, num_entities=1000, num_rel=5, strategy="exact")
+    budget = exact.streaming_bytes(2000)
+    streamed = plan(50_000, num_entities=1000, num_rel=5, memory_budget=budget)
+    assert streamed.streaming
+    assert streamed.chunk_size == 2000
+    assert streamed.peak_bytes <= budget
+    assert streamed.estimate.streaming_bytes(streamed.chunk_size) <= budget
+
+    with pytest.raises(ValueError, match="bytes"):
+        plan(50_000, num_entities=1000, num_rel=5, memory_budget=1000)
+    with pytest.raises(ValueError, match="Cannot create"):
+        plan(10**6, num_entities=1000, num_rel=1)
+    # dense skewed triples are sampled without replacement as well
+    skewed = plan(1_000_000, num_entities=1000, num_rel=2, head_distribution="zipf")
+    assert skewed.strategy == "exact"
+    assert skewed.estimate.sampling_bytes >= 1000 * 2 * 1000 * 24
+    sparse = plan(20_000, num_entities=1000, num_rel=2, head_distribution="zipf")
+    assert sparse.strategy == "rejection"
+
+
+def test_generators_accept_plan():
+    kwargs = dict(num_entities=300, num_rel=4, seed=2)
+    planned = plan(20_000, num_entities=300, num_rel=4)
+    expected = dummy_triples(20_000, strategy=planned.strategy, **kwargs)
+    pd.testing.assert_frame_equal(
+        dummy_triples(20_000, plan=planned, **kwargs), expected
+    )
+
+    exact = estimate(20_000, strategy="exact", num_entities=300, num_rel=4)
+    budget = exact.streaming_bytes(2000)
+    streamed = plan(20_000, num_entities=300, num_rel=4, memory_budget=budget)
+    chunks = list(iter_dummy_triples(20_000, plan=streamed, **kwargs))
+    assert len(chunks[0]) == streamed.chunk_size
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks), dummy_triples(20_000, strategy=streamed.strategy, **kwargs)
+    )
+
+    with pytest.raises(ValueError, match="iter_dummy_triples"):
+        dummy_triples(20_000, plan=streamed, **kwargs)
+    with pytest.raises(ValueError, match="20000"):
+        dummy_triples(10_000, plan=planned, **kwargs)
+    with pytest.raises(ValueError, match="num_entities"):
+        dummy_triples(20_000, plan=planned, num_entities=200, num_rel=4)
+    with pytest.raises(ValueError, match="output"):
+        dummy_triples(20_000, plan=planned, output="ids", **kwargs)
+    with pytest.raises(ValueError, match="head_distribution"):
+        list(
+            iter_dummy_triples(
+                20_000, plan=streamed, head_distribution=Zipf(), **kwargs
+            )
+        )
+
+    weights = np.arange(1, 301)
+    skewed = plan(20_000, num_entities=300, num_rel=4, head_distribution=weights)
+    assert (
+        len(dummy_triples(20_000, plan=skewed, head_distribution=weights, **kwargs))
+        == 20_000
+    )
+    with pytest.raises(ValueError, match="head_distribution"):
+        dummy_triples(20_000, plan=skewed, head_distribution=weights[::-1], **kwargs)
@@ -0,0 +1,112 @@
+import tempfile
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+pytest_plugins = ["pytester"]
+
+TEST_MODULE = """
+import pandas as pd
+import pytest
+from strawman import dummy_df as generate_df
+from strawman import dummy_triples as generate_triples
+
+
+def test_default(strawman_dummy_df, strawman_dummy_triples):
+    assert strawman_dummy_df.shape == (100, 3)
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in strawman_dummy_df.dtypes)
+    expected = generate_triples(100, seed=0, dtype_backend="pyarrow")
+    assert strawman_dummy_triples.equals(expected)
+
+
+@pytest.mark.parametrize(
+    "strawman_dummy_triples", [dict(length=50, seed=2)], indirect=True
+)
+def test_declared(strawman_dummy_triples, strawman_cache):
+    # generated by the controller before the session started
+    assert len(strawman_dummy_triples) == 50
+
+
+@pytest.mark.parametrize(
+    "strawman_dummy_df",
+    [dict(shape=(10, 2), seed=1, dtype_backend="pyarrow")],
+    indirect=True,
+)
+def test_parametrized(strawman_dummy_df, strawman_cache):
+    assert strawman_dummy_df.equals(generate_df((10, 2), seed=1, dtype_backend="pyarrow"))
+    # writes replace the Arrow buffers instead of changing the shared file
+    strawman_dummy_df.iloc[0, 0] = "x"
+    assert strawman_cache(generate_df, (10, 2), seed=1, dtype_backend="pyarrow").iloc[0, 0] != "x"
+
+
+@pytest.mark.parametrize(
+    "strawman_dummy_triples", [dict(length=10, seed=1)], indirect=True
+)
+@pytest.mark.parametrize("run", range(3))
+def test_shared(strawman_dummy_triples, strawman_cache, run):
+    assert len(strawman_dummy_triples) == 10
+    assert len(strawman_cache.entries()) >= 1
+"""
+
+
+# the plugin is loaded through its entry point
+CONFTEST = """
+def pytest_strawman_datasets(config):
+    return [("dummy_triples", dict(length=50, seed=2))]
+"""
+
+
+def test_fixtures(pytester):
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(TEST_MODULE)
+    cache_dir = pytester.path / "cache"
+    result = pytester.runpytest("--strawman-cache-dir", str(cache_dir))
+    result.assert_outcomes(passed=6)
+    assert len(list(cache_dir.glob("*.arrow"))) == 5
+
+
+def test_configure_generates_declared(pytester):
+    pytester.makeconftest(CONFTEST)
+    cache_dir = pytester.path / "cache"
+    # nothing is collected, the controller still generates every dataset
+    result = pytester.runpytest("--strawman-cache-dir", str(cache_dir), "--co")
+    assert result.ret == pytest.ExitCode.NO_TESTS_COLLECTED
+    assert len(list(cache_dir.glob("*.arrow"))) == 3
+
+
+def test_configure_ini(pytester):
+    cache_dir = pytester.path / "cache"
+    pytester.makeini(f"[pytest]\nstrawman_cache_dir = {cache_dir}\n")
+    # listing the plugin explicitly as well does not register it twice
+    pytester.makeconftest('pytest_plugins = ["strawman.pytest_plugin"]\n')
+    result = pytester.runpytest("--co")
+    assert result.ret == pytest.ExitCode.NO_TESTS_COLLECTED
+    assert len(list(cache_dir.glob("*.arrow"))) == 2
+
+
+def test_unused(pytester, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(pytester.mkdir("tmp")))
+    # fixtures of the suite are not shadowed and nothing is generated
+    pytester.makeconftest(
+        "import pytest\n\n\n@pytest.fixture\ndef dummy_df():\n    return 1\n"
+    )
+    pytester.makepyfile("""
+import os
+import tempfile
+
+
+def test_fixture(dummy_df):
+    assert dummy_df == 1
+    assert not os.listdir(tempfile.gettempdir())
+""")
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=1)
+
+    # the temporary directory is created when needed and removed afterwards
+    pytester.makepyfile(
+        "def test_fixture(strawman_dummy_df):\n    assert len(strawman_dummy_df) == 100\n"
+    )
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=1)
+    assert not list((pytester.path / "tmp").iterdir())
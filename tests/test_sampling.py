@@ -0,0 +1,204 @@
+import numpy as np
+import pytest
+
+from strawman.sampling import (
+    Zipf,
+    corrupt_triple_ids,
+    iter_triple_ids,
+    sample_triple_ids,
+    triple_keys,
+)
+from strawman.stats import GenerationStats
+
+
+@pytest.mark.parametrize(
+    "length, num_entities, num_rel, num_tail",
+    [
+        (10, 5, 2, None),
+        (100, 70, 49, None),
+        (1000, 20, 5, None),
+        (100, 70, 49, 30),
+        (60, 5, 3, None),
+        (60, 5, 3, 4),
+        (50, 5, 3, None),
+    ],
+)
+@pytest.mark.parametrize("strategy", ["auto", "exact"])
+def test_sample_triple_ids(length, num_entities, num_rel, num_tail, strategy):
+    heads, rels, tails = sample_triple_ids(
+        length,
+        num_entities,
+        num_rel,
+        num_tail,
+        seed=17,
+        strategy=strategy,
+    )
+    assert len(heads) == len(rels) == len(tails) == length
+    keys = triple_keys(
+        heads, rels, tails, num_entities, num_rel, num_tail or num_entities
+    )
+    assert len(np.unique(keys)) == length
+    assert set(heads) == set(range(num_entities))
+    assert set(rels) == set(range(num_rel))
+    if num_tail is None:
+        assert not (heads == tails).any()
+    else:
+        assert tails.max() < num_tail
+
+
+def test_triple_keys_hash_fallback():
+    num = 3_000_000
+    heads = np.array([1, 2, 1, num - 1])
+    rels = np.array([0, 0, 0, 5])
+    tails = np.array([2, 1, 2, 7])
+    keys = triple_keys(heads, rels, tails, num, num, num)
+    assert keys.dtype == np.int64
+    assert keys[0] == keys[2]
+    assert len(np.unique(keys)) == 3
+
+
+def test_sample_triple_ids_bad_inputs():
+    with pytest.raises(ValueError):
+        sample_triple_ids(61, 5, 3)
+    with pytest.raises(ValueError):
+        sample_triple_ids(10, 5, 3, strategy="wrong")
+
+
+@pytest.mark.parametrize("num_tail", [None, 40])
+def test_skewed_triple_ids(num_tail):
+    length, num_entities, num_rel = 5000, 300, 5
+    heads, rels, tails = sample_triple_ids(
+        length,
+        num_entities,
+        num_rel,
+        num_tail,
+        seed=3,
+        head_distribution="zipf",
+        relation_distribution=[0.7, 0.1, 0.1, 0.05, 0.05],
+        tail_distribution=Zipf(1.5),
+    )
+    keys = triple_keys(
+        heads, rels, tails, num_entities, num_rel, num_tail or num_entities
+    )
+    assert len(np.unique(keys)) == length
+    assert set(heads) == set(range(num_entities))
+    assert set(rels) == set(range(num_rel))
+    if num_tail is None:
+        assert not (heads == tails).any()
+    head_degrees = np.bincount(heads, minlength=num_entities)
+    assert head_degrees[0] > 10 * np.median(head_degrees)
+    assert np.bincount(rels).argmax() == 0
+    assert np.bincount(tails).argmax() == 0
+
+
+def test_skewed_triple_ids_invariance():
+    kwargs = dict(seed=5, head_distribution="zipf", tail_distribution="zipf")
+    expected = sample_triple_ids(3000, 200, 4, **kwargs)
+    blocks = list(iter_triple_ids(3000, 200, 4, workers=2, **kwargs))
+    for column, values in zip(expected, zip(*blocks)):
+        np.testing.assert_array_equal(column, np.concatenate(values))
+
+
+@pytest.mark.parametrize("strategy", ["auto", "exact", "rejection"])
+@pytest.mark.parametrize("num_tail", [None, 4])
+def test_dense_skewed_triple_ids(strategy, num_tail):
+    # nearly all possible triples, rejection falls back to exact sampling
+    num_entities, num_rel = 5, 3
+    possible = num_entities * num_rel * (num_tail or num_entities - 1)
+    kwargs = dict(head_distribution="zipf", tail_distribution=Zipf(2.0))
+    stats = GenerationStats()
+    heads, rels, tails = sample_triple_ids(
+        possible - 1,
+        num_entities,
+        num_rel,
+        num_tail,
+        seed=4,
+        strategy=strategy,
+        stats=stats,
+        **kwargs,
+    )
+    keys = triple_keys(
+        heads, rels, tails, num_entities, num_rel, num_tail or num_entities
+    )
+    assert len(np.unique(keys)) == possible - 1
+    if num_tail is None:
+        assert not (heads == tails).any()
+    assert stats.counters["accepted"] == possible - 1
+    with pytest.raises(ValueError):
+        sample_triple_ids(possible + 1, num_entities, num_rel, num_tail, **kwargs)
+
+
+def test_exact_skewed_triple_ids():
+    heads, rels, tails = sample_triple_ids(
+        5000, 300, 5, seed=3, strategy="exact", head_distribution="zipf"
+    )
+    assert len(np.unique(triple_keys(heads, rels, tails, 300, 5, 300))) == 5000
+    assert not (heads == tails).any()
+    head_degrees = np.bincount(heads, minlength=300)
+    assert head_degrees[0] > 10 * np.median(head_degrees)
+
+
+def test_skewed_triple_ids_bad_inputs():
+    with pytest.raises(ValueError):
+        sample_triple_ids(10, 5, 3, relation_distribution=[1.0, 2.0])
+    with pytest.raises(ValueError):
+        sample_triple_ids(10, 5, 3, tail_distribution=[-1.0, 1.0, 1.0, 1.0, 1.0])
+    with pytest.raises(ValueError):
+        sample_triple_ids(10, 5, 3, head_distribution="pareto")
+
+
+@pytest.mark.parametrize("strategy", ["rejection", "exact"])
+def test_sample_triple_ids_include(strategy):
+    num_entities, num_rel = 100, 5
+    include = sample_triple_ids(900, 60, 3, seed=1)
+    heads, rels, tails = sample_triple_ids(
+        1000, num_entities, num_rel, seed=2, strategy=strategy, include=include
+    )
+    keys = triple_keys(heads, rels, tails, num_entities, num_rel, num_entities)
+    assert len(np.unique(keys)) == 1000
+    assert not (heads == tails).any()
+    assert len(np.union1d(heads, tails)) == num_entities
+    assert len(np.unique(rels)) == num_rel
+    # only the triples covering missing entities and relations displace included ones
+    included = triple_keys(*include, num_entities, num_rel, num_entities)
+    assert np.isin(included, keys).sum() >= 900 - 40
+
+
+@pytest.mark.parametrize("corrupt", ["head", "tail", "both"])
+@pytest.mark.parametrize("num_tail", [None, 15])
+def test_corrupt_triple_ids(corrupt, num_tail):
+    num_entities, num_rel = 20, 3
+    positives = sample_triple_ids(200, num_entities, num_rel, num_tail, seed=1)
+    heads, rels, tails = corrupt_triple_ids(
+        positives,
+        num_entities,
+        num_rel,
+        num_tail,
+        num_negatives=3,
+        corrupt=corrupt,
+        seed=2,
+    )
+    assert len(heads) == 600
+    size = num_tail or num_entities
+    keys = triple_keys(heads, rels, tails, num_entities, num_rel, size)
+    assert not np.isin(keys, triple_keys(*positives, num_entities, num_rel, size)).any()
+    np.testing.assert_array_equal(rels, np.repeat(positives[1], 3))
+    changed_heads = heads != np.repeat(positives[0], 3)
+    changed_tails = tails != np.repeat(positives[2], 3)
+    assert (changed_heads ^ changed_tails).all()
+    if corrupt != "both":
+        assert (changed_heads if corrupt == "head" else changed_tails).all()
+    if num_tail is None:
+        assert not (heads == tails).any()
+
+
+def test_corrupt_triple_ids_bad_inputs():
+    # every corruption of the only relation is a positive
+    heads, tails = np.array([0, 0, 1, 1, 2, 2]), np.array([1, 2, 0, 2, 0, 1])
+    positives = (heads, np.zeros(6, dtype=int), tails)
+    with pytest.raises(ValueError):
+        corrupt_triple_ids(positives, 3, 1)
+    with pytest.raises(ValueError):
+        corrupt_triple_ids(positives, 3, 1, corrupt="relation")
+    with pytest.raises(ValueError):
+        corrupt_triple_ids(positives, 3, 1, num_negatives=0)
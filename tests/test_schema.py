@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strawman import dummy_df, dummy_df_slice, iter_dummy_df
+from strawman.schema import (
+    Booleans,
+    Categoricals,
+    Datetimes,
+    Floats,
+    Integers,
+    Strings,
+)
+
+SCHEMA = {
+    "id": Integers(0, 1000, dtype="int32"),
+    "count": Integers(-5, 5, null_fraction=0.3),
+    "price": Floats(10.0, 2.0, distribution="normal", null_fraction=0.2),
+    "wait": Floats(1.0, 3.0, distribution="exponential"),
+    "created": Datetimes("2020-01-01", "2020-02-01", null_fraction=0.1),
+    "flag": Booleans(0.9),
+    "maybe": Booleans(null_fraction=0.5),
+    "country": Categoricals(("DE", "FR", "US"), weights=(0, 1, 3), null_fraction=0.1),
+    "name": Strings(5, "xyz", null_fraction=0.5),
+}
+
+
+def test_schema_dtypes():
+    df = dummy_df((500, len(SCHEMA)), schema=SCHEMA, seed=1)
+    assert list(df.columns) == list(SCHEMA)
+    assert df["id"].dtype == np.int32
+    assert df["id"].between(0, 999).all()
+    assert df["count"].dtype == "Int64"
+    assert df["price"].dtype == np.float64
+    assert df["wait"].min() >= 1.0
+    assert df["created"].min() >= pd.Timestamp("2020-01-01")
+    assert df["created"].max() < pd.Timestamp("2020-02-01")
+    assert df["flag"].dtype == bool
+    assert df["maybe"].dtype == "boolean"
+    assert list(df["country"].cat.categories) == ["DE", "FR", "US"]
+    assert not (df["country"] == "DE").any()
+    assert df["name"].str.len().max() == 5
+    for column, spec in SCHEMA.items():
+        share = df[column].isna().mean()
+        assert abs(share - spec.null_fraction) < 0.1, column
+
+
+def test_schema_chunks(monkeypatch):
+    monkeypatch.setattr("strawman.dummy_pandas.DF_BLOCK_ROWS", 16)
+    shape = (100, len(SCHEMA))
+    expected = dummy_df(shape, schema=SCHEMA, seed=2)
+    chunks = iter_dummy_df(shape, chunk_size=7, schema=SCHEMA, seed=2)
+    assert pd.concat(list(chunks)).equals(expected)
+    sliced = dummy_df_slice(shape, 20, 50, schema=SCHEMA, seed=2)
+    assert sliced.equals(expected.iloc[20:50])
+    assert dummy_df(shape, schema=SCHEMA, seed=2, workers=2).equals(expected)
+
+
+def test_schema_arrow():
+    pytest.importorskip("pyarrow")
+    shape = (50, len(SCHEMA))
+    table = dummy_df(shape, schema=SCHEMA, seed=3, backend="pyarrow")
+    assert table.column_names == list(SCHEMA)
+    assert table["count"].null_count > 0
+    frame = dummy_df(shape, schema=SCHEMA, seed=3, dtype_backend="pyarrow")
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in frame.dtypes)
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        Integers(5, 5),
+        Floats(distribution="cauchy"),
+        Datetimes("2021-01-01", "2020-01-01"),
+        Booleans(1.5),
+        Categoricals(()),
+        Categoricals(("a", "b"), weights=(1,)),
+        Strings(allowed_chars=""),
+        Floats(null_fraction=2),
+    ],
+)
+def test_schema_bad_inputs(spec):
+    with pytest.raises(ValueError):
+        dummy_df((10, 1), schema={"column": spec})
+
+
+def test_schema_shape_mismatch():
+    with pytest.raises(ValueError):
+        dummy_df((10, 2), schema={"column": Integers()})
+    with pytest.raises(ValueError):
+        dummy_df((10, 1), schema={"column": Integers()}, columns=["a"])
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+from strawman import dummy_df, dummy_triples, iter_dummy_df, iter_dummy_triples
+from strawman.sampling import sample_triple_ids
+from strawman.stats import GenerationStats
+
+
+@pytest.mark.parametrize("strategy", ["rejection", "exact"])
+def test_triple_stats(strategy):
+    stats = GenerationStats()
+    kwargs = dict(length=5000, num_entities=200, num_rel=5, seed=1, strategy=strategy)
+    df = dummy_triples(stats=stats, **kwargs)
+    pd.testing.assert_frame_equal(df, dummy_triples(**kwargs))
+    assert set(stats.phases) == {"labels", "warm_up", "sampling", "frame"}
+    counters = stats.counters
+    assert counters["warm_up"] == 200
+    assert counters["accepted"] == 5000
+    random = counters["accepted"] - counters["warm_up"]
+    if strategy == "exact":
+        assert counters["attempts"] == random
+    else:
+        assert counters["duplicates"] > 0
+        assert counters["self_links"] == 0
+        assert (
+            random + counters["duplicates"] + counters["self_links"]
+            <= counters["attempts"]
+        )
+
+
+def test_skewed_triple_stats():
+    stats = GenerationStats()
+    sample_triple_ids(
+        2000,
+        50,
+        3,
+        seed=2,
+        head_distribution="zipf",
+        tail_distribution="zipf",
+        strategy="rejection",
+        stats=stats,
+    )
+    assert stats.counters["self_links"] > 0
+    assert stats.counters["accepted"] == 2000
+
+
+def test_iter_stats():
+    stats = GenerationStats()
+    chunks = list(iter_dummy_triples(3000, chunk_size=1000, seed=3, stats=stats))
+    assert len(chunks) == 3
+    assert stats.counters["accepted"] == 3000
+
+    stats = GenerationStats()
+    assert len(list(iter_dummy_df((3000, 2), chunk_size=1000, stats=stats))) == 3
+    assert stats.counters == {"rows": 3000}
+    assert set(stats.phases) == {"sampling", "frame"}
+
+
+def test_as_dict():
+    stats = GenerationStats(trace_memory=True)
+    dummy_df((1000, 3), seed=4, stats=stats)
+    result = stats.as_dict()
+    assert set(result) == {
+        "sampling_seconds",
+        "frame_seconds",
+        "rows",
+        "peak_memory_bytes",
+    }
+    assert result["rows"] == 1000
+    # at least the 1000 * 3 cells of 3 chars
+    assert result["peak_memory_bytes"] >= 1000 * 3 * 3 * 4
+    assert "peak_memory_bytes" not in GenerationStats().as_dict()
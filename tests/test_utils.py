@@ -1,7 +1,17 @@
+import threading
+
 import numpy as np
 import pytest
 
-from strawman.utils import random_string_generator, shuffled_overlong, split_seq
+from strawman.utils import (
+    random_string_generator,
+    random_strings,
+    seed,
+    sequence_choice,
+    sequence_choices,
+    shuffled_overlong,
+    split_seq,
+)
 
 INPUT_SEQ = "abcdefghijklmnopqrstuvwxyz"
 INPUT_SEQ2 = list("abcdefghijklmnopqrstuvwxyz")
@@ -29,3 +39,60 @@ def test_overlong(length):
     assert len(res) == length
     if length >= len(mylist):
         assert set(mylist) == set(res)
+
+
+def test_random_strings():
+    res = random_strings((5, 3), 4, INPUT_SEQ, np.random.default_rng(17))
+    assert res.shape == (5, 3)
+    for value in res.ravel():
+        assert len(value) == 4
+        assert set(value).issubset(INPUT_SEQ)
+    assert (
+        random_strings((5, 3), 4, INPUT_SEQ, np.random.default_rng(17)) == res
+    ).all()
+
+
+def test_random_strings_unique():
+    res = random_strings(16, 2, "abcd", np.random.default_rng(17), unique=True)
+    assert len(set(res)) == 16
+    with pytest.raises(ValueError):
+        random_strings(17, 2, "abcd", unique=True)
+    assert random_strings(np.int64(3), 2, "abcd").shape == (3,)
+    assert random_strings(np.array([2, 3]), 2, "abcd").shape == (2, 3)
+
+
+def test_sequence_choices():
+    res = sequence_choices(INPUT_SEQ2, 50, np.random.default_rng(17))
+    assert len(res) == 50
+    assert set(res).issubset(INPUT_SEQ2)
+    res = sequence_choices(np.arange(5), 50, np.random.default_rng(17))
+    assert res.shape == (50,)
+
+
+def test_shuffled_overlong_array():
+    res = shuffled_overlong(np.arange(4), 10, np.random.default_rng(17), as_array=True)
+    assert isinstance(res, np.ndarray)
+    assert set(res[:4]) == set(res[4:8]) == {0, 1, 2, 3}
+
+
+def test_seed():
+    with seed(5):
+        first = [sequence_choice(INPUT_SEQ) for _ in range(10)]
+    with seed(5) as rng:
+        assert isinstance(rng, np.random.Generator)
+        assert [sequence_choice(INPUT_SEQ) for _ in range(10)] == first
+
+
+def test_seed_thread_local():
+    results = []
+
+    def draw():
+        with seed(5):
+            results.append(random_string_generator(20))
+
+    threads = [threading.Thread(target=draw) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results[0] == results[1]
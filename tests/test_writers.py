@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strawman import dummy_df, dummy_triples, write_dummy_df, write_dummy_triples
+
+READERS = {
+    "csv": lambda path: pd.read_csv(path, dtype=str, keep_default_na=False),
+    "parquet": pd.read_parquet,
+    "feather": pd.read_feather,
+}
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "feather"])
+def test_write_dummy_df(tmp_path, fmt):
+    if fmt != "csv":
+        pytest.importorskip("pyarrow")
+    path = tmp_path / f"dummy.{fmt}"
+    stats = write_dummy_df(path, (100, 3), chunk_size=30, columns=list("abc"), seed=2)
+    assert stats.rows == 100
+    assert stats.bytes == path.stat().st_size
+    expected = dummy_df((100, 3), columns=list("abc"), seed=2)
+    np.testing.assert_array_equal(READERS[fmt](path).to_numpy(), expected.to_numpy())
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "feather"])
+def test_write_dummy_triples(tmp_path, fmt):
+    if fmt != "csv":
+        pytest.importorskip("pyarrow")
+    path = tmp_path / f"triples.{fmt}"
+    stats = write_dummy_triples(path, 100, chunk_size=30, seed=2)
+    assert stats.rows == 100
+    expected = dummy_triples(100, seed=2)
+    np.testing.assert_array_equal(READERS[fmt](path).to_numpy(), expected.to_numpy())
+
+
+def test_write_npy(tmp_path):
+    path = tmp_path / "dummy.npy"
+    write_dummy_df(path, (100, 3), chunk_size=30, seed=2)
+    expected = dummy_df((100, 3), seed=2)
+    np.testing.assert_array_equal(np.load(path), expected.to_numpy())
+
+    path = tmp_path / "triples.npy"
+    write_dummy_triples(path, 100, chunk_size=30, seed=2)
+    np.testing.assert_array_equal(np.load(path), dummy_triples(100, seed=2).to_numpy())
+
+
+def test_write_bad_format(tmp_path):
+    with pytest.raises(ValueError):
+        write_dummy_df(tmp_path / "dummy.xyz", (10, 3))
+    with pytest.raises(ValueError):
+        write_dummy_df(tmp_path / "dummy.csv", (10, 3), format="xyz")
+    with pytest.raises(ValueError):
+        write_dummy_triples(tmp_path / "triples.csv", 10, output="ids")